@@ -1,3 +1,4 @@
+import importlib
 from datashop_toolbox.basehdr import BaseHeader
 from datashop_toolbox.cruisehdr import CruiseHeader
 from datashop_toolbox.compasshdr import CompassCalHeader
@@ -14,7 +15,6 @@ from datashop_toolbox.recordhdr import RecordHeader
 from datashop_toolbox.records import DataRecords
 from datashop_toolbox.validated_base import ValidatedBase
 from datashop_toolbox.thermograph import ThermographHeader
-from datashop_toolbox import select_metadata_file_and_data_folder
 # from datashop_toolbox import remove_parameter
 # from datashop_toolbox.multinet import MultinetHeader
 
@@ -28,5 +28,14 @@ __all__ = ['BaseHeader',
         #    'remove_parameter', 'MtrHeader'
            ]
 
+# Modules that need the GUI (PyQt6) stack are imported on first use, so headless scripts and
+# worker processes do not pay for it.
+_LAZY_MODULES = {'select_metadata_file_and_data_folder'}
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # This file is part of the 'datashop_toolbox' package
-print("datashop_toolbox package imported successfully!")
@@ -0,0 +1,164 @@
+"""
+Per-file performance report of a batch run.
+
+BatchReport collects, for every input file of a batch, its size, the number of data records and
+parameters, the seconds spent reading, processing and writing it, the peak resident memory of the
+process so far and whether it succeeded. write() saves the file rows as CSV and the rows plus a
+summary (throughput in files/s and rows/s, median and 95th percentile time per file and the
+slowest files) as JSON.
+"""
+import csv
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+
+FILE_FIELDS = ('file_name', 'input_bytes', 'rows', 'parameters', 'read_seconds', 'process_seconds',
+               'write_seconds', 'total_seconds', 'peak_rss_bytes', 'status', 'error')
+STAGES = ('read', 'process', 'write')
+SLOWEST_FILES = 5
+
+
+def peak_rss_bytes() -> int | None:
+    """ Return the peak resident set size of this process so far, or None if it is unavailable. """
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaNonPagedPoolUsage', ctypes.c_size_t), ('PagefileUsage', ctypes.c_size_t),
+                            ('PeakPagefileUsage', ctypes.c_size_t)]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return int(counters.PeakWorkingSetSize)
+        except (AttributeError, OSError):
+            pass
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+class BatchReport:
+    """
+    Performance report of one batch run.
+
+    For each input file call start_file(), time its stages with stage() and call finish_file();
+    then write() the report once the batch is done.
+    """
+
+    def __init__(self, batch_id: str):
+        self.batch_id = batch_id
+        self.started = datetime.now()
+        self.start_time = time.perf_counter()
+        self.files = []
+
+    def start_file(self, file_path: str) -> dict:
+        """ Start the record of an input file and return it. """
+        record = dict.fromkeys(FILE_FIELDS)
+        record['file_name'] = os.path.basename(file_path)
+        record['input_bytes'] = os.path.getsize(file_path) if os.path.exists(file_path) else None
+        for name in STAGES:
+            record[f'{name}_seconds'] = 0.0
+        record['_start'] = time.perf_counter()
+        self.files.append(record)
+        return record
+
+    @contextmanager
+    def stage(self, record: dict, name: str):
+        """ Add the time of the block to the read, process or write seconds of a file. """
+        assert name in STAGES, f"Input argument 'name' must be one of {STAGES}."
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[f'{name}_seconds'] += time.perf_counter() - start
+
+    def finish_file(self, record: dict, rows: int | None = None, parameters: int | None = None,
+                    error: Exception | str | None = None) -> None:
+        """ Complete the record of a file; it failed if an error is given. """
+        record['total_seconds'] = time.perf_counter() - record.pop('_start')
+        record['rows'] = rows
+        record['parameters'] = parameters
+        record['peak_rss_bytes'] = peak_rss_bytes()
+        record['status'] = 'success' if error is None else 'failed'
+        record['error'] = None if error is None else str(error)
+
+    def summary(self) -> dict:
+        """ Return the batch summary: counts, throughput, per-file time percentiles and slowest files. """
+        elapsed = time.perf_counter() - self.start_time
+        finished = [record for record in self.files if record['status'] is not None]
+        succeeded = [record for record in finished if record['status'] == 'success']
+        rows = sum(record['rows'] or 0 for record in succeeded)
+        times = np.array([record['total_seconds'] for record in finished], dtype=float)
+        slowest = sorted(finished, key=lambda record: -record['total_seconds'])[:SLOWEST_FILES]
+        peaks = [record['peak_rss_bytes'] for record in finished if record['peak_rss_bytes'] is not None]
+        return {
+            'batch_id': self.batch_id,
+            'started': self.started.isoformat(timespec='seconds'),
+            'elapsed_seconds': elapsed,
+            'files': len(finished),
+            'succeeded': len(succeeded),
+            'failed': len(finished) - len(succeeded),
+            'input_bytes': sum(record['input_bytes'] or 0 for record in finished),
+            'rows': rows,
+            'files_per_second': len(finished) / elapsed if elapsed > 0 else None,
+            'rows_per_second': rows / elapsed if elapsed > 0 else None,
+            'p50_file_seconds': float(np.percentile(times, 50)) if len(times) else None,
+            'p95_file_seconds': float(np.percentile(times, 95)) if len(times) else None,
+            'peak_rss_bytes': max(peaks) if peaks else None,
+            'slowest_files': [{'file_name': record['file_name'], 'total_seconds': record['total_seconds'],
+                               'status': record['status']} for record in slowest],
+        }
+
+    def summary_lines(self, summary: dict | None = None) -> list:
+        """ Return the summary as lines of text for the batch log. """
+        summary = summary or self.summary()
+        lines = [
+            f"Files: {summary['files']} ({summary['succeeded']} succeeded, {summary['failed']} failed), "
+            f"records: {summary['rows']}",
+        ]
+        if summary['files_per_second'] is not None:
+            lines.append(f"Throughput: {summary['files_per_second']:.3f} files/s, "
+                         f"{summary['rows_per_second']:.0f} records/s")
+        if summary['p50_file_seconds'] is not None:
+            lines.append(f"Time per file: p50 {summary['p50_file_seconds']:.3f} s, "
+                         f"p95 {summary['p95_file_seconds']:.3f} s")
+        for record in summary['slowest_files']:
+            lines.append(f"Slow file: {record['file_name']} {record['total_seconds']:.3f} s ({record['status']})")
+        return lines
+
+    def write(self, output_folder: str) -> tuple[str, str]:
+        """
+        Write <batch id>_performance.csv (one row per file) and <batch id>_performance.json
+        (summary and files) to the output folder and return their paths.
+        """
+        os.makedirs(output_folder, exist_ok=True)
+        stem = re.sub(r'[^\w.-]+', '_', self.batch_id).strip('_') or 'batch'
+        csv_path = os.path.join(output_folder, f"{stem}_performance.csv")
+        json_path = os.path.join(output_folder, f"{stem}_performance.json")
+        files = [{field: record[field] for field in FILE_FIELDS} for record in self.files
+                 if record['status'] is not None]
+        with open(csv_path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=FILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(files)
+        with open(json_path, 'w') as file:
+            json.dump({'summary': self.summary(), 'files': files}, file, indent=2)
+        return csv_path, json_path
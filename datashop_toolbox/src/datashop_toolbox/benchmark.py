@@ -0,0 +1,300 @@
+"""
+End-to-end performance benchmarks.
+
+Times and measures the peak Python memory of read_odf, update_odf, add_quality_flags,
+print_object (version 2 and 3), write_odf, ThermographHeader.process_thermograph and each of the
+odf_oracle loaders. The loaders run against MemoryConnection, an in-memory stand-in for the
+database, so the figures cover the work done in Python but not the database round trips.
+
+The cases run over the sample files in Help/Jeff_Help/ODF, synthetic files of any size made with
+generate_odf() and a synthetic minilog file. The results are written as JSON; compare them with a
+stored baseline (the JSON of an earlier run on the same machine) to find regressions.
+
+Usage:
+    python -m datashop_toolbox.benchmark --output baseline.json
+    python -m datashop_toolbox.benchmark --output results.json --baseline baseline.json
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+from datashop_toolbox.thermograph import ThermographHeader
+from odf_oracle.cruise_event_to_oracle import cruise_event_to_oracle
+from odf_oracle.memory_connection import MemoryConnection
+from odf_oracle.odf_to_oracle import ODF_LOADERS
+
+REPOSITORY_FOLDER = Path(__file__).resolve().parents[3]
+DEFAULT_CORPUS = REPOSITORY_FOLDER / 'Help' / 'Jeff_Help' / 'ODF'
+DEFAULT_METADATA_FILE = REPOSITORY_FOLDER / 'Testing' / 'MetaData_BCD2014999.xlsx'
+# The minilog file is matched to this instrument in DEFAULT_METADATA_FILE.
+MINILOG_GAUGE = 353374
+ODF_CASES = ('read_odf', 'update_odf', 'add_quality_flags', 'print_object_v2', 'print_object_v3',
+             'write_odf', 'cruise_event_to_oracle') + tuple(loader.__name__ for loader in ODF_LOADERS)
+ALL_CASES = ODF_CASES + ('process_thermograph',)
+
+# Differences smaller than these are treated as noise when comparing with a baseline.
+MIN_SECONDS = 0.01
+MIN_BYTES = 1024 ** 2
+
+
+def measure(run, setup=None, repeat: int = 3) -> dict:
+    """
+    Time run(setup()) repeat times and measure its peak memory in one more call.
+
+    The setup is not timed. Returns {'seconds': median, 'best_seconds': minimum, 'peak_bytes':
+    peak Python memory allocated by run above what was in use when it started}.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        BaseHeader.reset_log_list()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+
+    state = setup() if setup is not None else None
+    BaseHeader.reset_log_list()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    BaseHeader.reset_log_list()
+    return {'seconds': statistics.median(times), 'best_seconds': min(times), 'peak_bytes': peak}
+
+
+def _error_text(error: Exception) -> str:
+    return f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+
+
+def _loader_setup(base: OdfHeader):
+    def setup() -> OdfHeader:
+        odf = base.clone()
+        odf.data.data_frame = odf.null2empty(odf.data.data_frame)
+        return odf
+    return setup
+
+
+def odf_cases(odf_file_path: str, output_folder: str) -> list:
+    """ Return the (case, setup, run) benchmark cases of an ODF file and its number of records. """
+    name = os.path.basename(odf_file_path)
+    output_file_path = os.path.join(output_folder, f"benchmark_{name}")
+    BaseHeader.reset_log_list()
+    base = OdfHeader().read_odf(odf_file_path)
+    cases = [
+        ('read_odf', None, lambda _: OdfHeader().read_odf(odf_file_path)),
+        ('update_odf', base.clone, lambda odf: odf.update_odf()),
+        ('add_quality_flags', base.clone, lambda odf: odf.add_quality_flags()),
+        ('print_object_v2', base.clone, lambda odf: odf.print_object(2.0)),
+        ('print_object_v3', base.clone, lambda odf: odf.print_object(3.0)),
+        ('write_odf', base.clone, lambda odf: odf.write_odf(output_file_path, 2.0)),
+    ]
+    for loader in (cruise_event_to_oracle,) + ODF_LOADERS:
+        cases.append((loader.__name__, _loader_setup(base),
+                      lambda odf, loader=loader: loader(odf, MemoryConnection(), name)))
+    return cases, len(base.data.data_frame)
+
+
+def write_minilog_file(file_path: str, rows: int, gauge: int = MINILOG_GAUGE) -> None:
+    """ Write a synthetic minilog temperature file (5 minute samples) for process_thermograph. """
+    times = pd.date_range('2014-11-01', periods=rows, freq='5min')
+    temperatures = 10.0 + 5.0 * np.sin(np.arange(rows) * (2 * np.pi / 288))
+    header = [
+        "* Minilog-II-T",
+        f"* Source Device: Minilog-II-T-{gauge}",
+        "* Study ID: BENCHMARK",
+        "* Minilog Initialized: 2014-10-31 12:00:00 (UTC+0)",
+        "* Study Start Time: 2014-11-01 00:00:00",
+        "* Study Stop Time: N/A",
+        "* Sample Interval: 00:05:00",
+        "* Date(yyyy-mm-dd),Time(hh:mm:ss),Temperature (°C)",
+    ]
+    data = pd.DataFrame({'date': times.strftime('%Y-%m-%d'), 'time': times.strftime('%H:%M:%S'),
+                         'temperature': np.round(temperatures, 2)})
+    with open(file_path, 'w', encoding='iso8859_1', newline='') as file:
+        file.write("\n".join(header) + "\n")
+        data.to_csv(file, header=False, index=False)
+
+
+def run_benchmarks(odf_files: list, synthetic_rows: list = (100000,), thermograph_rows: int = 100000,
+                   metadata_file_path: str | None = None, cases: list | None = None,
+                   repeat: int = 3) -> dict:
+    """
+    Run the benchmark cases and return the results.
+
+    Parameters
+    ----------
+    odf_files: list[str]
+        ODF files to run the ODF and loader cases on.
+    synthetic_rows: list[int]
+        Make one synthetic ODF file (SYTM_01 and 11 other parameters) of each size and run the
+        same cases on it.
+    thermograph_rows: int
+        Size of the synthetic minilog file for process_thermograph; 0 skips the case. It needs
+        the BIO metadata file, DEFAULT_METADATA_FILE unless metadata_file_path is given.
+    cases: list[str], optional
+        Names of the cases to run (ALL_CASES by default).
+    repeat: int
+        Number of timed runs per case; the median is reported.
+
+    Returns
+    -------
+    dict
+        {'created', 'python', 'platform', 'numpy', 'pandas', 'repeat', 'results'}, where results
+        is a list of {'case', 'file', 'rows', 'seconds', 'best_seconds', 'peak_bytes'} or, for a
+        case that could not run, {'case', 'file', 'error'}.
+    """
+    cases = set(cases or ALL_CASES)
+    unknown = cases - set(ALL_CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {sorted(unknown)}")
+    results = []
+
+    def record(case, file_name, rows, run, setup=None):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = measure(run, setup, repeat)
+            results.append({'case': case, 'file': file_name, 'rows': rows, **result})
+        except Exception as error:
+            results.append({'case': case, 'file': file_name, 'error': _error_text(error)})
+
+    with tempfile.TemporaryDirectory() as folder:
+        odf_files = list(odf_files)
+        for rows in synthetic_rows:
+            synthetic_file = os.path.join(folder, f"synthetic_{rows}.ODF")
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_odf(synthetic_file, rows=rows, parameters=11)
+            odf_files.append(synthetic_file)
+
+        for odf_file_path in odf_files:
+            file_name = os.path.basename(odf_file_path)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    file_cases, rows = odf_cases(odf_file_path, folder)
+            except Exception as error:
+                results.append({'case': 'read_odf', 'file': file_name, 'error': _error_text(error)})
+                continue
+            for case, setup, run in file_cases:
+                if case in cases:
+                    record(case, file_name, rows, run, setup)
+
+        metadata_file_path = metadata_file_path or str(DEFAULT_METADATA_FILE)
+        if 'process_thermograph' in cases and thermograph_rows and os.path.exists(metadata_file_path):
+            minilog_file = os.path.join(folder, f"BIO_Nov2014_{MINILOG_GAUGE}.csv")
+            write_minilog_file(minilog_file, thermograph_rows)
+            record('process_thermograph', f"minilog_{thermograph_rows}", thermograph_rows,
+                   lambda _: ThermographHeader().process_thermograph(
+                       'BIO', 'minilog', metadata_file_path, minilog_file, {}))
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare_results(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Compare benchmark results with a baseline run and return the regressions as messages.
+
+    A case regresses when it now fails, or when its median time or peak memory grew by more than
+    the tolerance (a fraction) and by more than MIN_SECONDS or MIN_BYTES. Cases missing from
+    either run are ignored.
+    """
+    previous = {(entry['case'], entry['file']): entry for entry in baseline['results']}
+    regressions = []
+    for entry in results['results']:
+        key = (entry['case'], entry['file'])
+        if key not in previous:
+            continue
+        old = previous[key]
+        label = f"{entry['case']} on {entry['file']}"
+        if 'error' in entry:
+            if 'error' not in old:
+                regressions.append(f"{label} now fails: {entry['error']}")
+            continue
+        if 'error' in old:
+            continue
+        if (entry['seconds'] > old['seconds'] * (1 + tolerance)
+                and entry['seconds'] - old['seconds'] > MIN_SECONDS):
+            regressions.append(f"{label} took {entry['seconds']:.3f} s, "
+                               f"baseline {old['seconds']:.3f} s")
+        if (entry['peak_bytes'] > old['peak_bytes'] * (1 + tolerance)
+                and entry['peak_bytes'] - old['peak_bytes'] > MIN_BYTES):
+            regressions.append(f"{label} peaked at {entry['peak_bytes'] / 1024 ** 2:.1f} MB, "
+                               f"baseline {old['peak_bytes'] / 1024 ** 2:.1f} MB")
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """ Return the results as a text table. """
+    lines = [f"{'case':<32} {'file':<36} {'rows':>9} {'seconds':>9} {'peak MB':>9}"]
+    for entry in results['results']:
+        if 'error' in entry:
+            lines.append(f"{entry['case']:<32} {entry['file']:<36} {entry['error']}")
+        else:
+            lines.append(f"{entry['case']:<32} {entry['file']:<36} {entry['rows']:>9} "
+                         f"{entry['seconds']:>9.4f} {entry['peak_bytes'] / 1024 ** 2:>9.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the datashop_toolbox performance benchmarks.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional growth in time or memory (default 0.25)")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="folder of ODF files")
+    parser.add_argument("--pattern", default="*.ODF", help="ODF file name pattern in the corpus")
+    parser.add_argument("--synthetic-rows", type=int, nargs="*", default=[100000],
+                        help="sizes of the synthetic ODF files (none to skip)")
+    parser.add_argument("--thermograph-rows", type=int, default=100000)
+    parser.add_argument("--cases", nargs="+", choices=ALL_CASES, help="cases to run (default all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    odf_files = sorted(glob.glob(os.path.join(args.corpus, args.pattern)))
+    results = run_benchmarks(odf_files, args.synthetic_rows, args.thermograph_rows,
+                             cases=args.cases, repeat=args.repeat)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Benchmark results written to: {args.output}")
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_results(results, json.load(file), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import os
+import shlex
+import tempfile
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.memory_budget import chunk_rows, estimate_footprint, exceeds_budget, get_memory_budget
+from datashop_toolbox.parameter_table import STATISTIC_FIELDS, column_extremes
+from datashop_toolbox.records import DataRecords, to_datetime64
+from datashop_toolbox.validated_base import read_header_lines
+
+OVERLAP_MODES = ('first', 'last', 'error')
+
+
+def first_record_time(odf_file_path: str) -> np.datetime64:
+    """ Return the SYTM_01 value of the first data record, reading only the header and one line. """
+    header_lines, offset = read_header_lines(odf_file_path)
+    skip_column_names = not (header_lines and header_lines[0].endswith(','))
+    with open(odf_file_path, "rb") as file:
+        file.seek(offset)
+        for line in file:
+            text = line.decode("iso-8859-1").strip()
+            if not text:
+                continue
+            if skip_column_names:
+                skip_column_names = False
+                continue
+            tokens = text.split(',') if ',' in text else shlex.split(text)
+            return to_datetime64(tokens[0])
+    return np.datetime64('NaT')
+
+
+def _prepare_records(odf: OdfHeader, codes: list) -> tuple:
+    """ Return the data frame in code order, sorted by time without duplicates, and its times. """
+    df = odf.data.data_frame[codes]
+    times = odf.data.time_index()
+    if not odf.data.is_time_sorted():
+        order = np.argsort(times, kind='stable')
+        df = df.iloc[order]
+        times = times[order]
+    unique = np.concatenate(([True], times[1:] != times[:-1])) if len(times) else np.array([], dtype=bool)
+    if not unique.all():
+        df = df.iloc[unique]
+        times = times[unique]
+    return df, times
+
+
+class _Part:
+    """ One input file: the times of its sorted records and, if they fit the memory budget, the records. """
+
+    def __init__(self, path: str, times: np.ndarray, df: pd.DataFrame | None = None):
+        self.path = path
+        self.times = times
+        self.df = df
+
+
+class _Segment:
+    """ A run of records [start:stop] of one part that goes to the output. """
+
+    def __init__(self, part: _Part, start: int, stop: int):
+        self.part = part
+        self.start = start
+        self.stop = stop
+        self.summary = None
+
+    @property
+    def rows(self) -> int:
+        return max(self.stop - self.start, 0)
+
+    def first_time(self) -> np.datetime64:
+        return self.part.times[self.start]
+
+    def last_time(self) -> np.datetime64:
+        return self.part.times[self.stop - 1]
+
+    def remove(self, first_time: np.datetime64, last_time: np.datetime64) -> list:
+        """ Return the segments left after dropping the records from first_time to last_time. """
+        times = self.part.times[self.start:self.stop]
+        low = self.start + int(np.searchsorted(times, first_time, side='left'))
+        high = self.start + int(np.searchsorted(times, last_time, side='right'))
+        if low == high:
+            return [self]
+        return [_Segment(self.part, start, stop) for start, stop in ((self.start, low), (high, self.stop))
+                if stop > start]
+
+    def summarize(self, df: pd.DataFrame, template: DataRecords) -> None:
+        """ Record the column widths, minimum/maximum values and first/last times of the records. """
+        records = DataRecords(data_frame=df, parameter_list=template.parameter_list,
+                              print_formats=template.print_formats)
+        codes = [code for code in template.parameter_list if code != 'SYTM_01']
+        minimums, maximums = column_extremes(df, codes)
+        self.summary = {'widths': records.column_widths(), 'minimums': minimums, 'maximums': maximums,
+                        'first_time': df['SYTM_01'].iloc[0], 'last_time': df['SYTM_01'].iloc[-1]}
+
+
+def concat_odfs(paths: list, output_file_path: str, version: float = 2.0, overlap: str = 'first') -> OdfHeader:
+    """
+    Join the time series of several ODF files from one site into a single ODF file.
+
+    The files are ordered by their first SYTM_01 value. A first pass reads them one at a time to
+    decide which records of each file are kept and to find the column widths and statistics of
+    the combined series; a second pass streams the formatted records to disk, so every version 2
+    row has the same fixed-width layout. Parsed records are kept for the second pass only while
+    a memory budget is set and they fit in it; otherwise each file is read again, so memory use
+    does not grow with the number of files.
+
+    Parameters
+    ----------
+    paths: list[str]
+        ODF files with the same set of parameter codes and a SYTM_01 column.
+    output_file_path: str
+        Path of the combined ODF file.
+    version: float
+        ODF version of the output file (2.0 or 3.0).
+    overlap: str
+        How to resolve records of a file that overlap in time with any earlier file:
+        'first' keeps the earlier files' records, 'last' keeps the later file's records
+        (earlier records between its first and last times are dropped) and 'error' raises
+        ValueError. Duplicate times within a file keep the first record.
+
+    Returns
+    -------
+    OdfHeader
+        The header of the combined file (headers of the earliest file with updated event
+        times, parameter statistics and record counts). Its data is not loaded; like a
+        header-only read, it refers to the data section of the output file.
+    """
+    assert isinstance(paths, list) and paths, "Input argument 'paths' must be a non-empty list."
+    assert isinstance(output_file_path, str), "Input argument 'output_file_path' must be a string."
+    assert isinstance(version, float), "Input argument 'version' must be a float."
+    if overlap not in OVERLAP_MODES:
+        raise ValueError(f"overlap must be one of {OVERLAP_MODES}, got '{overlap}'.")
+
+    ordered = sorted(paths, key=first_record_time)
+    odf = OdfHeader().read_odf(ordered[0])
+    codes = odf.get_parameter_codes()
+    if 'SYTM_01' not in codes:
+        raise ValueError(f"{ordered[0]} has no SYTM_01 parameter.")
+    print_formats = dict(odf.data.print_formats)
+    template = DataRecords(parameter_list=codes, print_formats=print_formats)
+
+    def read_records(path: str) -> tuple:
+        BaseHeader.reset_log_list()
+        other = OdfHeader().read_odf(path)
+        other_codes = other.get_parameter_codes()
+        if set(other_codes) != set(codes):
+            raise ValueError(f"{path} has parameters {other_codes}, expected {codes}.")
+        return _prepare_records(other, codes)
+
+    last_read = {}
+
+    def segment_records(segment: _Segment) -> pd.DataFrame:
+        part = segment.part
+        df = part.df
+        if df is None:
+            # Segments of one file are often consecutive; keep only the last file read.
+            if part.path not in last_read:
+                last_read.clear()
+                last_read[part.path] = read_records(part.path)[0]
+            df = last_read[part.path]
+        return df.iloc[segment.start:segment.stop]
+
+    # First pass: the records kept from each file.
+    segments = []
+    cached_rows = 0
+    end_time = None
+    for path in ordered:
+        df, times = _prepare_records(odf, codes) if path == ordered[0] else read_records(path)
+        part = _Part(path, times)
+        segment = _Segment(part, 0, len(times))
+        if len(times) and end_time is not None and times[0] <= end_time:
+            if overlap == 'error':
+                raise ValueError(f"{path} starts before an earlier file ends.")
+            if overlap == 'first':
+                segment.start = int(np.searchsorted(times, end_time, side='right'))
+            else:
+                segments = [kept for earlier in segments for kept in earlier.remove(times[0], times[-1])]
+        footprint = estimate_footprint(cached_rows + len(times), len(codes))
+        if get_memory_budget() is not None and not exceeds_budget(footprint):
+            part.df = df
+            cached_rows += len(times)
+        if segment.rows:
+            segment.summarize(df.iloc[segment.start:segment.stop], template)
+            segments.append(segment)
+        end_time = max(kept.last_time() for kept in segments) if segments else None
+    segments.sort(key=_Segment.first_time)
+    for segment in segments:
+        if segment.summary is None:
+            segment.summarize(segment_records(segment), template)
+
+    widths = np.max([segment.summary['widths'] for segment in segments], axis=0).tolist() if segments else None
+    minimums = {}
+    maximums = {}
+    for segment in segments:
+        for code, value in segment.summary['minimums'].items():
+            minimums[code] = min(minimums.get(code, value), value)
+        for code, value in segment.summary['maximums'].items():
+            maximums[code] = max(maximums.get(code, value), value)
+    first_time = segments[0].summary['first_time'] if segments else None
+    last_time = segments[-1].summary['last_time'] if segments else None
+    rows = sum(segment.rows for segment in segments)
+
+    # Second pass: write the records with the widths of the whole series.
+    output_folder = os.path.dirname(os.path.abspath(output_file_path))
+    with tempfile.NamedTemporaryFile("w", encoding="iso-8859-1", dir=output_folder,
+                                     suffix=".data", delete=False) as data_file:
+        data_path = data_file.name
+        try:
+            for i, segment in enumerate(segments):
+                chunk = DataRecords(data_frame=segment_records(segment), parameter_list=codes,
+                                    print_formats=print_formats)
+                if version == 2.0:
+                    for text in chunk.iter_text(version, chunk_rows(len(codes)), widths):
+                        data_file.write(text + "\n")
+                else:
+                    data_file.write(chunk.print_object(include_column_names=(i == 0)))
+        except Exception:
+            data_file.close()
+            os.remove(data_path)
+            raise
+
+    try:
+        BaseHeader.reset_log_list()
+        odf.data = DataRecords(parameter_list=codes, print_formats=print_formats)
+        odf.set_data_source(data_path, 0, version, rows)
+        table = odf.parameter_table()
+        table.set_statistics({**minimums, 'SYTM_01': first_time}, {**maximums, 'SYTM_01': last_time})
+        table.apply_to(odf.parameter_headers, STATISTIC_FIELDS)
+        if first_time is not None:
+            odf.event_header.start_date_time = str(first_time).strip("' ")
+            odf.event_header.end_date_time = str(last_time).strip("' ")
+        odf.add_history()
+        odf.log_odf_message(f"Concatenated {len(ordered)} files ({rows} records): "
+                            + ", ".join(os.path.basename(path) for path in ordered), 'base')
+        odf.update_odf()
+        odf.write_odf(output_file_path, version=version)
+        # Point the returned object at the data section of the file just written.
+        _, offset = read_header_lines(output_file_path)
+        odf.set_data_source(output_file_path, offset, version, rows)
+    finally:
+        os.remove(data_path)
+        BaseHeader.reset_log_list()
+    return odf
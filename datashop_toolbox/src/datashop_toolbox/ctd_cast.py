@@ -0,0 +1,238 @@
+"""
+Split full CTD casts into down (DN) and up (UP) profiles.
+
+The phases of a cast are found from the pressure channel with a few numpy operations on the
+whole column: the turning point is the maximum of the (smoothed) pressure, the down cast starts
+at the shallowest record after the last time the instrument rose before first going deeper
+than the soak depth (everything before it is the soak: the dwell below the surface to start
+the pumps and the return towards the surface; loops from ship heave further down stay in the
+down cast), and the up cast ends when the instrument is back at the surface.
+
+Each profile is a clone() of the source ODF object, so the header blocks are shared until
+changed and the data frame is a copy-on-write slice of the source records. EVENT_QUALIFIER2,
+the record counts, event times and depths and the parameter minimum/maximum values are set
+for each profile.
+
+Usage:
+    python -m datashop_toolbox.ctd_cast cruise_folder output_folder [--pattern *.ODF] [--soak-depth D] [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.header_search import find_odf_files
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.validated_base import read_header_lines
+
+PRESSURE_CODES = ('PRES_01', 'PRES_02', 'DEPH_01')
+
+
+def pressure_column(odf: OdfHeader) -> str:
+    """ Return the code of the first pressure (or depth) parameter of an ODF object. """
+    codes = odf.get_parameter_codes()
+    for code in PRESSURE_CODES:
+        if code in codes:
+            return code
+    raise ValueError(f"The ODF object has none of the pressure parameters {PRESSURE_CODES}.")
+
+
+def find_cast(pressure, null_value: float = BaseHeader.NULL_VALUE, window: int = 5,
+              tolerance: float = 0.5, soak_depth: float = 20.0) -> dict:
+    """
+    Find the soak, down cast and up cast of a pressure series.
+
+    Parameters
+    ----------
+    pressure: array-like
+        Pressure (or depth) of each record, in record order.
+    null_value: float
+        Value marking missing pressures; they are interpolated from their neighbours.
+    window: int
+        Length in records of the moving average applied before looking for the turning point,
+        so a spike is not taken for it. 1 disables it.
+    tolerance: float
+        Pressure changes smaller than this are noise. A rise of at least this much near the
+        surface ends the soak, and the up cast ends at the first record less than this above
+        its shallowest pressure.
+    soak_depth: float
+        Only rises before the first record deeper than this end the soak; the instrument is
+        on its way down once it has passed it.
+
+    Returns
+    -------
+    dict
+        'soak', 'down', 'up' and 'after' (the records once back at the surface) as slices of the
+        records, and 'turn', the record of the maximum pressure (the last of the down cast).
+    """
+    assert isinstance(window, int) and window > 0, "Input argument 'window' must be a positive integer."
+    p = np.array(pressure, dtype=float)
+    missing = np.isnan(p) | (p == null_value)
+    if missing.all():
+        raise ValueError("The pressure series has no valid values.")
+    if missing.any():
+        records = np.arange(len(p))
+        p[missing] = np.interp(records[missing], records[~missing], p[~missing])
+    smoothed = p
+    if window > 1 and len(p) >= window:
+        padded = np.pad(p, (window // 2, window - 1 - window // 2), mode='edge')
+        smoothed = np.convolve(padded, np.ones(window) / window, mode='valid')
+
+    # The deepest record near the smoothed maximum.
+    peak = int(np.argmax(smoothed))
+    low = max(peak - window // 2, 0)
+    turn = low + int(np.argmax(p[low:peak + window // 2 + 1]))
+    before = p[:turn + 1]
+    deep = np.flatnonzero(before > soak_depth)
+    near_surface = int(deep[0]) if len(deep) else len(before)
+    # Records near the surface the instrument later rose above by at least the tolerance belong
+    # to the soak; the down cast starts at the shallowest record after the last of them.
+    rise = before - np.minimum.accumulate(before[::-1])[::-1]
+    reversals = np.flatnonzero(rise[:near_surface] >= tolerance)
+    last = int(reversals[-1]) if len(reversals) else 0
+    start = last + int(np.argmin(before[last:]))
+    after = p[turn + 1:]
+    stop = turn + 1
+    if len(after):
+        stop += int(np.flatnonzero(after < after.min() + tolerance)[0]) + 1
+    return {
+        'soak': slice(0, start),
+        'down': slice(start, turn + 1),
+        'up': slice(turn + 1, stop),
+        'after': slice(stop, len(p)),
+        'turn': turn,
+    }
+
+
+def _cast_profile(odf: OdfHeader, records: slice, qualifier: str, pressure_code: str) -> OdfHeader:
+    cast = odf.clone()
+    cast.set_data_frame(odf.data.data_frame.iloc[records])
+    cast.event_header.event_qualifier2 = qualifier
+    df = cast.data.data_frame
+    if 'SYTM_01' in df.columns:
+        cast.event_header.start_date_time = str(df['SYTM_01'].iloc[0]).strip("' ")
+        cast.event_header.end_date_time = str(df['SYTM_01'].iloc[-1]).strip("' ")
+    pressure = df[pressure_code].to_numpy(dtype=float)
+    pressure = pressure[~np.isnan(pressure) & (pressure != BaseHeader.NULL_VALUE)]
+    if len(pressure):
+        cast.event_header.min_depth = float(pressure.min())
+        cast.event_header.max_depth = float(pressure.max())
+    cast.file_specification = cast.generate_file_spec()
+    cast.add_history()
+    cast.add_to_history(f"Split the {qualifier} cast from records {records.start + 1} to {records.stop} "
+                        f"of {len(odf.data)} using {pressure_code}.")
+    cast.update_odf()
+    return cast
+
+
+def split_cast(odf: OdfHeader, window: int = 5, tolerance: float = 0.5, soak_depth: float = 20.0) -> tuple:
+    """
+    Split a full CTD cast into its down and up profiles; see find_cast() for the arguments.
+    Returns (down, up, phases) where down and up are new OdfHeader objects with EVENT_QUALIFIER2
+    'DN' and 'UP' (up is None when the data has no up cast) and phases is the find_cast() result.
+    The source object is not changed.
+    """
+    assert isinstance(odf, OdfHeader), "Input argument 'odf' must be an OdfHeader object."
+    if odf._data_source is not None:
+        raise ValueError("Data read with header_only=True cannot be split.")
+    code = pressure_column(odf)
+    header = next(ph for ph in odf.parameter_headers if ph.code == code)
+    try:
+        null_value = float(header.null_string)
+    except ValueError:
+        null_value = BaseHeader.NULL_VALUE
+    phases = find_cast(odf.data.data_frame[code].to_numpy(dtype=float), null_value, window, tolerance,
+                       soak_depth)
+    down = _cast_profile(odf, phases['down'], 'DN', code)
+    up = _cast_profile(odf, phases['up'], 'UP', code) if phases['up'].stop > phases['up'].start else None
+    return down, up, phases
+
+
+def split_cast_file(odf_file_path: str, output_folder: str, window: int = 5, tolerance: float = 0.5,
+                    soak_depth: float = 20.0) -> list:
+    """
+    Split one CTD ODF file and write <DATA_TYPE>_<CRUISE>_<EVENT>_<QUALIFIER1>_DN.ODF (and _UP)
+    to output_folder, in the version of the source file. Returns the paths written.
+    """
+    assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+    BaseHeader.reset_log_list()
+    header_lines, _ = read_header_lines(odf_file_path)
+    version = 2.0 if header_lines[0].endswith(',') else 3.0
+    odf = OdfHeader().read_odf(odf_file_path)
+    down, up, _ = split_cast(odf, window, tolerance, soak_depth)
+    os.makedirs(output_folder, exist_ok=True)
+    outputs = []
+    for cast in (down, up):
+        if cast is not None:
+            output_file_path = os.path.join(output_folder, cast.file_specification + '.ODF')
+            cast.write_odf(output_file_path, version=version)
+            outputs.append(output_file_path)
+    BaseHeader.reset_log_list()
+    return outputs
+
+
+def _split_job(job: tuple) -> tuple:
+    odf_file_path, output_folder, window, tolerance, soak_depth = job
+    try:
+        return odf_file_path, split_cast_file(odf_file_path, output_folder, window, tolerance, soak_depth), None
+    except Exception as e:
+        return odf_file_path, [], f"{type(e).__name__}: {e}"
+
+
+def split_cruise(paths, output_folder: str, pattern: str = "*.ODF", window: int = 5,
+                 tolerance: float = 0.5, soak_depth: float = 20.0, max_workers: int | None = None) -> dict:
+    """
+    Split the CTD files of a cruise in parallel, one file per task.
+
+    Parameters
+    ----------
+    paths: str or list[str]
+        A folder (searched recursively for files matching pattern) or a list of files.
+    output_folder: str
+        Folder for the DN and UP files.
+
+    Returns
+    -------
+    dict
+        {source file: (paths written, error message or None)}, in file order.
+    """
+    files = find_odf_files(paths, pattern) if isinstance(paths, str) else list(paths)
+    jobs = [(path, output_folder, window, tolerance, soak_depth) for path in files]
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for odf_file_path, outputs, error in executor.map(_split_job, jobs):
+            results[odf_file_path] = (outputs, error)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split full CTD casts into DN and UP ODF files.")
+    parser.add_argument("folder", help="folder containing the full cast ODF files (searched recursively)")
+    parser.add_argument("output_folder", help="folder for the DN and UP files")
+    parser.add_argument("--pattern", default="*.ODF", help="file name pattern, ignoring case (default *.ODF)")
+    parser.add_argument("--window", type=int, default=5, help="records in the pressure moving average")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="pressure changes smaller than this are noise")
+    parser.add_argument("--soak-depth", type=float, default=20.0,
+                        help="the soak ends before the cast first goes deeper than this (default 20)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = split_cruise(args.folder, args.output_folder, args.pattern, args.window, args.tolerance,
+                           args.soak_depth, args.workers)
+    elapsed = time.perf_counter() - start
+    failed = 0
+    for odf_file_path, (outputs, error) in results.items():
+        if error:
+            failed += 1
+            print(f"{odf_file_path}: {error}")
+        else:
+            print(f"{odf_file_path} -> {', '.join(os.path.basename(path) for path in outputs)}")
+    print(f"Split {len(results) - failed} of {len(results)} files ({elapsed:.1f} s)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
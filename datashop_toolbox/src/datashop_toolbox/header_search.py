@@ -0,0 +1,194 @@
+"""
+Fast search of ODF header fields across many files.
+
+Each file is memory mapped and only its header section (the bytes before '-- DATA --') is
+scanned with one compiled regular expression for the fields asked for; no header objects are
+built, so a search costs little more than reading the headers from disk.
+
+A query maps a field to a value pattern. Fields are header keys (CRUISE_NUMBER, PLATFORM,
+SERIAL_NUMBER, CODE, ...), optionally qualified by their block (INSTRUMENT_HEADER.SERIAL_NUMBER,
+PARAMETER_HEADER.CODE). Value patterns are shell-style wildcards compared without regard to case
+(CAR2024*, DOXY_0?). A file matches when every field of the query has a matching value.
+
+Usage:
+    python -m datashop_toolbox.header_search archive_folder CRUISE_NUMBER=CAR2024010 CODE=DOXY_*
+                                             [--show PLATFORM] [--pattern *.ODF] [--workers N]
+"""
+import argparse
+import bisect
+import fnmatch
+import json
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DATA_MARKER = b'-- DATA --'
+BLOCK_PATTERN = re.compile(rb'^[ \t]*([A-Z_]+_HEADER)[ \t]*,?[ \t]*\r?$', re.MULTILINE)
+
+
+def find_odf_files(folder: str, pattern: str = "*.ODF", recursive: bool = True) -> list[str]:
+    """ Return the files below folder whose names match pattern (ignoring case), sorted. """
+    files = []
+    for root, _, names in os.walk(folder):
+        files += [os.path.join(root, name) for name in names if fnmatch.fnmatch(name.upper(), pattern.upper())]
+        if not recursive:
+            break
+    return sorted(files)
+
+
+def split_field(field: str) -> tuple[str | None, str]:
+    """ Split 'BLOCK_HEADER.KEY' into (block, key); a plain key gives (None, key). """
+    block, _, key = field.upper().rpartition('.')
+    return block or None, key
+
+
+def compile_query(criteria: dict, fields=()) -> tuple:
+    """
+    Compile a query for search_file().
+
+    Parameters
+    ----------
+    criteria: dict
+        {field: wildcard pattern} that a file must match, all of them.
+    fields: list
+        Further fields whose values are returned for the matching files.
+
+    Returns
+    -------
+    tuple
+        (field regex, {field: (block, key, compiled value pattern or None)}).
+    """
+    assert isinstance(criteria, dict), "Input argument 'criteria' must be a dictionary."
+    terms = {}
+    for field, pattern in criteria.items():
+        block, key = split_field(field)
+        terms[field] = (block, key, re.compile(fnmatch.translate(str(pattern)), re.IGNORECASE))
+    for field in fields:
+        if field not in terms:
+            terms[field] = (*split_field(field), None)
+    assert terms, "The query needs at least one field."
+    keys = sorted({key for _, key, _ in terms.values()}, key=len, reverse=True)
+    field_regex = re.compile(rb'^[ \t]*(' + b'|'.join(re.escape(key.encode('iso-8859-1')) for key in keys)
+                             + rb')[ \t]*=[ \t]*(.*?)[ \t]*,?[ \t]*\r?$', re.MULTILINE | re.IGNORECASE)
+    return field_regex, terms
+
+
+def header_bytes(odf_file_path: str) -> bytes:
+    """ Return the bytes before the '-- DATA --' line of a file, read through a memory map. """
+    with open(odf_file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = mapped.find(DATA_MARKER)
+            return mapped[:end if end >= 0 else len(mapped)]
+
+
+def search_file(odf_file_path: str, query: tuple) -> dict | None:
+    """
+    Search the header of one file. Returns {field: [values]} (the matching values of the
+    criteria fields and all values of the other fields) or None if the file does not match.
+    """
+    field_regex, terms = query
+    header = header_bytes(odf_file_path)
+    found = {}
+    for match in field_regex.finditer(header):
+        found.setdefault(match.group(1).upper().decode('iso-8859-1'), []).append(match)
+    block_starts = block_names = None
+    if any(block for block, _, _ in terms.values()):
+        blocks = [(match.start(), match.group(1).decode('iso-8859-1')) for match in BLOCK_PATTERN.finditer(header)]
+        block_starts = [start for start, _ in blocks]
+        block_names = [name for _, name in blocks]
+
+    result = {}
+    for field, (block, key, value_pattern) in terms.items():
+        values = []
+        for match in found.get(key, []):
+            if block is not None:
+                index = bisect.bisect_right(block_starts, match.start()) - 1
+                if index < 0 or block_names[index] != block:
+                    continue
+            value = match.group(2).decode('iso-8859-1').strip(" '")
+            if value_pattern is None or value_pattern.match(value):
+                values.append(value)
+        if value_pattern is not None and not values:
+            return None
+        result[field] = values
+    return result
+
+
+def _search_job(job: tuple) -> list:
+    paths, query = job
+    results = []
+    for path in paths:
+        try:
+            found = search_file(path, query)
+        except OSError as e:
+            found = {'error': [f"{type(e).__name__}: {e}"]}
+        if found is not None:
+            results.append((path, found))
+    return results
+
+
+def search_headers(paths, criteria: dict, fields=(), pattern: str = "*.ODF", max_workers: int | None = None,
+                   batch_size: int = 500) -> dict:
+    """
+    Search the headers of many ODF files in parallel.
+
+    Parameters
+    ----------
+    paths: str or list[str]
+        A folder (searched recursively for files matching pattern) or a list of files.
+    criteria, fields:
+        The query; see compile_query().
+    batch_size: int
+        Files handed to a worker process at a time.
+
+    Returns
+    -------
+    dict
+        {file path: {field: [values]}} for the matching files, in file order. Files that cannot be
+        read map to {'error': [message]}.
+    """
+    files = find_odf_files(paths, pattern) if isinstance(paths, str) else list(paths)
+    query = compile_query(criteria, fields)
+    jobs = [(files[start:start + batch_size], query) for start in range(0, len(files), batch_size)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for batch in executor.map(_search_job, jobs):
+            results.update(batch)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find ODF files by the values of their header fields.")
+    parser.add_argument("folder", help="folder containing the ODF files (searched recursively)")
+    parser.add_argument("criteria", nargs="+", help="FIELD=PATTERN, e.g. CRUISE_NUMBER=CAR2024010 "
+                                                    "or PARAMETER_HEADER.CODE=DOXY_*")
+    parser.add_argument("--show", nargs="*", default=[], help="further fields to print for each file")
+    parser.add_argument("--pattern", default="*.ODF", help="file name pattern, ignoring case (default *.ODF)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    criteria = {}
+    for item in args.criteria:
+        field, separator, value = item.partition('=')
+        if not separator:
+            parser.error(f"criteria must be FIELD=PATTERN, got '{item}'")
+        criteria[field] = value
+    start = time.perf_counter()
+    results = search_headers(args.folder, criteria, args.show, args.pattern, args.workers)
+    elapsed = time.perf_counter() - start
+    for odf_file_path, found in results.items():
+        values = "  ".join(f"{field}={','.join(found_values)}" for field, found_values in found.items())
+        print(f"{odf_file_path}  {values}")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    print(f"{len(results)} matching files ({elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from odf_oracle.database_connection_pool import get_database_pool
 import sqlite3
 from typing import TypedDict
 from pathlib import Path
@@ -18,6 +17,8 @@ def lookup_parameter(database: str, parameter: str) -> ParamInfo:
     match database:
         
         case 'oracle':
+            from odf_oracle.database_connection_pool import get_database_pool
+
             # Acquire a connection from the pool (will always have the new date and timestamp formats).
             pool = get_database_pool()
             connection = pool.acquire()
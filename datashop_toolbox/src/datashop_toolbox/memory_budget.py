@@ -0,0 +1,132 @@
+"""
+Global memory budget for reading, writing and loading ODF data.
+
+With no budget set (the default) everything is processed in one piece, as before. Once a budget
+is set, with set_memory_budget('2GB') or the DATASHOP_MEMORY_BUDGET environment variable, files
+whose estimated footprint exceeds it are parsed, written and loaded in chunks sized to fit.
+
+Peak Python memory use per stage (read_odf, write_odf, add_quality_flags, data_to_oracle, ...)
+is recorded while start_memory_report() is in effect and returned by memory_report().
+"""
+import os
+import re
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+from datashop_toolbox.validated_base import read_header_lines
+
+# Peak bytes per data value while a data section is parsed (token lists, floats and the frame),
+# measured on the sample moored and CTD files; the parsed frame itself needs about 1/6 of this.
+PARSE_BYTES_PER_VALUE = 250
+DEFAULT_CHUNK_ROWS = 50000
+MIN_CHUNK_ROWS = 1000
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+_budget: Optional[int] = None
+_stage_peaks: dict = {}
+_stage_stack: list = []
+
+
+def parse_size(size) -> int:
+    """ Convert a byte count or a string such as '512MB', '2G' or '1.5 GiB' to bytes. """
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)(I?B)?\s*", str(size).upper())
+    if not match:
+        raise ValueError(f"Invalid memory size: '{size}'")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def set_memory_budget(budget) -> None:
+    """ Set the memory budget in bytes (or as a string such as '2GB'); None removes it. """
+    global _budget
+    _budget = None if budget is None else parse_size(budget)
+    if _budget is not None and _budget <= 0:
+        raise ValueError("The memory budget must be positive.")
+
+
+def get_memory_budget() -> Optional[int]:
+    """ Return the memory budget in bytes, or None if there is none. """
+    return _budget
+
+
+def estimate_footprint(rows: int, columns: int) -> int:
+    """ Estimated peak bytes needed to parse rows x columns data values in one piece. """
+    return rows * max(columns, 1) * PARSE_BYTES_PER_VALUE
+
+
+def estimate_file_footprint(odf_file_path: str) -> int:
+    """
+    Estimate the peak memory of a full read_odf() of a file from its size and number of
+    parameters, without reading the data section (the row count comes from the first line length).
+    """
+    header_lines, offset = read_header_lines(odf_file_path)
+    columns = sum(1 for line in header_lines if 'PARAMETER_HEADER' in line)
+    data_bytes = os.path.getsize(odf_file_path) - offset
+    line_length = 0
+    with open(odf_file_path, "rb") as file:
+        file.seek(offset)
+        for line in file:
+            if line.strip():
+                line_length = len(line)
+                break
+    rows = data_bytes // line_length if line_length else 0
+    return estimate_footprint(rows, columns)
+
+
+def exceeds_budget(footprint: int) -> bool:
+    """ Return True if a budget is set and the footprint is larger than it. """
+    return _budget is not None and footprint > _budget
+
+
+def chunk_rows(columns: int, default: int = DEFAULT_CHUNK_ROWS) -> int:
+    """ Number of rows of the given width to process at a time under the memory budget. """
+    if _budget is None:
+        return default
+    return max(MIN_CHUNK_ROWS, _budget // (max(columns, 1) * PARSE_BYTES_PER_VALUE))
+
+
+def start_memory_report() -> None:
+    """ Start recording the peak memory use of each stage (uses tracemalloc, which slows Python down). """
+    _stage_peaks.clear()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_memory_report() -> dict:
+    """ Stop recording and return the report. """
+    report = memory_report()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return report
+
+
+def memory_report() -> dict:
+    """ Return {stage: peak bytes allocated above the memory in use when the stage started}. """
+    return dict(_stage_peaks)
+
+
+@contextmanager
+def track_stage(name: str):
+    """ Record the peak memory use of a block of code under the given stage name. """
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    if _stage_stack:
+        _stage_stack[-1][1] = max(_stage_stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    entry = [current, 0]
+    _stage_stack.append(entry)
+    try:
+        yield
+    finally:
+        _stage_stack.pop()
+        peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+        _stage_peaks[name] = max(_stage_peaks.get(name, 0), peak - entry[0])
+        if _stage_stack:
+            _stage_stack[-1][1] = max(_stage_stack[-1][1], peak)
+
+
+if os.environ.get('DATASHOP_MEMORY_BUDGET'):
+    set_memory_budget(os.environ['DATASHOP_MEMORY_BUDGET'])
@@ -0,0 +1,199 @@
+"""
+Declarative metadata patches for ODF files.
+
+A patch is a JSON document that replaces the per-cruise update_*.py scripts:
+
+    {
+        "user": "Jeff Jackson",
+        "version": 2.0,
+        "output_name": "original",
+        "rules": [
+            {
+                "files": "D24010*.ODF",
+                "set": {
+                    "cruise_header.cruise_number": "CAR2024010",
+                    "cruise_header.platform": "CAPT JACQUES CARTIER",
+                    "event_header.sampling_interval": 0.5,
+                    "parameter[SYTM_01].units": "GMT"
+                },
+                "rename": {"TEMP_01": "TE90_01"},
+                "history": ["The oxygen sensor (1157) calibration coefficient \\"Soc\\" was changed ..."]
+            }
+        ]
+    }
+
+Every rule whose "files" glob matches a file name is applied in order. Field changes are logged
+in the same wording as the header classes use and written to a new HISTORY_HEADER together with
+the "history" lines. "output_name" is either "original" (keep the input file name) or
+"file_spec" (use OdfHeader.generate_file_spec()).
+
+Files are read with read_odf(header_only=True) so the data section is copied unchanged; a full
+read is only done when a version 3 file has parameters renamed or the output version differs.
+
+Usage:
+    python -m datashop_toolbox.metadata_patch patch.json input_folder output_folder [--workers N]
+"""
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.validated_base import read_header_lines
+
+# Header attribute -> the method it uses to log a field change.
+LOG_METHODS = {
+    'cruise_header': 'log_cruise_message',
+    'event_header': 'log_event_message',
+    'instrument_header': 'log_instrument_message',
+    'meteo_header': 'log_meteo_message',
+    'quality_header': 'log_quality_message',
+    'record_header': 'log_record_message',
+}
+PARAMETER_TARGET = re.compile(r"^parameter\[(?P<code>[A-Z0-9_]+)\]\.(?P<field>\w+)$")
+
+
+def load_patch(patch_file_path: str) -> dict:
+    """ Read a patch file and check its structure. """
+    with open(patch_file_path, "r", encoding="utf-8") as file:
+        patch = json.load(file)
+    validate_patch(patch)
+    return patch
+
+
+def validate_patch(patch: dict) -> None:
+    """ Raise ValueError if a patch is not well formed. """
+    if not isinstance(patch, dict) or not isinstance(patch.get('rules'), list):
+        raise ValueError("A patch must be an object with a 'rules' list.")
+    if patch.get('output_name', 'original') not in ('original', 'file_spec'):
+        raise ValueError("'output_name' must be 'original' or 'file_spec'.")
+    for i, rule in enumerate(patch['rules']):
+        if not isinstance(rule.get('files'), str):
+            raise ValueError(f"Rule {i} needs a 'files' glob pattern.")
+        unknown = set(rule) - {'files', 'set', 'rename', 'history'}
+        if unknown:
+            raise ValueError(f"Rule {i} has unknown keys: {sorted(unknown)}")
+        for target in rule.get('set', {}):
+            block = target.split('.', 1)[0]
+            if block not in LOG_METHODS and not PARAMETER_TARGET.match(target):
+                raise ValueError(f"Rule {i} cannot set '{target}'.")
+
+
+def matching_rules(patch: dict, file_name: str) -> list:
+    """ Return the rules whose file pattern matches the base name of file_name. """
+    name = os.path.basename(file_name)
+    return [rule for rule in patch['rules'] if fnmatch.fnmatch(name, rule['files'])]
+
+
+def set_field(odf: OdfHeader, target: str, value) -> None:
+    """ Assign value to a 'block.field' or 'parameter[CODE].field' target and log the change. """
+    match = PARAMETER_TARGET.match(target)
+    if match:
+        code = match.group('code')
+        if not odf.is_parameter_code(code):
+            return
+        header = odf.parameter_headers[odf.get_parameter_codes().index(code)]
+        field = match.group('field')
+        log_method = 'log_parameter_message'
+    else:
+        block, field = target.split('.', 1)
+        header = getattr(odf, block)
+        if header is None:
+            raise ValueError(f"The file has no {block.upper()} to set {field} in.")
+        log_method = LOG_METHODS[block]
+    if field not in type(header).model_fields:
+        raise ValueError(f"'{field}' is not a field of {type(header).__name__}.")
+    old_value = getattr(header, field)
+    setattr(header, field, value)
+    new_value = getattr(header, field)
+    if new_value != old_value:
+        getattr(header, log_method)(field, old_value, new_value)
+
+
+def apply_rules(odf: OdfHeader, rules: list, user: str = '') -> None:
+    """ Apply the matching rules of a patch to an ODF object already read into memory. """
+    odf.add_history()
+    if user:
+        odf.add_to_log(f'{user} made the following modifications to this file:')
+    for rule in rules:
+        for target, value in rule.get('set', {}).items():
+            set_field(odf, target, value)
+        renames = {old: new for old, new in rule.get('rename', {}).items() if odf.is_parameter_code(old)}
+        if renames:
+            odf.edit_parameters(rename=renames)
+        for line in rule.get('history', []):
+            odf.add_to_log(line)
+    odf.update_odf()
+
+
+def patch_file(patch: dict, input_file_path: str, output_folder: str) -> str:
+    """ Apply a patch to one ODF file and return the path of the file written. """
+    rules = matching_rules(patch, input_file_path)
+    version = float(patch.get('version', 2.0))
+    renames = any(rule.get('rename') for rule in rules)
+    header_lines, _ = read_header_lines(input_file_path)
+    source_version = 2.0 if header_lines and header_lines[0].endswith(',') else 3.0
+    # Version 3 data starts with the column names, so renames need the data to be rewritten.
+    header_only = source_version == version and not (renames and source_version >= 3)
+    BaseHeader.reset_log_list()
+    odf = OdfHeader().read_odf(input_file_path, header_only=header_only)
+    apply_rules(odf, rules, patch.get('user', ''))
+    if patch.get('output_name', 'original') == 'file_spec':
+        odf.file_specification = odf.generate_file_spec()
+        output_file_path = os.path.join(output_folder, odf.file_specification + '.ODF')
+    else:
+        output_file_path = os.path.join(output_folder, os.path.basename(input_file_path))
+    if os.path.abspath(output_file_path) == os.path.abspath(input_file_path):
+        raise ValueError(f"Refusing to overwrite the input file {input_file_path}.")
+    odf.write_odf(output_file_path, version=version)
+    BaseHeader.reset_log_list()
+    return output_file_path
+
+
+def _patch_file_job(job: tuple) -> tuple:
+    patch, input_file_path, output_folder = job
+    try:
+        return input_file_path, patch_file(patch, input_file_path, output_folder), None
+    except Exception as e:
+        return input_file_path, None, f"{type(e).__name__}: {e}"
+
+
+def run_patch(patch: dict, input_folder: str, output_folder: str, max_workers: int | None = None) -> dict:
+    """
+    Apply a patch to every file in input_folder matched by one of its rules, in parallel.
+    Returns {input file: output file}; files that failed map to {'error': message}.
+    """
+    validate_patch(patch)
+    os.makedirs(output_folder, exist_ok=True)
+    files = sorted(path for path in glob.glob(os.path.join(input_folder, '*'))
+                   if os.path.isfile(path) and matching_rules(patch, path))
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        jobs = [(patch, path, output_folder) for path in files]
+        for input_file_path, output_file_path, error in executor.map(_patch_file_job, jobs):
+            results[input_file_path] = output_file_path if error is None else {'error': error}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a declarative metadata patch to ODF files.")
+    parser.add_argument("patch", help="JSON patch file")
+    parser.add_argument("input_folder", help="folder containing the ODF files to patch")
+    parser.add_argument("output_folder", help="folder for the patched ODF files")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    results = run_patch(load_patch(args.patch), args.input_folder, args.output_folder, args.workers)
+    failed = 0
+    for input_file_path, result in results.items():
+        if isinstance(result, dict):
+            failed += 1
+            print(f"FAILED {input_file_path}: {result['error']}")
+    print(f"Patched {len(results) - failed} of {len(results)} files into {args.output_folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,7 @@
 import glob
 import os
 
-# Load required installed libraries
-import openpyxl
-from openpyxl.styles import Alignment
-from openpyxl.utils import get_column_letter
+# Load required installed libraries (openpyxl is imported by generate_report() when it is used)
 
 # Import required datashop_toolbox libraries
 from datashop_toolbox.odfhdr import OdfHeader
@@ -25,6 +22,10 @@ def generate_report(file_path: str, wildcard: str, outfile: str) -> None:
         The output file name.
 
     """
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment
+    from openpyxl.utils import get_column_letter
+
 
     report_headings = [
         'File Name',
@@ -63,7 +64,7 @@ def generate_report(file_path: str, wildcard: str, outfile: str) -> None:
     ]
 
     # Create a new Excel workbook
-    workbook = openpyxl.Workbook()
+    workbook = Workbook()
 
     # Select the default sheet (usually named 'Sheet')
     worksheet = workbook.active
@@ -0,0 +1,155 @@
+"""
+Stage timings and counters for the ODF pipeline.
+
+The reading, parsing, rendering, writing and Oracle loading code is divided into named stages
+(read_odf.read_lines, data.tokenize, data.convert, render.data_v2, oracle.execute, ...).
+While metrics are enabled, with enable() or the DATASHOP_METRICS environment variable, each stage
+adds its calls and elapsed time to a running total, and counters record the amount of work done
+(files read and written, records parsed, rows inserted). snapshot() returns the totals so far.
+
+When metrics are disabled (the default) a stage costs one flag test and nothing is recorded.
+Stages may nest, so the time of an inner stage is also part of the time of the outer stage.
+The stages are also reported to the span hook, which the tracer (tracing.py) uses to record them.
+"""
+import functools
+import os
+import threading
+import time
+
+_enabled = False
+# True when stages have to be timed: metrics are enabled or a span hook is set.
+_active = False
+_span_hook = None
+_lock = threading.Lock()
+_timings: dict = {}
+_counters: dict = {}
+
+
+def enable() -> None:
+    """ Start recording stage timings and counters. """
+    global _enabled, _active
+    _enabled = True
+    _active = True
+
+
+def disable() -> None:
+    """ Stop recording; the totals so far are kept until reset(). """
+    global _enabled, _active
+    _enabled = False
+    _active = _span_hook is not None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_span_hook(hook) -> None:
+    """
+    Call hook(name, start, seconds) at the end of every stage, start being its time.perf_counter()
+    start time, whether or not metrics are enabled; None removes the hook.
+    """
+    global _span_hook, _active
+    _span_hook = hook
+    _active = _enabled or hook is not None
+
+
+def _finish(name: str, start: float) -> None:
+    seconds = time.perf_counter() - start
+    if _enabled:
+        add_time(name, seconds)
+    hook = _span_hook
+    if hook is not None:
+        hook(name, start, seconds)
+
+
+def reset() -> None:
+    """ Clear all timings and counters. """
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+
+
+def snapshot() -> dict:
+    """
+    Return the totals recorded so far as
+    {'timings': {stage: {'calls': int, 'seconds': float}}, 'counters': {name: int}}.
+    """
+    with _lock:
+        return {
+            'timings': {name: {'calls': calls, 'seconds': seconds}
+                        for name, (calls, seconds) in _timings.items()},
+            'counters': dict(_counters),
+        }
+
+
+def add_time(name: str, seconds: float, calls: int = 1) -> None:
+    """ Add elapsed time to a stage. """
+    with _lock:
+        total = _timings.get(name)
+        if total is None:
+            _timings[name] = [calls, seconds]
+        else:
+            total[0] += calls
+            total[1] += seconds
+
+
+def count(name: str, value: int = 1) -> None:
+    """ Add value to a counter if metrics are enabled. """
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+
+
+class timed:
+    """
+    Time a stage, either as a context manager (with timed('data.tokenize'): ...) or as a
+    function decorator (@timed('read_odf')).
+    """
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if _active:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        if self.start is not None:
+            _finish(self.name, self.start)
+            self.start = None
+
+    def __call__(self, function):
+        name = self.name
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _finish(name, start)
+        return wrapper
+
+
+def format_snapshot(metrics: dict | None = None) -> str:
+    """ Return a snapshot (by default the current one) as a text table, slowest stage first. """
+    metrics = metrics if metrics is not None else snapshot()
+    lines = [f"{'stage':<36} {'calls':>8} {'seconds':>10}"]
+    timings = sorted(metrics['timings'].items(), key=lambda item: -item[1]['seconds'])
+    for name, total in timings:
+        lines.append(f"{name:<36} {total['calls']:>8} {total['seconds']:>10.4f}")
+    if metrics['counters']:
+        lines.append(f"{'counter':<36} {'value':>19}")
+        for name, value in sorted(metrics['counters'].items()):
+            lines.append(f"{name:<36} {value:>19}")
+    return "\n".join(lines)
+
+
+if os.environ.get('DATASHOP_METRICS', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable()
@@ -1,9 +1,7 @@
 import contextlib
 from datetime import datetime
-from icecream import ic
 import io
 import json
-import netCDF4 as nc
 import os
 import pandas as pd
 from typing import NoReturn
@@ -139,6 +137,7 @@ class NetCdfHeader(OdfHeader):
         return self
     
     def main():
+        import netCDF4 as nc
 
         captured_output = io.StringIO()
 
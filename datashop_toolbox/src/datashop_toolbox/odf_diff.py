@@ -0,0 +1,208 @@
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.validated_base import read_header_lines
+
+SINGLE_HEADERS = ['cruise_header', 'event_header', 'meteo_header', 'instrument_header',
+                  'quality_header', 'record_header']
+LIST_HEADERS = ['general_cal_headers', 'compass_cal_headers', 'polynomial_cal_headers',
+                'history_headers']
+
+
+def data_section_hash(odf_file_path: str) -> str:
+    """ Return the SHA-1 of the bytes after the '-- DATA --' line of an ODF file. """
+    _, offset = read_header_lines(odf_file_path)
+    digest = hashlib.sha1()
+    with open(odf_file_path, "rb") as file:
+        file.seek(offset)
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def diff_fields(a, b) -> dict:
+    """ Return {field: (value_a, value_b)} for the model fields that differ between two headers. """
+    if a is None or b is None:
+        return {} if a is b else {'<header>': (a is not None, b is not None)}
+    changes = {}
+    for name in type(a).model_fields:
+        value_a = getattr(a, name)
+        value_b = getattr(b, name)
+        if value_a != value_b:
+            changes[name] = (value_a, value_b)
+    return changes
+
+
+def changed_ranges(mask: np.ndarray) -> list[tuple[int, int]]:
+    """ Return the [start, stop) row ranges where a boolean mask is True. """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def diff_data(df_a: pd.DataFrame, df_b: pd.DataFrame, rtol: float = 0.0, atol: float = 1e-9) -> dict:
+    """
+    Compare two data frames column by column over their common rows.
+    Numeric columns are compared with np.isclose (NaN equals NaN), other columns exactly.
+    """
+    rows = min(len(df_a), len(df_b))
+    result = {
+        'rows': (len(df_a), len(df_b)),
+        'columns_removed': [c for c in df_a.columns if c not in df_b.columns],
+        'columns_added': [c for c in df_b.columns if c not in df_a.columns],
+        'columns': {},
+    }
+    for code in [c for c in df_a.columns if c in df_b.columns]:
+        values_a = df_a[code].to_numpy()[:rows]
+        values_b = df_b[code].to_numpy()[:rows]
+        if np.issubdtype(values_a.dtype, np.number) and np.issubdtype(values_b.dtype, np.number):
+            values_a = values_a.astype(float)
+            values_b = values_b.astype(float)
+            changed = ~np.isclose(values_a, values_b, rtol=rtol, atol=atol, equal_nan=True)
+            max_difference = float(np.nanmax(np.abs(values_a - values_b)[changed])) if changed.any() else 0.0
+        else:
+            changed = values_a.astype(str) != values_b.astype(str)
+            max_difference = None
+        if changed.any():
+            result['columns'][code] = {
+                'changed': int(changed.sum()),
+                'ranges': changed_ranges(changed),
+                'max_difference': max_difference,
+            }
+    return result
+
+
+def odf_diff(a, b, compare_data: bool = True, rtol: float = 0.0, atol: float = 1e-9) -> dict:
+    """
+    Compare two ODF files (or OdfHeader objects) and report only what differs.
+
+    Parameters
+    ----------
+    a, b: str or OdfHeader
+        ODF file paths or already read objects.
+    compare_data: bool
+        Compare the data records. For file paths the data is only parsed when the bytes of the
+        two data sections differ.
+    rtol, atol: float
+        Relative and absolute tolerances for numeric data values.
+
+    Returns
+    -------
+    dict
+        'headers': {block: {field: (a, b)}}, 'parameters': {code: {field: (a, b)}} plus the codes
+        only in a or b, 'data': column differences with changed row ranges (or None when skipped)
+        and 'summary' counts.
+    """
+    data_identical = False
+    if isinstance(a, str) and isinstance(b, str):
+        data_identical = not compare_data or data_section_hash(a) == data_section_hash(b)
+        a = OdfHeader().read_odf(a, header_only=data_identical)
+        b = OdfHeader().read_odf(b, header_only=data_identical)
+    assert isinstance(a, OdfHeader) and isinstance(b, OdfHeader), \
+        "Input arguments 'a' and 'b' must be file paths or OdfHeader objects."
+
+    headers = {}
+    for name in SINGLE_HEADERS:
+        changes = diff_fields(getattr(a, name), getattr(b, name))
+        if changes:
+            headers[name] = changes
+    for name in LIST_HEADERS:
+        list_a = getattr(a, name)
+        list_b = getattr(b, name)
+        for i in range(max(len(list_a), len(list_b))):
+            changes = diff_fields(list_a[i] if i < len(list_a) else None,
+                                  list_b[i] if i < len(list_b) else None)
+            if changes:
+                headers[f"{name}[{i}]"] = changes
+    if a.file_specification != b.file_specification:
+        headers['odf_header'] = {'file_specification': (a.file_specification, b.file_specification)}
+
+    params_a = {ph.code: ph for ph in a.parameter_headers}
+    params_b = {ph.code: ph for ph in b.parameter_headers}
+    parameters = {
+        'removed': [code for code in params_a if code not in params_b],
+        'added': [code for code in params_b if code not in params_a],
+        'changed': {},
+    }
+    for code in params_a.keys() & params_b.keys():
+        changes = diff_fields(params_a[code], params_b[code])
+        if changes:
+            parameters['changed'][code] = changes
+
+    data = None
+    if compare_data and not data_identical:
+        data = diff_data(a.data.data_frame, b.data.data_frame, rtol=rtol, atol=atol)
+
+    summary = {
+        'header_fields_changed': sum(len(changes) for changes in headers.values()),
+        'parameters_changed': len(parameters['changed']) + len(parameters['removed']) + len(parameters['added']),
+        'data_compared': data is not None,
+        'data_bytes_identical': compare_data and data_identical,
+        'data_values_changed': 0 if data is None else sum(c['changed'] for c in data['columns'].values()),
+    }
+    summary['identical'] = (summary['header_fields_changed'] == 0 and summary['parameters_changed'] == 0
+                            and summary['data_values_changed'] == 0
+                            and (data is None or (data['rows'][0] == data['rows'][1]
+                                                  and not data['columns_added'] and not data['columns_removed'])))
+    return {'headers': headers, 'parameters': parameters, 'data': data, 'summary': summary}
+
+
+def _diff_pair(paths: tuple) -> tuple:
+    try:
+        return paths[0], odf_diff(paths[0], paths[1])
+    except Exception as e:
+        return paths[0], {'error': f"{type(e).__name__}: {e}"}
+
+
+def diff_folders(folder_a: str, folder_b: str, wildcard: str = "*.ODF", max_workers: int | None = None) -> dict:
+    """
+    Compare every file matching wildcard in folder_a with the file of the same name in folder_b,
+    in parallel. Returns {file name: odf_diff result, or None if the file is missing in folder_b};
+    files that cannot be read map to {'error': message}.
+    """
+    results = {}
+    pairs = []
+    for path_a in sorted(glob.glob(os.path.join(folder_a, wildcard))):
+        path_b = os.path.join(folder_b, os.path.basename(path_a))
+        if os.path.isfile(path_b):
+            pairs.append((path_a, path_b))
+        else:
+            results[os.path.basename(path_a)] = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for path_a, diff in executor.map(_diff_pair, pairs):
+            results[os.path.basename(path_a)] = diff
+    return results
+
+
+def print_diff(diff: dict) -> str:
+    """ Return a short human readable report of an odf_diff() result. """
+    if 'error' in diff:
+        return f"error: {diff['error']}"
+    lines = []
+    for block, changes in diff['headers'].items():
+        for field, (value_a, value_b) in changes.items():
+            lines.append(f"{block}.{field}: {value_a!r} -> {value_b!r}")
+    parameters = diff['parameters']
+    for code in parameters['removed']:
+        lines.append(f"parameter {code} removed")
+    for code in parameters['added']:
+        lines.append(f"parameter {code} added")
+    for code, changes in parameters['changed'].items():
+        for field, (value_a, value_b) in changes.items():
+            lines.append(f"parameter {code}.{field}: {value_a!r} -> {value_b!r}")
+    data = diff['data']
+    if data is None:
+        lines.append("data: identical bytes" if diff['summary']['data_bytes_identical'] else "data: not compared")
+    else:
+        if data['rows'][0] != data['rows'][1]:
+            lines.append(f"data rows: {data['rows'][0]} -> {data['rows'][1]}")
+        for code, change in data['columns'].items():
+            ranges = ", ".join(f"{start}-{stop - 1}" for start, stop in change['ranges'][:5])
+            more = " ..." if len(change['ranges']) > 5 else ""
+            lines.append(f"data {code}: {change['changed']} values changed in rows {ranges}{more}")
+    return "\n".join(lines)
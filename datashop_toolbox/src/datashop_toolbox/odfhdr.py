@@ -1,5 +1,9 @@
 from datetime import datetime
 import numpy as np
+import os
+import re
+import shutil
+import tempfile
 import pandas as pd
 from typing import TypedDict
 
@@ -12,13 +16,16 @@ from datashop_toolbox.historyhdr import HistoryHeader
 from datashop_toolbox.instrumenthdr import InstrumentHeader
 from datashop_toolbox.meteohdr import MeteoHeader
 from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.parameter_table import ParameterTable, STATISTIC_FIELDS
 from datashop_toolbox.polynomialhdr import PolynomialCalHeader
 from datashop_toolbox.qualityhdr import QualityHeader
 from datashop_toolbox.recordhdr import RecordHeader
-from datashop_toolbox.records import DataRecords
-from datashop_toolbox.validated_base import ValidatedBase, add_commas, clean_strings, read_file_lines, find_lines_with_text, split_lines_into_dict, check_string
+from datashop_toolbox.metrics import count, timed
+from datashop_toolbox.memory_budget import chunk_rows, estimate_file_footprint, estimate_footprint, exceeds_budget, get_memory_budget, track_stage
+from datashop_toolbox.records import DataRecords, fixed_width_slots, parse_data_lines, patch_fixed_width_columns
+from datashop_toolbox.validated_base import ValidatedBase, add_commas, clean_strings, read_file_lines, read_header_lines, count_data_lines, find_lines_with_text, split_lines_into_dict, check_string
 from typing import Optional, List
-from pydantic import Field, field_validator, ConfigDict
+from pydantic import Field, PrivateAttr, field_validator, ConfigDict
 from termcolor import cprint, colored
 
 
@@ -53,6 +60,9 @@ class OdfHeader(ValidatedBase, BaseHeader):
     record_header: RecordHeader = Field(default_factory=RecordHeader)
     data: DataRecords = Field(default_factory=DataRecords)
 
+    # Data section copied on write (read_odf(..., header_only=True) or set_data_source()); see write_odf().
+    _data_source: Optional[dict] = PrivateAttr(default=None)
+
     def __init__(self, config=None, **data):
         super().__init__(**data)  # Calls Pydantic's __init__
         BaseHeader.__init__(self, config) # Ensures logger and config are set
@@ -112,6 +122,17 @@ class OdfHeader(ValidatedBase, BaseHeader):
 
     def print_object(self, file_version: float = 2.0) -> str:
         assert isinstance(file_version, float), "Input argument 'file_version' must be a float."
+        odf_output = self.print_header(file_version)
+        if file_version == 2.0:
+            odf_output += self.data.print_object_old_style()
+        elif file_version >= 3:
+            odf_output += self.data.print_object()
+        return odf_output
+
+    @timed("render.headers")
+    def print_header(self, file_version: float = 2.0) -> str:
+        """ Return the header blocks of the ODF object, up to and including the '-- DATA --' line. """
+        assert isinstance(file_version, float), "Input argument 'file_version' must be a float."
 
         # Add modifications to the OdfHeader instance before outputting it
         self.add_log_to_history()
@@ -124,70 +145,86 @@ class OdfHeader(ValidatedBase, BaseHeader):
             ("quality_header", self.quality_header)
         ]
 
-        # Helper to add header outputs
+        # Helper to add header outputs (sub-headers reuse their cached text when unchanged)
         def add_header_output(header, use_commas=True):
             if use_commas:
-                return add_commas(header.print_object())
-            return header.print_object()
+                return add_commas(header.render_cached())
+            return header.render_cached()
 
         if file_version == 2.0:
             self.odf_specification_version = 2.0
             odf_output = "ODF_HEADER,\n"
             odf_output += f"  FILE_SPECIFICATION = {self.file_specification},\n"
-            odf_output += add_commas(self.cruise_header.print_object())
-            odf_output += add_commas(self.event_header.print_object())
+            odf_output += add_commas(self.cruise_header.render_cached())
+            odf_output += add_commas(self.event_header.render_cached())
 
             for name, header in optional_headers:
                 if header is not None:
                     odf_output += add_header_output(header)
 
-            odf_output += add_commas(self.instrument_header.print_object())
+            odf_output += add_commas(self.instrument_header.render_cached())
 
             for cal in self.general_cal_headers + self.polynomial_cal_headers + self.compass_cal_headers:
-                odf_output += add_commas(cal.print_object())
+                odf_output += add_commas(cal.render_cached())
 
             for hist in self.history_headers:
-                odf_output += add_commas(hist.print_object())
+                odf_output += add_commas(hist.render_cached())
 
             for param in self.parameter_headers:
-                odf_output += add_commas(param.print_object())
+                odf_output += add_commas(param.render_cached())
 
-            odf_output += add_commas(self.record_header.print_object())
+            odf_output += add_commas(self.record_header.render_cached())
             odf_output += "-- DATA --\n"
-            odf_output += self.data.print_object_old_style()
 
         elif file_version >= 3:
             self.odf_specification_version = 3.0
             odf_output = "ODF_HEADER\n"
             odf_output += f"  FILE_SPECIFICATION = {self.file_specification}\n"
             odf_output += f"  ODF_SPECIFICATION_VERSION = {self.odf_specification_version}\n"
-            odf_output += self.cruise_header.print_object() + "\n"
-            odf_output += self.event_header.print_object() + "\n"
+            odf_output += self.cruise_header.render_cached() + "\n"
+            odf_output += self.event_header.render_cached() + "\n"
 
             for name, header in optional_headers:
                 if header is not None:
-                    odf_output += add_header_output(header, use_commas=False)
+                    odf_output += add_header_output(header, use_commas=False) + "\n"
 
-            odf_output += self.instrument_header.print_object() + "\n"
+            odf_output += self.instrument_header.render_cached() + "\n"
 
             for cal in self.general_cal_headers + self.polynomial_cal_headers + self.compass_cal_headers:
-                odf_output += cal.print_object() + "\n"
+                odf_output += cal.render_cached() + "\n"
 
             for hist in self.history_headers:
-                odf_output += hist.print_object() + "\n"
+                odf_output += hist.render_cached() + "\n"
 
             for param in self.parameter_headers:
-                odf_output += param.print_object() + "\n"
+                odf_output += param.render_cached() + "\n"
 
-            odf_output += self.record_header.print_object() + "\n"
+            odf_output += self.record_header.render_cached() + "\n"
             odf_output += "-- DATA --" + "\n"
-            odf_output += self.data.print_object()
 
         return odf_output
 
-    def read_odf(self, odf_file_path: str):
+    @timed("read_odf")
+    @track_stage("read_odf")
+    def read_odf(self, odf_file_path: str, header_only: bool = False, arrow: bool = False):
+        """
+        Read an ODF file into this object.
+        With header_only=True the data rows are not parsed; write_odf() then copies the original
+        data bytes to the output unchanged, which is much faster for metadata-only edits.
+        With arrow=True the data records are stored as Arrow arrays (requires pyarrow).
+        If a memory budget is set (see memory_budget.py) and the file would not fit in it, the
+        data section is streamed and parsed in chunks instead of being read whole.
+        """
         assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
-        file_lines = read_file_lines(odf_file_path)
+        assert isinstance(header_only, bool), "Input argument 'header_only' must be a boolean."
+        assert isinstance(arrow, bool), "Input argument 'arrow' must be a boolean."
+        streaming = (not header_only and get_memory_budget() is not None
+                     and exceeds_budget(estimate_file_footprint(odf_file_path)))
+        with timed("read_odf.read_lines"):
+            if header_only or streaming:
+                file_lines, data_offset = read_header_lines(odf_file_path)
+            else:
+                file_lines = read_file_lines(odf_file_path)
         
         substrings_to_find = ["_HEADER"]
         if isinstance(file_lines, list):
@@ -236,67 +273,147 @@ class OdfHeader(ValidatedBase, BaseHeader):
         })
 
         # Loop through the header lines, populating the OdfHeader object as it goes.
-        for i in range(ndf):
-            header_block = str(header_blocks_df.at[i, 'name'])
-            x = header_field_range.at[i, 'Start']
-            y = header_field_range.at[i, 'End']
-            block_lines = list(header_lines[x:(y + 1)])
-            match header_block:
-                case "COMPASS_CAL_HEADER":
-                    compass_cal_header = CompassCalHeader()
-                    compass_cal_header.populate_object(block_lines)
-                    self.compass_cal_headers.append(compass_cal_header)
-                case "CRUISE_HEADER":
-                    self.cruise_header = self.cruise_header.populate_object(block_lines)
-                case "EVENT_HEADER":
-                    self.event_header = self.event_header.populate_object(block_lines)
-                case "GENERAL_CAL_HEADER":
-                    general_cal_header = GeneralCalHeader()
-                    general_cal_header.populate_object(block_lines)
-                    self.general_cal_headers.append(general_cal_header)
-                case "HISTORY_HEADER":
-                    history_header = HistoryHeader()
-                    history_header.populate_object(block_lines)
-                    history_header.print_object()
-                    self.history_headers.append(history_header)
-                case "INSTRUMENT_HEADER":
-                    self.instrument_header = self.instrument_header.populate_object(block_lines)
-                case "METEO_HEADER":
-                    self.meteo_header = MeteoHeader()
-                    self.meteo_header.populate_object(block_lines)
-                case "ODF_HEADER":
-                    for header_line in block_lines:
-                        tokens = header_line.split('=', maxsplit=1)
-                        header_fields = split_lines_into_dict(tokens)
-                        self.populate_object(header_fields)
-                case "PARAMETER_HEADER":
-                    parameter_header = ParameterHeader()
-                    parameter_header.populate_object(block_lines)
-                    self.parameter_headers.append(parameter_header)
-                case "POLYNOMIAL_CAL_HEADER":
-                    polynomial_cal_header = PolynomialCalHeader()
-                    polynomial_cal_header.populate_object(block_lines)
-                    self.polynomial_cal_headers.append(polynomial_cal_header)
-                case "QUALITY_HEADER":
-                    self.quality_header = QualityHeader()
-                    self.quality_header.populate_object(block_lines)
-                case "RECORD_HEADER":
-                    self.record_header = RecordHeader()
-                    self.record_header.populate_object(block_lines)
-        parameter_list = list()
-        parameter_formats = dict()
-        for parameter in self.parameter_headers:
-            parameter_code = parameter.code.strip("'")
-            parameter_list.append(parameter_code)
-            if parameter_code[0:4] == 'SYTM':
-                parameter_formats[parameter_code] = f"{parameter.print_field_width}"
-            else:
-                parameter_formats[parameter_code] = (f"{parameter.print_field_width}."
-                                                     f"{parameter.print_decimal_places}")
-        if isinstance(data_lines, list):
-            self.data.populate_object(parameter_list, parameter_formats, data_lines)
+        # Header parsing is mostly pydantic validation of the header fields.
+        with timed("read_odf.headers"):
+            for i in range(ndf):
+                header_block = str(header_blocks_df.at[i, 'name'])
+                x = header_field_range.at[i, 'Start']
+                y = header_field_range.at[i, 'End']
+                block_lines = list(header_lines[x:(y + 1)])
+                match header_block:
+                    case "COMPASS_CAL_HEADER":
+                        compass_cal_header = CompassCalHeader()
+                        compass_cal_header.populate_object(block_lines)
+                        self.compass_cal_headers.append(compass_cal_header)
+                    case "CRUISE_HEADER":
+                        self.cruise_header = self.cruise_header.populate_object(block_lines)
+                    case "EVENT_HEADER":
+                        self.event_header = self.event_header.populate_object(block_lines)
+                    case "GENERAL_CAL_HEADER":
+                        general_cal_header = GeneralCalHeader()
+                        general_cal_header.populate_object(block_lines)
+                        self.general_cal_headers.append(general_cal_header)
+                    case "HISTORY_HEADER":
+                        history_header = HistoryHeader()
+                        history_header.populate_object(block_lines)
+                        history_header.print_object()
+                        self.history_headers.append(history_header)
+                    case "INSTRUMENT_HEADER":
+                        self.instrument_header = self.instrument_header.populate_object(block_lines)
+                    case "METEO_HEADER":
+                        self.meteo_header = MeteoHeader()
+                        self.meteo_header.populate_object(block_lines)
+                    case "ODF_HEADER":
+                        for header_line in block_lines:
+                            tokens = header_line.split('=', maxsplit=1)
+                            header_fields = split_lines_into_dict(tokens)
+                            self.populate_object(header_fields)
+                    case "PARAMETER_HEADER":
+                        parameter_header = ParameterHeader()
+                        parameter_header.populate_object(block_lines)
+                        self.parameter_headers.append(parameter_header)
+                    case "POLYNOMIAL_CAL_HEADER":
+                        polynomial_cal_header = PolynomialCalHeader()
+                        polynomial_cal_header.populate_object(block_lines)
+                        self.polynomial_cal_headers.append(polynomial_cal_header)
+                    case "QUALITY_HEADER":
+                        self.quality_header = QualityHeader()
+                        self.quality_header.populate_object(block_lines)
+                    case "RECORD_HEADER":
+                        self.record_header = RecordHeader()
+                        self.record_header.populate_object(block_lines)
+        count("read_odf.files")
+        count("read_odf.header_blocks", ndf)
+        table = self.parameter_table()
+        parameter_formats = table.print_formats()
+        # One entry per PARAMETER_HEADER, so repeated codes keep the data columns in step.
+        parameter_list = [code.strip("'") for code in table.codes]
+        if header_only:
+            self.data.parameter_list = parameter_list
+            self.data.print_formats = parameter_formats
+            self.set_data_source(odf_file_path, data_offset, 2.0 if file_lines[0].endswith(',') else 3.0)
+        else:
+            self._data_source = None
+            if streaming:
+                self.data.data_frame = self._read_data_in_chunks(
+                    odf_file_path, data_offset, 2.0 if file_lines[0].endswith(',') else 3.0,
+                    parameter_list, parameter_formats)
+                self.data.parameter_list = parameter_list
+                self.data.print_formats = parameter_formats
+            elif isinstance(data_lines, list):
+                self.data.populate_object(parameter_list, parameter_formats, data_lines)
+            if arrow:
+                self.data.use_arrow()
         return self
 
+    @staticmethod
+    def _read_data_in_chunks(odf_file_path: str, offset: int, version: float, parameter_list: list,
+                             parameter_formats: dict) -> pd.DataFrame:
+        """ Parse the data section a budget-sized block of lines at a time. """
+        rows_per_chunk = chunk_rows(len(parameter_list))
+        frames = []
+        lines = []
+        with open(odf_file_path, "rb") as file:
+            file.seek(offset)
+            skip_column_names = version >= 3
+            for line in file:
+                if not line.strip():
+                    continue
+                if skip_column_names:
+                    skip_column_names = False
+                    continue
+                lines.append(line)
+                if len(lines) == rows_per_chunk:
+                    frames.append(parse_data_lines(lines, parameter_list, parameter_formats, version))
+                    lines = []
+        if lines:
+            frames.append(parse_data_lines(lines, parameter_list, parameter_formats, version))
+        if not frames:
+            return pd.DataFrame(columns=parameter_list)
+        return pd.concat(frames, ignore_index=True)
+
+    def set_data_source(self, data_file_path: str, offset: int = 0, version: float = 2.0,
+                        rows: Optional[int] = None) -> None:
+        """
+        Use the bytes of data_file_path from offset onwards as the data section of this object.
+        write_odf() then writes the rendered header blocks followed by those bytes, which must
+        already be formatted for the given ODF version and the current parameter headers.
+        """
+        assert isinstance(data_file_path, str), "Input argument 'data_file_path' must be a string."
+        assert isinstance(version, float), "Input argument 'version' must be a float."
+        self._data_source = {
+            'path': data_file_path,
+            'offset': offset,
+            'version': version,
+            'codes': tuple(self.get_parameter_codes()),
+        }
+        if rows is not None:
+            self._data_source['rows'] = rows
+
+    def set_data_frame(self, df: pd.DataFrame) -> None:
+        """
+        Use df (one column per parameter code, in parameter order) as the data records,
+        replacing the data section of a file read with header_only=True.
+        """
+        assert isinstance(df, pd.DataFrame), "Input argument 'df' must be a pandas DataFrame."
+        self._data_source = None
+        self.data.data_frame = df
+        self.data.parameter_list = list(df.columns)
+
+    def data_row_count(self) -> int:
+        """ Return the number of data records, counting them on disk if the data was not parsed. """
+        source = self._data_source
+        if source is None:
+            return len(self.data)
+        if 'rows' not in source:
+            rows = count_data_lines(source['path'], source['offset'])
+            # Version 3 data starts with a CSV line of column names.
+            if source['version'] >= 3 and rows > 0:
+                rows -= 1
+            source['rows'] = rows
+        return source['rows']
+
+    @timed("update_odf")
     def update_odf(self) -> None:
         number_of_calibrations = len(self.polynomial_cal_headers) + len(self.general_cal_headers)
         if self.record_header.num_calibration != number_of_calibrations:
@@ -307,32 +424,200 @@ class OdfHeader(ValidatedBase, BaseHeader):
             self.record_header.num_swing = len(self.compass_cal_headers)
         if self.record_header.num_param != len(self.parameter_headers):
             self.record_header.num_param = len(self.parameter_headers)
-        if self.record_header.num_cycle != len(self.data):
-            self.record_header.num_cycle = len(self.data)
-        # Update the parameter headers if required.
-        for ph in self.parameter_headers:
-            param_data = self.data.data_frame[ph.code]
-            if ph.type == 'SYTM':
-                ph.minimum_value = param_data.iloc[0]
-                ph.maximum_value = param_data.iloc[-1]
-            else:
-                ph.minimum_value = min(param_data)
-                ph.maximum_value = max(param_data)
+        number_of_records = self.data_row_count()
+        if self.record_header.num_cycle != number_of_records:
+            self.record_header.num_cycle = number_of_records
+        if self._data_source is not None:
+            # The data was not parsed, so the min/max values read from the header still apply.
+            return
+        # Update the parameter minimum/maximum values in one pass over the data columns
+        # (without records, the values already in the headers are kept).
+        table = self.parameter_table()
+        table.update_statistics(self.data.data_frame)
+        table.apply_to(self.parameter_headers, STATISTIC_FIELDS)
+
+    def parameter_table(self) -> ParameterTable:
+        """ Return a columnar ParameterTable of the parameter headers (see parameter_table.py). """
+        return ParameterTable.from_headers(self.parameter_headers)
+
+    def trim(self, start=None, end=None) -> "OdfHeader":
+        """
+        Keep only the records with start <= SYTM_01 <= end (either bound may be None).
+        The window is found by binary search on the sorted SYTM values and the data frame becomes
+        a copy-on-write slice; the event start/end times and record counts are then updated.
+        """
+        if self._data_source is not None:
+            raise ValueError("Data read with header_only=True cannot be trimmed.")
+        window = self.data.time_slice(start, end)
+        old_count = len(self.data)
+        self.data.data_frame = self.data.data_frame.iloc[window]
+        if len(self.data) > 0:
+            sytm = self.data.data_frame['SYTM_01']
+            self.event_header.start_date_time = str(sytm.iloc[0]).strip("' ")
+            self.event_header.end_date_time = str(sytm.iloc[-1]).strip("' ")
+        self.log_odf_message(f"Trimmed the data from {old_count} to {len(self.data)} records "
+                             f"(rows {window.start} to {window.stop - 1}).", 'base')
+        self.update_odf()
+        return self
 
+    def repair_time_axis(self, deduplicate: bool = False, gap_factor: float = 3.0) -> dict:
+        """
+        Check the SYTM_01 times and repair their order: the records are sorted by time (stably)
+        and, with deduplicate=True, only the first record of each time is kept. The event start
+        and end times, the sampling interval (median step over the whole series; also
+        EVENT_QUALIFIER2 and the file specification of MTR files) and the record counts are then
+        updated.
+        Returns the analyze_time_axis() report of the original times plus the 'moved' and
+        'removed' record counts.
+        """
+        if self._data_source is not None:
+            raise ValueError("Data read with header_only=True cannot be repaired.")
+        report = self.data.check_time_axis(gap_factor=gap_factor)
+        report.update(self.data.repair_time_axis(deduplicate=deduplicate))
+        if report['moved']:
+            self.log_odf_message(f"Sorted the data records by SYTM_01 ({report['moved']} records moved).", 'base')
+        if report['removed']:
+            self.log_odf_message(f"Removed {report['removed']} records with duplicate SYTM_01 values.", 'base')
+        if len(self.data) > 0:
+            sytm = self.data.data_frame['SYTM_01']
+            self.event_header.start_date_time = str(sytm.iloc[0]).strip("' ")
+            self.event_header.end_date_time = str(sytm.iloc[-1]).strip("' ")
+        if not np.isnan(report['interval_seconds']):
+            self.event_header.sampling_interval = report['interval_seconds']
+            # MTR files also carry the interval in EVENT_QUALIFIER2, and so in their file specification.
+            if self.event_header.data_type == 'MTR' and self.event_header.event_qualifier2.isdigit():
+                file_spec = self.generate_file_spec()
+                self.event_header.event_qualifier2 = str(int(report['interval_seconds']))
+                if self.file_specification.strip("' ") == file_spec:
+                    self.file_specification = self.generate_file_spec()
+        self.update_odf()
+        return report
+
+    def clone(self) -> "OdfHeader":
+        """
+        Return a modifiable copy of this ODF object in O(headers) time.
+        Each header block is shallow-copied (keeping its cached text) and the data frame shares
+        its column buffers copy-on-write, so only columns that are later written get duplicated.
+        """
+        new = super().clone()
+        for name in ("cruise_header", "event_header", "meteo_header", "instrument_header",
+                     "quality_header", "record_header", "data"):
+            header = getattr(self, name)
+            if header is not None:
+                new.__dict__[name] = header.clone()
+        for name in ("general_cal_headers", "compass_cal_headers", "polynomial_cal_headers",
+                     "history_headers", "parameter_headers"):
+            new.__dict__[name] = [header.clone() for header in getattr(self, name)]
+        if self._data_source is not None:
+            new._data_source = dict(self._data_source)
+        return new
+
+    @timed("write_odf")
+    @track_stage("write_odf")
     def write_odf(self, odf_file_path: str, version: float = 2.0) -> None:
         assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
         assert isinstance(version, float), "Input argument 'version' must be a float."
 
         """ Write the ODF file to disk. """
-        odf_file_text = self.print_object(file_version = version)
-        file1 = open(odf_file_path, "w")
-        file1.write(odf_file_text)
-        file1.close()
+        if self._data_source is not None:
+            self._write_passthrough(odf_file_path, version)
+        elif exceeds_budget(estimate_footprint(len(self.data), len(self.data.parameter_list))):
+            # Too large for the memory budget: format and write the data a chunk at a time.
+            with open(odf_file_path, "w") as file:
+                file.write(self.print_header(file_version = version))
+                pieces = self.data.iter_text(version, chunk_rows(len(self.data.parameter_list)))
+                for i, text in enumerate(pieces):
+                    with timed("write_odf.disk"):
+                        if i and version < 3:
+                            file.write("\n")
+                        file.write(text)
+        else:
+            odf_file_text = self.print_object(file_version = version)
+            with timed("write_odf.disk"):
+                file1 = open(odf_file_path, "w")
+                file1.write(odf_file_text)
+                file1.close()
+        count("write_odf.files")
         msg1 = colored("ODF file written to: ", 'yellow')
         msg2 = colored(f"{odf_file_path}", 'cyan')
         msg = msg1 + msg2
         print(msg)
 
+    def _write_passthrough(self, odf_file_path: str, version: float) -> None:
+        """ Write freshly rendered header blocks followed by the original data bytes. """
+        source = self._data_source
+        if version != source['version']:
+            raise ValueError(f"Data read with header_only=True is in ODF version {source['version']} "
+                             f"format and cannot be written as version {version}.")
+        codes = tuple(self.get_parameter_codes())
+        # Version 2 data has no column names, so only the parameter count has to match.
+        if len(codes) != len(source['codes']) or (version >= 3 and codes != source['codes']):
+            raise ValueError("Parameters cannot be added, removed or reordered when the data "
+                             "was read with header_only=True.")
+        header_text = self.print_header(file_version = version)
+        in_place = os.path.realpath(odf_file_path) == os.path.realpath(source['path'])
+        # Writing over the source file would truncate the data before it is copied, so write a
+        # temporary file next to it and replace the source with it.
+        output_path = odf_file_path
+        if in_place:
+            folder = os.path.dirname(os.path.realpath(odf_file_path))
+            handle, output_path = tempfile.mkstemp(suffix=".ODF", dir=folder)
+            os.close(handle)
+        try:
+            with timed("write_odf.disk"), open(output_path, "w", encoding="iso-8859-1") as file, \
+                    open(source['path'], "rb") as src:
+                file.write(header_text)
+                file.flush()
+                data_offset = file.buffer.tell()
+                src.seek(source['offset'])
+                shutil.copyfileobj(src, file.buffer)
+            if in_place:
+                os.replace(output_path, odf_file_path)
+                source['offset'] = data_offset
+        finally:
+            if in_place and os.path.exists(output_path):
+                os.remove(output_path)
+
+    def patch_odf(self, source_file_path: str, odf_file_path: str, codes: list) -> None:
+        """
+        Write a copy of a version 2 ODF file in which only the given data columns are replaced.
+        The header blocks are rendered from this object (so new history and quality headers are
+        included) and the other data columns are copied byte for byte from the source file.
+        Raises ValueError if the source data rows are not fixed width or a value does not fit.
+        """
+        assert isinstance(source_file_path, str), "Input argument 'source_file_path' must be a string."
+        assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+        assert isinstance(codes, list), "Input argument 'codes' must be a list."
+        if os.path.abspath(source_file_path) == os.path.abspath(odf_file_path):
+            raise ValueError("The patched ODF file must be written to a new path.")
+        header_lines, offset = read_header_lines(source_file_path)
+        if not header_lines or not header_lines[0].endswith(','):
+            raise ValueError(f"{source_file_path} is not a version 2 ODF file.")
+        with open(source_file_path, "rb") as src:
+            src.seek(offset)
+            data = src.read()
+        first_row = data.split(b"\n", 1)[0]
+        slots = fixed_width_slots(first_row)
+        parameter_codes = self.get_parameter_codes()
+        if len(slots) != len(parameter_codes):
+            raise ValueError(f"Found {len(slots)} fields in the first data row of {source_file_path}, "
+                             f"expected {len(parameter_codes)}.")
+        unknown = [code for code in codes if code not in parameter_codes]
+        if unknown:
+            raise ValueError(f"Unknown parameter code(s): {unknown}")
+        columns = {parameter_codes.index(code): code for code in codes}
+        values = {i: self.data.data_frame[code].to_numpy() for i, code in columns.items()}
+        formats = {i: f".{self.parameter_headers[i].print_decimal_places}f" for i in columns}
+        data = patch_fixed_width_columns(data, {i: slots[i] for i in columns}, values, formats)
+        header_text = self.print_header(file_version = 2.0)
+        with open(odf_file_path, "w", encoding="iso-8859-1") as file:
+            file.write(header_text)
+            file.flush()
+            file.buffer.write(data)
+        msg1 = colored("ODF file written to: ", 'yellow')
+        msg2 = colored(f"{odf_file_path}", 'cyan')
+        print(msg1 + msg2)
+
     @staticmethod
     def generate_creation_date() -> str:
         dt = datetime.now().strftime("%d-%b-%Y %H:%M:%S.%f").upper()
@@ -403,68 +688,116 @@ class OdfHeader(ValidatedBase, BaseHeader):
         set_file_spec = f"{dt}_{cn}_{sn}_{eq1}_{eq2}"
         return set_file_spec
 
-    # def fix_parameter_codes(self, new_codes: list = []) -> Self:
-    #     assert isinstance(new_codes, list), "Input argument 'new_codes' must be a list."
-
-    #     # Get the list of parameter names and the data frame in case names need to be fixed.
-    #     df = self.data.data_frame
-    #     if not new_codes:
-
-    #         # Check if the parameter codes are in the correct format. If they are not then fix them.
-    #         codes = self.data.parameter_list
-
-    #         # Loop through the list of parameter codes and fix any that require it.
-    #         for p, pcode in enumerate(codes):
-    #             expected_format = '[A-Z]{4}[_]{1}[0-9]{2}'
-    #             expected_match = re.compile(expected_format)
-    #             if expected_match.findall(pcode) == []:
-    #                 new_pcode = input(f"Please enter the correct code name (e.g. TEMP_01) for {pcode} : ")
-    #                 new_codes.append(new_pcode)
-    #                 df.rename(columns={pcode: new_pcode})
-    #                 self.parameter_headers[p].code = new_pcode
-
-    #         # Fix the Polynomial_Cal_Headers if required.
-    #         if self.polynomial_cal_headers:
-    #             self.fix_polynomial_codes(codes, new_codes)
+    def edit_parameters(self, remove: Optional[List[str]] = None, rename: Optional[dict] = None,
+                        order: Optional[List[str]] = None) -> "OdfHeader":
+        """
+        Remove, rename and reorder parameters in a single pass.
+
+        Parameters
+        ----------
+        remove: list[str]
+            Parameter codes to drop (ex: ['FFFF_01', 'UNKN_01']).
+        rename: dict[str, str]
+            Mapping of existing code to new code (ex: {'TEMP_01': 'TE90_01'}).
+        order: list[str]
+            Final order of the remaining parameters, using the new codes.
+            Defaults to the current order.
+
+        Returns
+        -------
+        self: OdfHeader
+            The parameter headers, parameter list, print formats, calibration header codes
+            and data frame columns are all updated; the data frame is reindexed only once.
+        """
+        remove = set(remove or [])
+        rename = dict(rename or {})
+        codes = self.get_parameter_codes()
 
-    #         # Assign the revised data frame back to the odf object.
-    #         self.data.data_frame = df
-        
-    #     else:
+        unknown = sorted((remove | set(rename)) - set(codes))
+        if unknown:
+            raise ValueError(f"Unknown parameter code(s): {', '.join(unknown)}")
+        kept = [code for code in codes if code not in remove]
+        new_codes = [rename.get(code, code) for code in kept]
+        if len(set(new_codes)) != len(new_codes):
+            raise ValueError(f"Renaming would create duplicate parameter codes: {new_codes}")
+        if order is None:
+            order = new_codes
+        elif sorted(order) != sorted(new_codes):
+            raise ValueError("Input argument 'order' must list every remaining parameter code exactly once.")
+        old_code_for = dict(zip(new_codes, kept))
+
+        # Parameter headers: rename in place, then rebuild the list in the requested order.
+        header_for = {}
+        for ph in self.parameter_headers:
+            if ph.code in remove:
+                continue
+            new_code = rename.get(ph.code, ph.code)
+            if new_code != ph.code:
+                ph.code = new_code
+            header_for[new_code] = ph
+        reordered = order != new_codes
+        self.parameter_headers = [header_for[code] for code in order]
+        if reordered:
+            for i, ph in enumerate(self.parameter_headers, start=1):
+                if ph.print_field_order != int(BaseHeader.NULL_VALUE):
+                    ph.print_field_order = i
+
+        # Calibration headers refer to parameters by code.
+        for cal in self.polynomial_cal_headers + self.general_cal_headers:
+            if cal.parameter_code in rename:
+                cal.parameter_code = rename[cal.parameter_code]
+
+        # Data: one column reindex covers removal and reordering; set_axis applies the renames.
+        df = self.data.data_frame
+        source_columns = [old_code_for[code] for code in order]
+        self.data.data_frame = df.reindex(columns=source_columns).set_axis(order, axis=1)
+        formats = self.data.print_formats
+        self.data.print_formats = {code: formats[old_code_for[code]] for code in order
+                                   if old_code_for[code] in formats}
+        self.data.parameter_list = list(order)
+
+        for code in sorted(remove):
+            self.log_odf_message(f'Parameter "{code}" was removed.', 'base')
+        for old_code, new_code in rename.items():
+            if old_code != new_code:
+                self.log_odf_message(f'Parameter code "{old_code}" was changed to "{new_code}".', 'base')
+        if reordered:
+            self.log_odf_message(f'Parameters were reordered to: {", ".join(order)}.', 'base')
+        return self
 
-    #         old_codes = df.columns.to_list()
-    #         df.columns = new_codes
-    #         self.data.data_frame = df
-    #         self.data.parameter_list = new_codes
-    #         nparams = len(self.get_parameter_codes())
-    #         for j in range(nparams):
-    #             self.parameter_headers[j].code = new_codes[j]
-
-    #         # Fix the Polynomial_Cal_Headers if required.
-    #         if self.polynomial_cal_headers:
-    #             self.fix_polynomial_codes(old_codes, new_codes)
-        
-    #     return self
-    
-    # def fix_polynomial_codes(self, old_codes: list, new_codes: list) -> Self:
-    #     assert isinstance(old_codes, list), "Input argument 'old_codes' must be a list."
-    #     assert isinstance(new_codes, list), "Input argument 'new_codes' must be a list."
-
-    #     for i, pch in enumerate(self.polynomial_cal_headers):
-
-    #         # Find the Polynomial_Cal_Header Code in old_codes and replace it with the corresponding code from new_codes.
-    #         poly_code = pch.parameter_code
-    #         try:
-    #             # This poly_code may have actually been a parameter_name instead of a parameter_code.
-    #             # Check the parameter names and if there is a match then assign the parameter code as the polynomial code.
-    #             pnames = self.get_parameter_names()
-    #             pnames = [x.replace('"', '') for x in pnames]
-    #             if poly_code in pnames:
-    #                 self.polynomial_cal_headers[i].parameter_code = new_codes[i]
-    #         except Exception as e:
-    #             print(e)
-    #             print(f"Item {poly_code} not found in old_codes list.")
-    #     return self
+    def fix_parameter_codes(self, new_codes: Optional[List[str]] = None) -> "OdfHeader":
+        """
+        Replace the parameter codes with new_codes (one per existing parameter, in order).
+        If new_codes is not supplied, the user is asked for a replacement for every code
+        that does not match the GF3 form (ex: TEMP_01).
+        """
+        codes = self.get_parameter_codes()
+        if new_codes:
+            assert len(new_codes) == len(codes), \
+                f"Input argument 'new_codes' must contain {len(codes)} codes but has {len(new_codes)}."
+        else:
+            expected_match = re.compile('[A-Z]{4}[_]{1}[0-9]{2}')
+            new_codes = list(codes)
+            for p, pcode in enumerate(codes):
+                if not expected_match.fullmatch(pcode):
+                    new_codes[p] = input(f"Please enter the correct code name (e.g. TEMP_01) for {pcode} : ")
+        self.fix_polynomial_codes(codes, new_codes)
+        rename = {old: new for old, new in zip(codes, new_codes) if old != new}
+        return self.edit_parameters(rename=rename)
+
+    def fix_polynomial_codes(self, old_codes: list, new_codes: list) -> "OdfHeader":
+        """
+        Point Polynomial_Cal_Headers that still refer to a parameter by its name (older files
+        used PARAMETER_NAME) at the matching parameter code. Renames of codes are applied by
+        edit_parameters().
+        """
+        assert isinstance(old_codes, list), "Input argument 'old_codes' must be a list."
+        assert isinstance(new_codes, list), "Input argument 'new_codes' must be a list."
+        pnames = [name.replace('"', '') for name in self.get_parameter_names()]
+        for pch in self.polynomial_cal_headers:
+            if pch.parameter_code not in old_codes and pch.parameter_code in pnames:
+                pch.parameter_code = old_codes[pnames.index(pch.parameter_code)]
+        return self
 
     def is_parameter_code(self, code: str) -> bool:
         assert isinstance(code, str), "Input argument 'code' must be a string."
@@ -478,6 +811,8 @@ class OdfHeader(ValidatedBase, BaseHeader):
         return new_df
 
 
+    @timed("add_quality_flags")
+    @track_stage("add_quality_flags")
     def add_quality_flags(self):
 
         excluded_cols = ['SYTM', 'CNTR', 'SNCNTR']
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+# One column per ParameterHeader field, in the order the fields are declared.
+TABLE_FIELDS = tuple(ParameterHeader.model_fields)
+STATISTIC_FIELDS = ('minimum_value', 'maximum_value')
+
+
+def column_extremes(df: pd.DataFrame, codes: list) -> tuple[dict, dict]:
+    """
+    Return ({code: minimum}, {code: maximum}) for the given columns of a data frame, as the
+    builtin min() and max() give them. Columns of the same numeric dtype are reduced together
+    in one numpy call and keep the column's numpy scalar type; float columns holding NaN fall
+    back to min() and max(), whose result depends on where the NaN values are.
+    """
+    minimums = {}
+    maximums = {}
+    groups = {}
+    for code, dtype in zip(codes, df.dtypes[codes]):
+        groups.setdefault(dtype, []).append(code)
+    for dtype, group in groups.items():
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+            block = df[group].to_numpy()
+            minimums.update(zip(group, block.min(axis=0)))
+            maximums.update(zip(group, block.max(axis=0)))
+            if dtype.kind == 'f':
+                for code in [code for code, has_nan in zip(group, np.isnan(block).any(axis=0)) if has_nan]:
+                    minimums[code] = min(df[code])
+                    maximums[code] = max(df[code])
+        elif isinstance(dtype, pd.ArrowDtype):
+            # Arrow columns reduce natively and skip nulls.
+            for code in group:
+                minimums[code] = df[code].min()
+                maximums[code] = df[code].max()
+        else:
+            for code in group:
+                minimums[code] = min(df[code])
+                maximums[code] = max(df[code])
+    return minimums, maximums
+
+
+class ParameterTable:
+    """
+    Columnar view of a list of ParameterHeader objects.
+
+    Each ParameterHeader field is one column of a pandas DataFrame (one row per parameter),
+    so bulk operations on wide files (hundreds of parameters) are array operations instead of
+    attribute access on validated pydantic objects. Use apply_to() to copy changes back to the
+    headers; only values that differ are assigned, so unchanged headers keep their cached text.
+    """
+
+    def __init__(self, frame: pd.DataFrame | None = None):
+        self.frame = frame if frame is not None else pd.DataFrame(columns=list(TABLE_FIELDS))
+
+    @classmethod
+    def from_headers(cls, headers: list) -> "ParameterTable":
+        """ Build a table from ParameterHeader objects. """
+        assert isinstance(headers, list), "Input argument 'headers' must be a list."
+        columns = {field: [getattr(header, field) for header in headers] for field in TABLE_FIELDS}
+        frame = pd.DataFrame(columns)
+        for field in STATISTIC_FIELDS:
+            frame[field] = pd.Series(columns[field], dtype=object)
+        return cls(frame)
+
+    def to_headers(self) -> list:
+        """ Return new ParameterHeader objects built from the rows of the table. """
+        return [ParameterHeader(**row) for row in self.records()]
+
+    def records(self) -> list:
+        """ Return the rows as dictionaries of plain Python values (numpy scalars for min/max). """
+        columns = {field: self.frame[field].tolist() for field in TABLE_FIELDS}
+        for field in STATISTIC_FIELDS:
+            columns[field] = list(self.frame[field].array)
+        return [dict(zip(TABLE_FIELDS, values)) for values in zip(*columns.values())]
+
+    def apply_to(self, headers: list, fields: tuple = TABLE_FIELDS) -> int:
+        """
+        Copy the given fields of the table back to the headers it was built from.
+        Returns the number of values that changed.
+        """
+        assert len(headers) == len(self), "The table and the header list must have the same length."
+        changed = 0
+        for field in fields:
+            for header, value in zip(headers, self.frame[field].array):
+                old_value = getattr(header, field)
+                if old_value != value:
+                    setattr(header, field, value)
+                    changed += 1
+        return changed
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def codes(self) -> list:
+        return self.frame['code'].tolist()
+
+    def print_formats(self) -> dict:
+        """ Return the DataRecords print formats: 'width' for SYTM, 'width.decimals' otherwise. """
+        if self.frame.empty:
+            return {}
+        codes = self.frame['code'].str.strip("'")
+        widths = self.frame['print_field_width'].astype(str)
+        formats = widths.where(codes.str.startswith('SYTM'),
+                               widths + '.' + self.frame['print_decimal_places'].astype(str))
+        return dict(zip(codes, formats))
+
+    def update_statistics(self, df: pd.DataFrame) -> None:
+        """
+        Set the minimum and maximum values from a data frame holding one column per code.
+        SYTM parameters get the first and last times, all others the column minimum and maximum.
+        An empty data frame leaves the values unchanged.
+        """
+        if df.empty or len(self) == 0:
+            return
+        sytm = (self.frame['type'] == 'SYTM').to_numpy()
+        codes = self.frame['code'].to_numpy()
+        minimums, maximums = column_extremes(df, [code for code in codes[~sytm]])
+        for code in codes[sytm]:
+            minimums[code] = df[code].iloc[0]
+            maximums[code] = df[code].iloc[-1]
+        self.set_statistics(minimums, maximums)
+
+    def set_statistics(self, minimums: dict, maximums: dict) -> None:
+        """ Set the minimum and maximum values of the codes in the dictionaries; other rows keep theirs. """
+        codes = self.frame['code'].tolist()
+        for field, values in (('minimum_value', minimums), ('maximum_value', maximums)):
+            old_values = self.frame[field].array
+            self.frame[field] = pd.Series([values.get(code, old) for code, old in zip(codes, old_values)],
+                                          index=self.frame.index, dtype=object)
@@ -5,20 +5,16 @@ import sys
 import re
 import traceback
 from datetime import datetime
-from PyQt6.QtWidgets import (
-    QApplication, QInputDialog
-)
-from PyQt6.QtCore import QTimer
-
 from datashop_toolbox.thermograph import ThermographHeader
+from datashop_toolbox.batch_report import BatchReport
 from datashop_toolbox.basehdr import BaseHeader
 from datashop_toolbox.historyhdr import HistoryHeader
 from datashop_toolbox.validated_base import get_current_date_time
-from datashop_toolbox import select_metadata_file_and_data_folder
 from datashop_toolbox.qualityhdr import QualityHeader
-from datashop_toolbox.log_window import LogWindow, Worker
+from datashop_toolbox.tracing import span
 
 
+@span('process_mtr_files_for_worker', 'batch')
 def process_mtr_files_for_worker(
         log,
         metadata_file_path,
@@ -62,6 +58,9 @@ def process_mtr_files_for_worker(
     os.makedirs(odf_path, exist_ok=True)
     log(f"Created a output data folder name: Step_1_Create_ODF and path for .odf files: {odf_path}")
 
+    # Per-file sizes, timings and memory use for the batch performance report.
+    report = BatchReport(batch_ID)
+
      # Loop through the CSV files to generate an ODF file for each.
     #for file_name in all_files:
     for idx, file_name in enumerate(all_files, start=1):
@@ -75,38 +74,45 @@ def process_mtr_files_for_worker(
         mtr_path = posixpath.join(input_data_folder_path, file_name)
         log(f'\nProcessing MTR raw file: {mtr_path}\n')
 
-        try:
+        with span(file_name, 'file', batch=batch_ID, file_number=idx):
+            record = report.start_file(mtr_path)
+            try:
 
-            mtr = ThermographHeader()
+                mtr = ThermographHeader()
 
-            history_header = HistoryHeader()
-            history_header.creation_date = get_current_date_time()
-            history_header.set_process(f'INITIAL FILE CREATED BY {operator.upper()}')
-            mtr.history_headers.append(history_header)
+                history_header = HistoryHeader()
+                history_header.creation_date = get_current_date_time()
+                history_header.set_process(f'INITIAL FILE CREATED BY {operator.upper()}')
+                mtr.history_headers.append(history_header)
 
-            mtr.process_thermograph(institution, instrument, metadata_file_path, mtr_path, user_input_metadata)
+                with report.stage(record, 'read'):
+                    mtr.process_thermograph(institution, instrument, metadata_file_path, mtr_path, user_input_metadata)
 
-            file_spec = mtr.generate_file_spec()
-            mtr.file_specification = file_spec
-            mtr.add_quality_flags()
-    
-            quality_header = QualityHeader()
-            quality_header.quality_date = get_current_date_time()
-            quality_header.add_quality_codes()
-            mtr.quality_header = quality_header
-
-            mtr.update_odf()
-
-            odf_file_path = posixpath.join(odf_path, file_spec + '.ODF')
-            log(f"Writing ODF file [{idx}/{len(all_files)}]: {odf_file_path}")
-            mtr.write_odf(odf_file_path, version = 2.0)
-            log(f"SUCCESS: {file_name} → {odf_file_path}")
-
-            # Reset the shared log list
-            BaseHeader.reset_log_list()
-        except Exception as e:
-            log(f"ERROR processing {file_name}: {e}")
-            log(traceback.format_exc())
+                with report.stage(record, 'process'):
+                    file_spec = mtr.generate_file_spec()
+                    mtr.file_specification = file_spec
+                    mtr.add_quality_flags()
+
+                    quality_header = QualityHeader()
+                    quality_header.quality_date = get_current_date_time()
+                    quality_header.add_quality_codes()
+                    mtr.quality_header = quality_header
+
+                    mtr.update_odf()
+
+                odf_file_path = posixpath.join(odf_path, file_spec + '.ODF')
+                log(f"Writing ODF file [{idx}/{len(all_files)}]: {odf_file_path}")
+                with report.stage(record, 'write'):
+                    mtr.write_odf(odf_file_path, version = 2.0)
+                report.finish_file(record, len(mtr.data.data_frame), len(mtr.parameter_headers))
+                log(f"SUCCESS: {file_name} → {odf_file_path}")
+
+                # Reset the shared log list
+                BaseHeader.reset_log_list()
+            except Exception as e:
+                report.finish_file(record, error=e)
+                log(f"ERROR processing {file_name}: {e}")
+                log(traceback.format_exc())
         log("")
         log('#######################################################################')
         log(f'=== End processing MTR file {idx} of {len(all_files)}: {file_name} ===')
@@ -118,9 +124,20 @@ def process_mtr_files_for_worker(
         duration = end_time - start_time
         log(f"[{idx}/{len(all_files)}] MTR Data Processing Completed at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         log(f"Total Processing Time: {str(duration)}")
+        summary = report.summary()
+        for line in report.summary_lines(summary):
+            log(line)
+        csv_path, json_path = report.write(output_data_folder_path)
+        log(f"Performance report written to: {csv_path} and {json_path}")
         log(f"✅ [{idx}/{len(all_files)}] Batch end : {batch_ID} ✅ \n")
 
 def main():
+    # The GUI stack is only needed here, not by process_mtr_files_for_worker().
+    from PyQt6.QtWidgets import QApplication, QInputDialog
+    from PyQt6.QtCore import QTimer
+    from datashop_toolbox import select_metadata_file_and_data_folder
+    from datashop_toolbox.log_window import LogWindow, Worker
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
@@ -1,8 +1,4 @@
 import glob
-import matplotlib.pyplot as plt
-from matplotlib.widgets import LassoSelector, Button
-from matplotlib.path import Path
-import matplotlib.dates as mdates
 import numpy as np
 import os
 import pandas as pd
@@ -53,6 +49,11 @@ def qc_thermograph_data(in_folder_path: str, wildcard: str, out_folder_path: str
     Uses global `exit_requested` to allow user interruption.
     Returns {"finished": bool}
     """
+    # matplotlib is only needed for the interactive flagging.
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import LassoSelector, Button
+    from matplotlib.path import Path
+    import matplotlib.dates as mdates
     
     global exit_requested
     exit_requested = False
@@ -238,7 +239,12 @@ def qc_thermograph_data(in_folder_path: str, wildcard: str, out_folder_path: str
             logger.info(f"Writing file {idx} of {len(mtr_files)}: {mtr_file}")
             logger.info(f"Please wait...writing QC ODF file...")
             out_file = pathlib.Path(out_odf_path) / f"{file_spec}.ODF"
-            mtr.write_odf(str(out_file), version=2.0)
+            try:
+                # Only the flag column changed, so patch it into a copy of the input file.
+                mtr.patch_odf(full_path, str(out_file), ['QTE90_01'])
+            except ValueError as e:
+                logger.warning(f"Cannot patch {mtr_file} in place ({e}); rewriting the whole file.")
+                mtr.write_odf(str(out_file), version=2.0)
             logger.info(f"QC completed for [{idx}/{len(mtr_files)}]: {mtr_file}")
             logger.info(f"Saved [{idx}/{len(mtr_files)}]: {out_file}")
         except Exception as e:
@@ -1,10 +1,265 @@
 import io
+import re
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional, Self
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator
 from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.metrics import count, timed
 from datashop_toolbox.validated_base import ValidatedBase, list_to_dict, check_string, split_string_with_quotes, convert_dataframe
 
+try:
+    import pyarrow as pa
+except ImportError:  # optional dependency: pip install datashop-toolbox[arrow]
+    pa = None
+
+
+def require_pyarrow() -> None:
+    """ Raise ImportError if the optional pyarrow package is not installed. """
+    if pa is None:
+        raise ImportError("Arrow-backed DataRecords need the optional 'pyarrow' package "
+                          "(pip install datashop-toolbox[arrow]).")
+
+
+def copy_on_write_enabled() -> bool:
+    """Return True if pandas shares column buffers between shallow copies until one is written."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def to_datetime64(value) -> np.datetime64:
+    """ Convert a datetime, Timestamp or date string (quoted SYTM strings included) to datetime64. """
+    if isinstance(value, str):
+        value = value.strip("' ")
+    return pd.Timestamp(value).to_datetime64()
+
+
+# Month abbreviations of SYTM values packed as 24-bit integers (upper case ASCII), sorted, and
+# the month number (0 to 11) of each.
+_MONTH_CODES = [int.from_bytes(month.encode(), "big") for month in
+                ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")]
+SYTM_MONTH_CODES = np.sort(_MONTH_CODES)
+SYTM_MONTH_NUMBERS = np.argsort(_MONTH_CODES)
+# Byte positions in 'DD-MON-YYYY HH:MM:SS.FF' and the separators expected there.
+SYTM_SEPARATORS = {2: b"-", 6: b"-", 11: b" ", 14: b":", 17: b":", 20: b"."}
+SYTM_FRACTION_DIGITS = 6
+
+
+def _digits(chars: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ Return the decimal value of each row of ASCII digit codes and whether all were digits. """
+    digits = chars.astype(np.int32) - ord("0")
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    powers = 10 ** np.arange(chars.shape[1] - 1, -1, -1)
+    return digits @ powers, valid
+
+
+def parse_sytm(values) -> np.ndarray:
+    """
+    Parse SYTM strings ('DD-MON-YYYY HH:MM:SS.FF', quoted or not) into a datetime64[us] array.
+
+    The fixed layout is decoded with array arithmetic on the raw bytes, which is about two orders
+    of magnitude faster than strptime on large series. Values that do not follow the layout exactly
+    are parsed with pd.to_datetime(format=SYTM_FORMAT), which raises ValueError for invalid dates.
+    """
+    text = np.asarray(values, dtype=object)
+    try:
+        raw = np.char.strip(text.astype("S"), b"' ")
+    except (UnicodeEncodeError, TypeError):
+        raw = None
+    if raw is None or len(raw) == 0:
+        return pd.to_datetime(pd.Series(text, dtype=object).astype(str).str.strip("' "),
+                              format=BaseHeader.SYTM_FORMAT).to_numpy(dtype="datetime64[us]")
+    width = max(raw.dtype.itemsize, 21 + SYTM_FRACTION_DIGITS)
+    chars = np.frombuffer(raw.astype(f"S{width}").tobytes(), dtype=np.uint8).reshape(len(raw), width)
+
+    valid = np.ones(len(raw), dtype=bool)
+    for position, separator in SYTM_SEPARATORS.items():
+        valid &= chars[:, position] == separator[0]
+    day, ok = _digits(chars[:, 0:2])
+    valid &= ok
+    year, ok = _digits(chars[:, 7:11])
+    valid &= ok
+    hour, ok = _digits(chars[:, 12:14])
+    valid &= ok & (hour < 24)
+    minute, ok = _digits(chars[:, 15:17])
+    valid &= ok & (minute < 60)
+    second, ok = _digits(chars[:, 18:20])
+    valid &= ok & (second < 60)
+    # Upper case the month letters and look them up.
+    letters = (chars[:, 3:6] & 0xDF).astype(np.int64)
+    packed = (letters[:, 0] << 16) | (letters[:, 1] << 8) | letters[:, 2]
+    index = np.minimum(np.searchsorted(SYTM_MONTH_CODES, packed), 11)
+    valid &= SYTM_MONTH_CODES[index] == packed
+    month = SYTM_MONTH_NUMBERS[index]
+    # Fractional seconds: the leading run of digits after the '.', up to microseconds.
+    fraction_chars = chars[:, 21:21 + SYTM_FRACTION_DIGITS].astype(np.int32) - ord("0")
+    is_digit = np.cumprod((fraction_chars >= 0) & (fraction_chars <= 9), axis=1).astype(bool)
+    valid &= is_digit[:, 0]
+    valid &= (chars[:, 21:].astype(bool).sum(axis=1) == is_digit.sum(axis=1))
+    microsecond = (np.where(is_digit, fraction_chars, 0) * 10 ** np.arange(SYTM_FRACTION_DIGITS - 1, -1, -1)).sum(axis=1)
+
+    months = (year - 1970) * 12 + month
+    dates = months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+    # Reject days past the end of the month (31-APR rolls over into May).
+    valid &= (day >= 1) & (dates.astype("datetime64[M]").astype(np.int64) == months)
+    seconds = (hour * 3600 + minute * 60 + second) * 1_000_000 + microsecond
+    times = dates.astype("datetime64[us]") + seconds.astype("timedelta64[us]")
+    if not valid.all():
+        others = pd.Series(text[~valid], dtype=object).astype(str).str.strip("' ")
+        times[~valid] = pd.to_datetime(others, format=BaseHeader.SYTM_FORMAT).to_numpy(dtype="datetime64[us]")
+    return times
+
+
+def sampling_interval(times: np.ndarray) -> float:
+    """
+    Return the sampling interval of a time series in seconds: the median of the positive steps
+    between consecutive times, so duplicates, reversals and gaps do not affect it. NaN if the
+    series has no positive step.
+    """
+    steps = np.diff(np.asarray(times, dtype="datetime64[us]")).astype(np.int64)
+    steps = steps[steps > 0]
+    if len(steps) == 0:
+        return float("nan")
+    return float(np.median(steps)) / 1e6
+
+
+def analyze_time_axis(times: np.ndarray, gap_factor: float = 3.0) -> dict:
+    """
+    Check a time series for order, duplicates and gaps.
+
+    Parameters
+    ----------
+    times: np.ndarray
+        The times in record order (datetime64).
+    gap_factor: float
+        Steps longer than gap_factor times the sampling interval are gaps.
+
+    Returns
+    -------
+    dict
+        'records', 'sorted', 'backward_steps' (records earlier than the one before them),
+        'first_backward' (record number or None), 'duplicates' (records whose time occurs earlier
+        in the series), 'interval_seconds' (see sampling_interval()), 'gaps' (number), and
+        'gap_starts' / 'gap_seconds' (start time and length of each gap, in time order).
+    """
+    times = np.asarray(times, dtype="datetime64[us]")
+    steps = np.diff(times).astype(np.int64)
+    backward = np.flatnonzero(steps < 0)
+    ordered = times if len(backward) == 0 else np.sort(times, kind="stable")
+    sorted_steps = steps if len(backward) == 0 else np.diff(ordered).astype(np.int64)
+    interval = sampling_interval(ordered)
+    if np.isnan(interval):
+        gaps = np.array([], dtype=np.int64)
+    else:
+        gaps = np.flatnonzero(sorted_steps > gap_factor * interval * 1e6)
+    return {
+        'records': len(times),
+        'sorted': len(backward) == 0,
+        'backward_steps': len(backward),
+        'first_backward': int(backward[0]) + 1 if len(backward) else None,
+        'duplicates': int(np.count_nonzero(sorted_steps == 0)),
+        'interval_seconds': interval,
+        'gaps': len(gaps),
+        'gap_starts': ordered[gaps],
+        'gap_seconds': sorted_steps[gaps] / 1e6,
+    }
+
+
+def fixed_width_slots(row: bytes) -> list[tuple[int, int]]:
+    """
+    Return the (start, end) byte range of each field in a fixed-width V2 data row.
+    Fields are right-justified, so each range starts just after the previous field and
+    includes the padding in front of the value; quoted SYTM values count as one field.
+    """
+    slots = []
+    start = 0
+    for match in re.finditer(rb"'[^']*'|\S+", row):
+        slots.append((start, match.end()))
+        start = match.end()
+    return slots
+
+
+def patch_fixed_width_columns(data: bytes, slots: dict[int, tuple[int, int]],
+                              values: dict[int, np.ndarray], formats: dict[int, str]) -> bytes:
+    """
+    Overwrite fields in a block of fixed-width data rows without re-formatting the other columns.
+
+    Parameters
+    ----------
+    data: bytes
+        The data section, one row per line; every line must have the same length.
+    slots: dict[int, tuple[int, int]]
+        Byte range within a row of each field to replace, keyed by field number. A range that
+        does not start at byte 0 includes the blank separating the field from the previous one,
+        so its values must be shorter than the range.
+    values: dict[int, np.ndarray]
+        New value of each field, one entry per row, keyed by field number.
+    formats: dict[int, str]
+        Format specification of each field's values (ex: '.0f').
+
+    Returns
+    -------
+    bytes
+        The patched data section.
+    """
+    missing_newline = not data.endswith(b"\n")
+    if missing_newline:
+        data += b"\n"
+    row_length = data.index(b"\n") + 1
+    rows = np.frombuffer(data, dtype=np.uint8)
+    if rows.size % row_length or not (rows[row_length - 1::row_length] == ord("\n")).all():
+        raise ValueError("The data rows are not fixed width.")
+    rows = rows.reshape(-1, row_length).copy()
+    for field, (start, end) in slots.items():
+        field_values = np.asarray(values[field])
+        if len(field_values) != rows.shape[0]:
+            raise ValueError(f"Expected {rows.shape[0]} values for field {field}, got {len(field_values)}.")
+        # Format each distinct value once and scatter the encoded bytes into the rows.
+        unique_values, inverse = np.unique(field_values, return_inverse=True)
+        width = end - start
+        # Keep the blank in front of the field so the value cannot run into the previous one.
+        room = width if start == 0 else width - 1
+        table = np.empty((len(unique_values), width), dtype=np.uint8)
+        for i, value in enumerate(unique_values):
+            text = format(value, formats[field])
+            if len(text) > room:
+                raise ValueError(f"Value '{text}' does not fit in a field of width {room}.")
+            table[i] = np.frombuffer(text.rjust(width).encode("iso-8859-1"), dtype=np.uint8)
+        rows[:, start:end] = table[inverse]
+    patched = rows.tobytes()
+    return patched[:-1] if missing_newline else patched
+
+
+def text_widths(df: pd.DataFrame, codes: list, formatters: dict) -> list[int]:
+    """
+    Return the length of the longest formatted value of each column without formatting every
+    value. Fixed-point text only gets longer with the magnitude of a number (and its sign), so
+    the minimum, the maximum, the most negative value with a sign bit (-0.0 included) and NaN
+    are the only candidates of a numeric column; a text column formats its longest value.
+    """
+    widths = []
+    for code in codes:
+        column = df[code]
+        formatter = formatters[code]
+        if len(column) == 0:
+            widths.append(0)
+        elif isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biuf':
+            values = column.to_numpy(dtype=float)
+            valid = values[~np.isnan(values)]
+            candidates = [np.nan] if len(valid) < len(values) else []
+            if len(valid):
+                negative = valid[np.signbit(valid)]
+                candidates += [valid.min(), valid.max()] + ([negative.min()] if len(negative) else [])
+            widths.append(max(len(formatter(value)) for value in candidates))
+        elif pd.api.types.is_string_dtype(column.dtype) and not column.isna().any():
+            lengths = column.str.len().to_numpy()
+            widths.append(len(formatter(column.iloc[int(lengths.argmax())])))
+        else:
+            widths.append(max(len(formatter(value)) for value in column))
+    return widths
+
+
 class DataRecords(ValidatedBase, BaseHeader):
     """ Represents the data records stored within an ODF object. """
 
@@ -12,6 +267,9 @@ class DataRecords(ValidatedBase, BaseHeader):
     parameter_list: List[str] = Field(default_factory=list)
     print_formats: Dict[str, str] = Field(default_factory=dict)
 
+    # (data frame, SYTM column, datetime64 array, sorted flag) from the last time_index() call.
+    _time_cache: Optional[tuple] = PrivateAttr(default=None)
+
     class Config:
         arbitrary_types_allowed = True  # allow pandas DataFrame
 
@@ -50,6 +308,156 @@ class DataRecords(ValidatedBase, BaseHeader):
     def __len__(self) -> int:
         return len(self.data_frame)
 
+    def clone(self) -> Self:
+        """
+        Return a copy whose data frame shares the column buffers with this one.
+        With pandas copy-on-write a column is only duplicated once either side writes to it;
+        without copy-on-write (pandas 2.x default) the frame falls back to a deep copy.
+        """
+        new = super().clone()
+        new.data_frame = self.data_frame.copy(deep=not copy_on_write_enabled())
+        new.print_formats = dict(self.print_formats)
+        return new
+
+    def time_index(self, code: str = "SYTM_01") -> np.ndarray:
+        """
+        Return the SYTM column as a datetime64 array, parsed once and reused until the data
+        frame or its SYTM column is replaced. Call clear_time_index() after editing individual
+        SYTM values in place.
+        """
+        df = self.data_frame
+        if code not in df.columns:
+            raise ValueError(f"The data records do not contain a {code} column.")
+        column = df[code]
+        cached = self._time_cache
+        if cached is not None and cached[0] is df and cached[1] is column.array:
+            return cached[2]
+        times = parse_sytm(column.to_numpy())
+        self._time_cache = (df, column.array, times, bool((times[1:] >= times[:-1]).all()))
+        return times
+
+    def clear_time_index(self) -> None:
+        """ Forget the parsed SYTM values cached by time_index(). """
+        self._time_cache = None
+
+    def is_time_sorted(self, code: str = "SYTM_01") -> bool:
+        """ Return True if the SYTM values never decrease from one record to the next. """
+        self.time_index(code)
+        return self._time_cache[3]
+
+    def time_slice(self, t0=None, t1=None, code: str = "SYTM_01") -> slice:
+        """
+        Return the row positions of the records with t0 <= time <= t1, found by binary search.
+        Either bound may be None to leave that end open. Raises ValueError if the times are not sorted.
+        """
+        if not self.is_time_sorted(code):
+            raise ValueError(f"The {code} values are not in increasing order.")
+        times = self.time_index(code)
+        start = 0 if t0 is None else int(np.searchsorted(times, to_datetime64(t0), side="left"))
+        stop = len(times) if t1 is None else int(np.searchsorted(times, to_datetime64(t1), side="right"))
+        return slice(start, max(start, stop))
+
+    def between(self, t0=None, t1=None, code: str = "SYTM_01") -> pd.DataFrame:
+        """
+        Return the records with t0 <= time <= t1 as a slice of the data frame.
+        With pandas copy-on-write the slice shares the column buffers until it is modified.
+        """
+        return self.data_frame.iloc[self.time_slice(t0, t1, code)]
+
+    def check_time_axis(self, code: str = "SYTM_01", gap_factor: float = 3.0) -> dict:
+        """ Report the order, duplicates, gaps and sampling interval of the times (see analyze_time_axis()). """
+        return analyze_time_axis(self.time_index(code), gap_factor)
+
+    def repair_time_axis(self, code: str = "SYTM_01", deduplicate: bool = False) -> dict:
+        """
+        Sort the records by time, keeping records with equal times in their original order, and
+        with deduplicate=True keep only the first record of each time.
+        Returns {'moved': records whose position changed, 'removed': records dropped}.
+        """
+        times = self.time_index(code)
+        order = np.argsort(times, kind="stable")
+        moved = int(np.count_nonzero(order != np.arange(len(order))))
+        keep = order
+        if deduplicate and len(order):
+            ordered = times[order]
+            keep = order[np.concatenate(([True], ordered[1:] != ordered[:-1]))]
+        removed = len(order) - len(keep)
+        if moved or removed:
+            df = self.data_frame.iloc[keep].reset_index(drop=True)
+            self.data_frame = df
+            # The times are already parsed and now sorted.
+            self._time_cache = (df, df[code].array, times[keep], True)
+        return {'moved': moved, 'removed': removed}
+
+    # ------------------------
+    # Arrow storage
+    # ------------------------
+    def is_arrow_backed(self) -> bool:
+        """ Return True if every column of the data frame is stored as an Arrow array. """
+        return len(self.data_frame.columns) > 0 and all(
+            isinstance(dtype, pd.ArrowDtype) for dtype in self.data_frame.dtypes)
+
+    def use_arrow(self) -> Self:
+        """
+        Convert the data frame to Arrow storage: one typed Arrow array per parameter, wrapped
+        in pandas ArrowDtype columns so the rest of the toolbox keeps working on data_frame.
+        """
+        require_pyarrow()
+        if not self.is_arrow_backed():
+            self.data_frame = self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+        return self
+
+    @classmethod
+    def from_arrow(cls, table, print_formats: Optional[Dict[str, str]] = None) -> Self:
+        """
+        Create Arrow-backed DataRecords from a pyarrow Table or any object that exports an Arrow
+        stream (ex: the data frames returned by oracledb's fetch_df_all()). The columns are
+        wrapped without copying their buffers.
+        """
+        require_pyarrow()
+        if not isinstance(table, pa.Table):
+            table = pa.table(table)
+        return cls(data_frame=table.to_pandas(types_mapper=pd.ArrowDtype),
+                   parameter_list=list(table.column_names),
+                   print_formats=dict(print_formats or {}))
+
+    def to_arrow(self):
+        """
+        Return the records as a pyarrow Table with one column per parameter.
+        Arrow-backed columns are handed over as they are; numpy columns are converted
+        (numeric columns without copying where Arrow allows it).
+        """
+        require_pyarrow()
+        df = self.data_frame
+        if self.is_arrow_backed():
+            return pa.table({code: df[code].array.__arrow_array__() for code in df.columns})
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Return the records as a pandas DataFrame without duplicating any column buffers
+        (Arrow-backed records stay Arrow-backed; use to_numpy() for numpy arrays).
+        """
+        return self.data_frame.copy(deep=not copy_on_write_enabled())
+
+    def to_numpy(self, code: str) -> np.ndarray:
+        """
+        Return one parameter as a numpy array. Numeric Arrow columns without nulls are returned
+        as a read-only view of the Arrow buffer; other columns are converted.
+        """
+        column = self.data_frame[code]
+        if isinstance(column.dtype, pd.ArrowDtype):
+            chunks = column.array.__arrow_array__()
+            array = chunks.chunk(0) if chunks.num_chunks == 1 else chunks.combine_chunks()
+            return array.to_numpy(zero_copy_only=False)
+        return column.to_numpy()
+
+    def _numpy_frame(self) -> pd.DataFrame:
+        """ The data frame with numpy columns (nulls as NaN/None), for the text writers. """
+        if self.is_arrow_backed():
+            return self.to_arrow().to_pandas()
+        return self.data_frame
+
     def log_data_message(self, field: str, old_value, new_value) -> None:
         message = f"In DataRecords field {field.upper()} was changed from '{old_value}' to '{new_value}'"
         # self.logger.info(message)
@@ -61,21 +469,27 @@ class DataRecords(ValidatedBase, BaseHeader):
         data_formats: Dict[str, str],
         data_lines_list: List[str],
     ) -> Self:
-        data_record_list = [split_string_with_quotes(s) for s in data_lines_list]
-        df = pd.DataFrame(columns=parameter_list, data=data_record_list)
-        df = convert_dataframe(df)
+        with timed("data.tokenize"):
+            data_record_list = [split_string_with_quotes(s) for s in data_lines_list]
+            df = pd.DataFrame(columns=parameter_list, data=data_record_list)
+        with timed("data.convert"):
+            df = convert_dataframe(df)
 
         if "SYTM_01" in df.columns:
-            df["SYTM_01"] = df["SYTM_01"].apply(lambda x: f"'{x}'")
+            with timed("data.sytm"):
+                df["SYTM_01"] = df["SYTM_01"].apply(lambda x: f"'{x}'")
+        count("data.records", len(df))
+        count("data.values", df.size)
 
         self.data_frame = df
         self.parameter_list = parameter_list
         self.print_formats = data_formats
         return self
 
-    def print_object(self) -> str:
-        """Return V3 style CSV representation of the data."""
-        df = self.data_frame.copy()
+    @timed("render.data_v3")
+    def print_object(self, include_column_names: bool = True) -> str:
+        """Return V3 style CSV representation of the data (without the column line if requested)."""
+        df = self._numpy_frame().copy()
 
         # Convert Q-parameters to integer
         q_params = [p for p in self.parameter_list if p.startswith("Q")]
@@ -83,11 +497,10 @@ class DataRecords(ValidatedBase, BaseHeader):
             df = df.astype({p: "int" for p in q_params})
 
         buffer = io.StringIO()
-        df.to_csv(buffer, index=False, sep=",", lineterminator="\n")
+        df.to_csv(buffer, index=False, header=include_column_names, sep=",", lineterminator="\n")
         return buffer.getvalue()
 
-    def print_object_old_style(self) -> str:
-        # """Return V2 style formatted string representation of the data."""
+    def _old_style_formatters(self) -> dict:
         formatters = {}
         for key, value in self.print_formats.items():
             width = value
@@ -96,14 +509,66 @@ class DataRecords(ValidatedBase, BaseHeader):
                 formatters[key] = lambda x, f=fmt: f"{f.format(x)}"
             else:
                 formatters[key] = lambda x, w=width: f"{float(x):>{w}f}" if x is not None else ""
+        return formatters
 
-        return self.data_frame.to_string(
+    @timed("render.data_v2")
+    def print_object_old_style(self) -> str:
+        # """Return V2 style formatted string representation of the data."""
+        return self._numpy_frame().to_string(
             columns = self.parameter_list,
             index = False,
             header = False,
-            formatters = formatters,
+            formatters = self._old_style_formatters(),
         )
 
+    def column_widths(self) -> list[int]:
+        """ Width of each version 2 column: the length of its widest formatted value. """
+        return text_widths(self._numpy_frame(), self.parameter_list, self._old_style_formatters())
+
+    def iter_text(self, file_version: float = 2.0, chunk_rows: int = 50000, widths: list | None = None):
+        """
+        Yield the text of print_object_old_style() (version 2) or print_object() (version 3) in
+        pieces of chunk_rows records, so a large data section never exists as one string.
+        Joining the version 2 pieces with newlines gives exactly the print_object_old_style() text:
+        each column is padded to the width of its widest value in the whole frame, or to the given
+        widths (at least column_widths()) to line up with other records written to the same file.
+        """
+        df = self._numpy_frame()
+        if file_version >= 3:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                chunk = DataRecords(data_frame=df.iloc[start:start + chunk_rows],
+                                    parameter_list=self.parameter_list)
+                yield chunk.print_object(include_column_names=(start == 0))
+            return
+        formatters = self._old_style_formatters()
+        if widths is None:
+            widths = text_widths(df, self.parameter_list, formatters)
+        for start in range(0, len(df), chunk_rows):
+            with timed("render.data_v2"):
+                text = df.iloc[start:start + chunk_rows].to_string(
+                    columns = self.parameter_list,
+                    index = False,
+                    header = False,
+                    formatters = formatters,
+                    col_space = widths,
+                )
+            yield text
+
+
+def parse_data_lines(lines: list[bytes], parameter_list: list, print_formats: dict,
+                     version: float) -> pd.DataFrame:
+    """ Parse raw data lines (without the V3 column line) the same way read_odf() does. """
+    if version >= 3:
+        with timed("data.parse_csv"):
+            df = pd.read_csv(io.BytesIO(b"".join(lines)), header=None, names=parameter_list,
+                             encoding="iso-8859-1")
+        count("data.records", len(df))
+        count("data.values", df.size)
+        return df
+    text_lines = [line.decode("iso-8859-1").strip() for line in lines]
+    return DataRecords().populate_object(parameter_list, print_formats, text_lines).data_frame
+
+
 def main():
 
     records = DataRecords()
@@ -15,39 +15,28 @@ def remove_parameter(odfobj: OdfHeader, code: str) -> OdfHeader:
     odfobj: OdfHeader class object
         A modified copy of the input OdfHeader object.
     """
+    return remove_parameters(odfobj, [code])
 
-    # Get the parameter headers and the data records.
-    data = odfobj.data.data_frame
 
-    parameter_headers = odfobj.parameter_headers
-    parameter_list = odfobj.data.parameter_list
-    print_formats = odfobj.data.print_formats
-
-    # Phase A: Look through each ODF structure's Data channels to find the code to be removed.
-    for i, parameter_header in enumerate(parameter_headers):
-        
-        # Phase B: Remove the parameter if present.
-        if parameter_header.code == code:
-            
-            # Step 1) Remove the associated data column.
-            data = data.drop(code, axis=1)
-
-            # Step 2) Remove the associated Parameter_Header.
-            del parameter_headers[i]
-            
-            # Step 3) Remove associated parameter code from parameter list.
-            del parameter_list[i]
+def remove_parameters(odfobj: OdfHeader, codes: list) -> OdfHeader:
+    """
+    Removes several parameters from the input OdfHeader object in one pass.
 
-            # Step 4) Remove associated print format for parameter.
-            del print_formats[code]
+    Parameters
+    ----------
+    odfobj: OdfHeader class object
+    codes: list[str]
+      Valid GF3 codes (ex: codes=['FFFF_01', 'UNKN_01']). Codes that are not
+      present in the OdfHeader object are ignored.
 
+    Returns
+    -------
+    odfobj: OdfHeader class object
+        A modified copy of the input OdfHeader object.
+    """
+    present = [code for code in codes if odfobj.is_parameter_code(code)]
+    if present:
+        odfobj.edit_parameters(remove=present)
+        for code in present:
             print("The code %s has been removed." % code)
-
-    # Updated the associated OdfHeader object's attributes.
-    odfobj.data.data_frame = data
-    odfobj.data.parameter_list = parameter_list
-    odfobj.data.print_formats = print_formats
-    odfobj.parameter_headers = parameter_headers
-    odfobj.log_odf_message(f'Parameter "{code}" was removed.', 'base')
-
     return odfobj
@@ -0,0 +1,143 @@
+import json
+import os
+import pandas as pd
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.records import parse_data_lines
+from datashop_toolbox.validated_base import read_header_lines
+
+INDEX_SUFFIX = '.rowidx.json'
+DEFAULT_STRIDE = 1000
+
+
+def build_row_index(odf_file_path: str, stride: int = DEFAULT_STRIDE) -> dict:
+    """
+    Scan the data section of an ODF file once and record the byte offset of every Kth row.
+
+    Parameters
+    ----------
+    odf_file_path: str
+        Path to a version 2 or version 3 ODF file.
+    stride: int
+        Number of rows between recorded offsets (K). Smaller values use more memory
+        but skip fewer rows when seeking.
+
+    Returns
+    -------
+    dict
+        The index: data section offset, stride, row offsets, row count and file signature.
+    """
+    assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+    assert isinstance(stride, int) and stride > 0, "Input argument 'stride' must be a positive integer."
+    header_lines, data_offset = read_header_lines(odf_file_path)
+    version = 2.0 if header_lines and header_lines[0].endswith(',') else 3.0
+    offsets = []
+    rows = 0
+    with open(odf_file_path, "rb") as file:
+        file.seek(data_offset)
+        position = data_offset
+        skip_column_names = version >= 3
+        for line in file:
+            if line.strip():
+                if skip_column_names:
+                    skip_column_names = False
+                else:
+                    if rows % stride == 0:
+                        offsets.append(position)
+                    rows += 1
+            position += len(line)
+    stat = os.stat(odf_file_path)
+    return {
+        'version': version,
+        'data_offset': data_offset,
+        'stride': stride,
+        'rows': rows,
+        'offsets': offsets,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def index_is_current(index: dict, odf_file_path: str) -> bool:
+    """Return True if the index was built from the file as it is now on disk."""
+    stat = os.stat(odf_file_path)
+    return index.get('size') == stat.st_size and index.get('mtime_ns') == stat.st_mtime_ns
+
+
+def load_row_index(odf_file_path: str, stride: int = DEFAULT_STRIDE, persist: bool = False) -> dict:
+    """
+    Return the row index of an ODF file, building it if needed.
+    With persist=True the index is saved next to the file (<file>.rowidx.json) and reused by
+    later calls until the file changes.
+    """
+    index_path = odf_file_path + INDEX_SUFFIX
+    if persist and os.path.isfile(index_path):
+        try:
+            with open(index_path, "r") as file:
+                index = json.load(file)
+            if index_is_current(index, odf_file_path) and index.get('stride') == stride:
+                return index
+        except (OSError, ValueError):
+            pass
+    index = build_row_index(odf_file_path, stride)
+    if persist:
+        with open(index_path, "w") as file:
+            json.dump(index, file)
+    return index
+
+
+def read_rows(odf_file_path: str, start: int, stop: int, index: dict | None = None,
+              persist: bool = False) -> pd.DataFrame:
+    """
+    Read data rows start (inclusive) to stop (exclusive) of an ODF file without parsing the rest.
+
+    The header is read to get the parameter codes, then the file is positioned at the nearest
+    indexed row before start, so the cost is proportional to the slice rather than the file.
+
+    Parameters
+    ----------
+    odf_file_path: str
+        Path to a version 2 or version 3 ODF file.
+    start: int
+        First row to read (0-based).
+    stop: int
+        Row after the last one to read; clipped to the number of rows in the file.
+    index: dict, optional
+        A row index from build_row_index() or load_row_index(); built if not given.
+    persist: bool
+        Save or reuse the index next to the file when it has to be loaded.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows, with the same columns and value types as read_odf(), indexed by row number.
+    """
+    assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+    assert isinstance(start, int) and start >= 0, "Input argument 'start' must be a non-negative integer."
+    assert isinstance(stop, int), "Input argument 'stop' must be an integer."
+    if index is None or not index_is_current(index, odf_file_path):
+        index = load_row_index(odf_file_path, persist=persist)
+    odf = OdfHeader().read_odf(odf_file_path, header_only=True)
+    parameter_list = odf.data.parameter_list
+    stop = min(stop, index['rows'])
+    if start >= stop:
+        return pd.DataFrame(columns=parameter_list)
+
+    stride = index['stride']
+    lines = []
+    with open(odf_file_path, "rb") as file:
+        file.seek(index['offsets'][start // stride])
+        to_skip = start % stride
+        wanted = stop - start
+        for line in file:
+            if not line.strip():
+                continue
+            if to_skip:
+                to_skip -= 1
+                continue
+            lines.append(line)
+            if len(lines) == wanted:
+                break
+
+    df = parse_data_lines(lines, parameter_list, odf.data.print_formats, index['version'])
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
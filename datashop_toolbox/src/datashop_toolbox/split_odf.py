@@ -0,0 +1,193 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.memory_budget import chunk_rows as budget_chunk_rows
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameter_table import STATISTIC_FIELDS
+from datashop_toolbox.records import parse_data_lines
+from datashop_toolbox.validated_base import read_header_lines
+
+SPLIT_PERIODS = ('month', 'year')
+
+
+class _Piece:
+    """ Data lines and running statistics of one output file while the source is streamed. """
+
+    def __init__(self, key, folder: str, column_line: bytes | None, numeric_codes: list):
+        self.key = key
+        self.numeric_codes = numeric_codes
+        self.file = tempfile.NamedTemporaryFile("wb", dir=folder, suffix=".data", delete=False)
+        if column_line is not None:
+            self.file.write(column_line)
+        self.rows = 0
+        self.minimums = {}
+        self.maximums = {}
+        self.first_time = None
+        self.last_time = None
+
+    def add(self, lines: list, df: pd.DataFrame) -> None:
+        for line in lines:
+            self.file.write(line if line.endswith(b"\n") else line + b"\n")
+        for code in self.numeric_codes:
+            # Text in a numeric column (and null markers the parser kept as text) is ignored.
+            values = pd.to_numeric(df[code], errors='coerce').to_numpy(dtype=float)
+            if np.isnan(values).all():
+                continue
+            self.minimums[code] = min(self.minimums.get(code, np.inf), np.nanmin(values))
+            self.maximums[code] = max(self.maximums.get(code, -np.inf), np.nanmax(values))
+        if 'SYTM_01' in df.columns:
+            if self.first_time is None:
+                self.first_time = df['SYTM_01'].iloc[0]
+            self.last_time = df['SYTM_01'].iloc[-1]
+        self.rows += len(df)
+
+
+def _piece_keys(df: pd.DataFrame, first_row: int, by: str | None, rows: int | None) -> np.ndarray:
+    """ Return the output piece of each record in a chunk. """
+    if rows is not None:
+        return (first_row + np.arange(len(df))) // rows
+    times = pd.DatetimeIndex(pd.to_datetime(df['SYTM_01'].astype(str).str.strip("' "),
+                                            format=BaseHeader.SYTM_FORMAT))
+    if by == 'year':
+        return times.year.to_numpy()
+    return times.year.to_numpy() * 100 + times.month.to_numpy()
+
+
+def _piece_name(key, by: str | None) -> str:
+    if by == 'year':
+        return f"{key:04d}"
+    if by == 'month':
+        return f"{key // 100:04d}-{key % 100:02d}"
+    return f"part{key + 1:03d}"
+
+
+def split_odf(odf_file_path: str, by: str | None = None, rows: int | None = None,
+              output_folder: str | None = None, chunk_rows: int | None = None) -> list:
+    """
+    Split an ODF file into one ODF file per month, per year or per block of rows.
+
+    The data section is streamed once in chunks of chunk_rows lines; each data line is copied
+    to its piece unchanged, so memory use does not depend on the file size. Every piece gets a
+    copy of the source headers (shared without re-validation) with its own RECORD_HEADER counts,
+    event start/end times, parameter minimum/maximum values and a history line.
+
+    Parameters
+    ----------
+    odf_file_path: str
+        Path to a version 2 or version 3 ODF file.
+    by: str, optional
+        'month' or 'year' to split on the SYTM_01 values; the records must be in time order.
+    rows: int, optional
+        Split into pieces of this many records instead.
+    output_folder: str, optional
+        Folder for the pieces, named <source name>_<YYYY-MM|YYYY|partNNN>.ODF. Defaults to the
+        folder of the source file.
+    chunk_rows: int, optional
+        Number of data lines parsed at a time; by default sized to the memory budget.
+
+    Returns
+    -------
+    list[str]
+        Paths of the files written, in order.
+    """
+    assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+    if (by is None) == (rows is None):
+        raise ValueError("Give exactly one of 'by' or 'rows'.")
+    if by is not None and by not in SPLIT_PERIODS:
+        raise ValueError(f"'by' must be one of {SPLIT_PERIODS}, got '{by}'.")
+    if rows is not None and (not isinstance(rows, int) or rows <= 0):
+        raise ValueError("'rows' must be a positive integer.")
+
+    BaseHeader.reset_log_list()
+    template = OdfHeader().read_odf(odf_file_path, header_only=True)
+    codes = template.data.parameter_list
+    # Other parameter types (CHAR) keep the minimum/maximum values read from the source file.
+    numeric_codes = [code for code, header in zip(codes, template.parameter_headers)
+                     if header.type in ('SING', 'DOUB', 'INTE')]
+    chunk_rows = chunk_rows or budget_chunk_rows(len(codes))
+    if by is not None and 'SYTM_01' not in codes:
+        raise ValueError(f"{odf_file_path} has no SYTM_01 parameter to split on.")
+    header_lines, offset = read_header_lines(odf_file_path)
+    version = 2.0 if header_lines[0].endswith(',') else 3.0
+    output_folder = output_folder or os.path.dirname(os.path.abspath(odf_file_path))
+    os.makedirs(output_folder, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(odf_file_path))[0]
+
+    outputs = []
+    finished_keys = set()
+    column_line = None
+    piece = None
+
+    def finish(piece: _Piece) -> None:
+        piece.file.close()
+        try:
+            BaseHeader.reset_log_list()
+            odf = template.clone()
+            odf.set_data_source(piece.file.name, 0, version, piece.rows)
+            minimums, maximums = dict(piece.minimums), dict(piece.maximums)
+            if piece.first_time is not None:
+                minimums['SYTM_01'], maximums['SYTM_01'] = piece.first_time, piece.last_time
+            table = odf.parameter_table()
+            table.set_statistics(minimums, maximums)
+            table.apply_to(odf.parameter_headers, STATISTIC_FIELDS)
+            if piece.first_time is not None:
+                odf.event_header.start_date_time = str(piece.first_time).strip("' ")
+                odf.event_header.end_date_time = str(piece.last_time).strip("' ")
+            name = f"{stem}_{_piece_name(piece.key, by)}"
+            odf.file_specification = name
+            odf.add_history()
+            odf.log_odf_message(f"Split from {os.path.basename(odf_file_path)}: {piece.rows} records "
+                                f"for {_piece_name(piece.key, by)}.", 'base')
+            odf.update_odf()
+            output_file_path = os.path.join(output_folder, name + '.ODF')
+            odf.write_odf(output_file_path, version=version)
+            outputs.append(output_file_path)
+        finally:
+            os.remove(piece.file.name)
+            BaseHeader.reset_log_list()
+
+    def process(lines: list, first_row: int) -> None:
+        nonlocal piece
+        df = parse_data_lines(lines, codes, template.data.print_formats, version)
+        keys = _piece_keys(df, first_row, by, rows)
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        for start, stop in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(keys)]))):
+            key = keys[start].item()
+            if piece is None or piece.key != key:
+                if piece is not None:
+                    finished_keys.add(piece.key)
+                    finish(piece)
+                    piece = None
+                if key in finished_keys:
+                    raise ValueError(f"The records of {odf_file_path} are not in time order.")
+                piece = _Piece(key, output_folder, column_line, numeric_codes)
+            piece.add(lines[start:stop], df.iloc[start:stop])
+
+    try:
+        with open(odf_file_path, "rb") as file:
+            file.seek(offset)
+            lines = []
+            first_row = 0
+            for line in file:
+                if not line.strip():
+                    continue
+                if version >= 3 and column_line is None:
+                    column_line = line if line.endswith(b"\n") else line + b"\n"
+                    continue
+                lines.append(line)
+                if len(lines) == chunk_rows:
+                    process(lines, first_row)
+                    first_row += len(lines)
+                    lines = []
+            if lines:
+                process(lines, first_row)
+        if piece is not None:
+            finish(piece)
+            piece = None
+    finally:
+        if piece is not None:
+            piece.file.close()
+            os.remove(piece.file.name)
+    return outputs
@@ -0,0 +1,309 @@
+"""
+Synthetic ODF files for scale and regression testing.
+
+generate_odf() writes a valid version 2 or version 3 ODF file with any number of records and
+parameters, optional null values and quality flag columns, and as many history, calibration and
+comment lines as wanted. The data are pseudo-random but fully determined by the seed: every column
+has its own random stream, so the output is the same whatever chunk size is used. Records are
+generated and written a chunk at a time (once to collect the header statistics and once to write
+them), so a 10 million record file needs no more memory than a small one.
+
+Usage:
+    python -m datashop_toolbox.synthetic_odf output.ODF --rows 10000000 --parameters 12 --version 3
+"""
+import argparse
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.polynomialhdr import PolynomialCalHeader
+from datashop_toolbox.qualityhdr import QualityHeader
+from datashop_toolbox.records import DataRecords
+
+# Code prefix -> (type, name, units, low, high, decimal places) of the generated values.
+PARAMETER_CATALOGUE = {
+    'PRES': ('DOUB', 'Sea Pressure (sea surface - 0)', 'decibars', 0.0, 500.0, 3),
+    'TE90': ('DOUB', 'Temperature (ITS-90)', 'degrees C', -2.0, 30.0, 4),
+    'PSAL': ('DOUB', 'Practical Salinity', 'PSS-78', 25.0, 37.0, 4),
+    'CNDC': ('DOUB', 'Sea Water Electrical Conductivity', 'S/m', 2.5, 6.0, 5),
+    'DOXY': ('DOUB', 'Dissolved Oxygen Concentration', 'ml/l', 0.0, 10.0, 3),
+    'FLOR': ('DOUB', 'Fluorescence', 'mg/m^3', 0.0, 20.0, 4),
+    'SIGP': ('DOUB', 'Sigma-Theta', 'kg/m^3', 20.0, 28.0, 4),
+    'CNTR': ('INTE', 'Scan Counter', 'counts', 0.0, 1.0e6, 0),
+}
+GENERIC_PARAMETER = ('DOUB', 'Synthetic Parameter', 'none', 0.0, 100.0, 4)
+QUALITY_FLAG_VALUES = np.array([0, 1, 3, 4])
+QUALITY_FLAG_WEIGHTS = np.array([0.2, 0.7, 0.07, 0.03])
+SYTM_WIDTH = 27
+
+
+def parameter_codes(count: int) -> list:
+    """ Return count codes cycling through the catalogue (PRES_01, TE90_01, ..., PRES_02, ...). """
+    prefixes = [prefix for prefix in PARAMETER_CATALOGUE if prefix != 'CNTR']
+    return [f"{prefixes[i % len(prefixes)]}_{i // len(prefixes) + 1:02d}" for i in range(count)]
+
+
+def _format_width(low: float, high: float, decimals: int) -> int:
+    """ Field width that holds every generated value and the null value, plus two spaces. """
+    values = (low, high, BaseHeader.NULL_VALUE)
+    return max(len(f"{value:.{decimals}f}") for value in values) + 2
+
+
+MONTHS = np.array(['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'])
+
+
+def sytm_strings(times: np.ndarray) -> np.ndarray:
+    """ Format datetime64 values as SYTM strings (DD-MMM-YYYY HH:MM:SS.ss) with vectorized string operations. """
+    times = times.astype('datetime64[us]')
+    days = times.astype('datetime64[D]')
+    months = times.astype('datetime64[M]')
+    years = times.astype('datetime64[Y]').astype(np.int64) + 1970
+    micro = (times - days).astype(np.int64)
+
+    def two_digits(values):
+        return np.strings.zfill(values.astype(str), 2)
+
+    text = np.strings.add(two_digits((days - months).astype(np.int64) + 1), '-')
+    text = np.strings.add(text, MONTHS[months.astype(np.int64) % 12])
+    text = np.strings.add(np.strings.add(text, '-'), years.astype(str))
+    for divisor, modulus, separator in ((3_600_000_000, 24, ' '), (60_000_000, 60, ':'),
+                                        (1_000_000, 60, ':'), (10_000, 100, '.')):
+        text = np.strings.add(np.strings.add(text, separator), two_digits(micro // divisor % modulus))
+    return text
+
+
+def _old_style_text(df: pd.DataFrame, parameter_list: list, print_formats: dict) -> str:
+    """
+    The DataRecords.print_object_old_style() text of generated records, built with one format
+    string per row. Valid here because every generated value fits its print width exactly.
+    """
+    fields = [f"%{print_formats[code]}s" if code.startswith('SYTM') else f"%{print_formats[code]}f"
+              for code in parameter_list]
+    template = " ".join(fields)
+    return "\n".join(template % row for row in zip(*(df[code].tolist() for code in parameter_list)))
+
+
+class _Column:
+    """ One generated data column with its own random stream. """
+
+    def __init__(self, code: str, seed: int, index: int, null_fraction: float, rows: int):
+        kind, self.name, self.units, self.low, self.high, self.decimals = \
+            PARAMETER_CATALOGUE.get(code.split('_')[0], GENERIC_PARAMETER)
+        if code.startswith('CNTR'):
+            self.low, self.high = 1.0, float(rows)
+        self.code = code
+        self.type = kind
+        self.null_fraction = null_fraction if kind != 'INTE' else 0.0
+        self.seed = seed
+        self.index = index
+        self.width = _format_width(self.low, self.high, self.decimals)
+
+    def streams(self) -> tuple:
+        """ Fresh generators for the values, null positions and quality flags, restarting each call. """
+        return tuple(np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(self.index, stream)))
+                     for stream in range(3))
+
+
+def _chunks(columns: list, rows: int, chunk_rows: int, quality_flags: bool, start: np.datetime64,
+            interval: np.timedelta64):
+    """
+    Yield the data frames of the records in order, chunk_rows records at a time.
+    SYTM_01 is left out when start is None.
+    """
+    streams = [column.streams() for column in columns]
+    for first in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - first)
+        data = {}
+        if start is not None:
+            times = start + interval * np.arange(first, first + n)
+            data['SYTM_01'] = np.strings.add(np.strings.add("'", sytm_strings(times)), "'").astype(object)
+        for column, (value_rng, null_rng, flag_rng) in zip(columns, streams):
+            if column.code.startswith('CNTR'):
+                values = np.arange(first + 1, first + n + 1, dtype=float)
+            else:
+                values = np.round(value_rng.uniform(column.low, column.high, n), column.decimals)
+            nulls = null_rng.random(n) < column.null_fraction
+            values[nulls] = BaseHeader.NULL_VALUE
+            data[column.code] = values
+            if quality_flags and column.type != 'INTE':
+                flags = flag_rng.choice(QUALITY_FLAG_VALUES, size=n, p=QUALITY_FLAG_WEIGHTS)
+                flags[nulls] = 9
+                data[f"Q{column.code}"] = flags
+        yield pd.DataFrame(data)
+
+
+def generate_odf(output_file_path: str, rows: int = 1000, parameters=8, version: float = 2.0,
+                 seed: int = 0, null_fraction: float = 0.0, quality_flags: bool = False,
+                 history_blocks: int = 1, calibration_blocks: int = 0, comment_lines: int = 0,
+                 start_time: str = '2020-01-01T00:00:00', interval_seconds: float = 1.0,
+                 include_time: bool = True, data_type: str = 'CTD',
+                 chunk_rows: int = 50000) -> OdfHeader:
+    """
+    Write a synthetic ODF file.
+
+    Parameters
+    ----------
+    output_file_path: str
+        Path of the ODF file to write.
+    rows: int
+        Number of data records.
+    parameters: int or list[str]
+        Number of parameters (codes taken from PARAMETER_CATALOGUE in turn) or the codes to use;
+        codes with an unknown prefix get generic values. CNTR codes count the records.
+    version: float
+        ODF version of the file (2.0 or 3.0).
+    seed: int
+        Seed of the random values; the same arguments and seed always give the same file.
+    null_fraction: float
+        Fraction of the values (0 to 1) replaced by the null value.
+    quality_flags: bool
+        Add a Q<code> quality flag column after every non-integer parameter.
+    history_blocks, calibration_blocks, comment_lines: int
+        Number of HISTORY_HEADER blocks, POLYNOMIAL_CAL_HEADER blocks and event comment lines.
+    start_time: str
+        Time of the first record; the SYTM_01 values increase by interval_seconds.
+    include_time: bool
+        Add a SYTM_01 column as the first parameter.
+    data_type: str
+        EVENT_HEADER data type.
+    chunk_rows: int
+        Number of records generated and written at a time.
+
+    Returns
+    -------
+    OdfHeader
+        The header of the file written (without the data records).
+    """
+    assert isinstance(output_file_path, str), "Input argument 'output_file_path' must be a string."
+    assert isinstance(rows, int) and rows > 0, "Input argument 'rows' must be a positive integer."
+    assert isinstance(version, float), "Input argument 'version' must be a float."
+    assert 0.0 <= null_fraction <= 1.0, "Input argument 'null_fraction' must be between 0 and 1."
+    codes = parameter_codes(parameters) if isinstance(parameters, int) else list(parameters)
+    if len(set(codes)) != len(codes):
+        raise ValueError("The parameter codes must be unique.")
+
+    columns = [_Column(code, seed, index, null_fraction, rows) for index, code in enumerate(codes)]
+    start = np.datetime64(start_time, 'us') if include_time else None
+    interval = np.timedelta64(int(round(interval_seconds * 1e6)), 'us')
+
+    # First pass: the statistics the parameter headers need.
+    minimums, maximums, nulls = {}, {}, {}
+    first_time = last_time = None
+    if include_time:
+        first_time, last_time = sytm_strings(start + interval * np.array([0, rows - 1])).tolist()
+    for df in _chunks(columns, rows, chunk_rows, quality_flags, None, interval):
+        for code in df.columns:
+            values = df[code].to_numpy()
+            valid = values != BaseHeader.NULL_VALUE
+            nulls[code] = nulls.get(code, 0) + int((~valid).sum())
+            if valid.any():
+                minimums[code] = min(minimums.get(code, np.inf), values[valid].min())
+                maximums[code] = max(maximums.get(code, -np.inf), values[valid].max())
+
+    BaseHeader.reset_log_list()
+    odf = OdfHeader()
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(len(codes),)))
+    odf.cruise_header.country_institute_code = 1810
+    odf.cruise_header.cruise_number = f"SYN{seed:07d}"
+    odf.cruise_header.organization = 'DFO BIO'
+    odf.cruise_header.chief_scientist = 'SYNTHETIC DATA'
+    odf.cruise_header.platform = 'SYNTHETIC PLATFORM'
+    odf.cruise_header.cruise_name = 'SYNTHETIC ODF CORPUS'
+    odf.cruise_header.cruise_description = f"Generated by datashop_toolbox.synthetic_odf (seed {seed})"
+    odf.event_header.data_type = data_type
+    odf.event_header.event_number = '001'
+    odf.event_header.initial_latitude = round(float(rng.uniform(40.0, 50.0)), 4)
+    odf.event_header.initial_longitude = round(float(rng.uniform(-70.0, -50.0)), 4)
+    odf.event_header.end_latitude = odf.event_header.initial_latitude
+    odf.event_header.end_longitude = odf.event_header.initial_longitude
+    odf.event_header.sampling_interval = float(interval_seconds)
+    if first_time is not None:
+        odf.event_header.start_date_time = first_time
+        odf.event_header.end_date_time = last_time
+        odf.cruise_header.start_date = odf.event_header.start_date_time
+        odf.cruise_header.end_date = odf.event_header.end_date_time
+    odf.event_header.event_comments = [f"Synthetic comment line {i + 1}" for i in range(comment_lines)]
+    odf.instrument_header.instrument_type = data_type
+    odf.instrument_header.model = 'SYNTHETIC'
+    odf.instrument_header.serial_number = f"{seed:04d}"
+    odf.instrument_header.description = 'Generated test data'
+
+    print_formats = {}
+    if include_time:
+        odf.parameter_headers.append(ParameterHeader(
+            type='SYTM', name='Time Format DD-MMM-YYYY HH:MM:SS.ss', units='GMT', code='SYTM_01',
+            null_string=BaseHeader.SYTM_NULL_VALUE, print_field_width=SYTM_WIDTH, print_decimal_places=0,
+            minimum_value=first_time, maximum_value=last_time,
+            number_valid=rows, number_null=0))
+        print_formats['SYTM_01'] = f"{SYTM_WIDTH}"
+    for column in columns:
+        specs = [(column.code, column.type, column.name, column.units, column.width, column.decimals)]
+        if quality_flags and column.type != 'INTE':
+            specs.append((f"Q{column.code}", 'SING', f"Quality Flag for Parameter: {column.code}",
+                          'none', 2, 0))
+        for code, kind, name, units, width, decimals in specs:
+            odf.parameter_headers.append(ParameterHeader(
+                type=kind, name=name, units=units, code=code, null_string=f"{BaseHeader.NULL_VALUE}",
+                print_field_width=width, print_decimal_places=decimals,
+                minimum_value=minimums.get(code, BaseHeader.NULL_VALUE),
+                maximum_value=maximums.get(code, BaseHeader.NULL_VALUE),
+                number_valid=rows - nulls.get(code, 0), number_null=nulls.get(code, 0)))
+            print_formats[code] = f"{width}.{decimals}"
+    if quality_flags:
+        odf.quality_header = QualityHeader()
+        odf.quality_header.add_quality_codes()
+        odf.quality_header.quality_date = odf.event_header.start_date_time
+    for column in [column for column in columns if column.type != 'INTE'][:calibration_blocks]:
+        coefficients = [round(float(value), 6) for value in rng.normal(0.0, 1.0, 4)]
+        odf.polynomial_cal_headers.append(PolynomialCalHeader(
+            parameter_code=column.code, calibration_date=odf.event_header.start_date_time,
+            application_date=odf.event_header.start_date_time,
+            number_coefficients=len(coefficients), coefficients=coefficients))
+    for i in range(history_blocks):
+        odf.history_headers.append(HistoryHeader(
+            creation_date=odf.event_header.start_date_time,
+            processes=[f"Synthetic processing step {i + 1}.{j + 1}" for j in range(3)]))
+    odf.data = DataRecords(parameter_list=list(print_formats), print_formats=print_formats)
+    odf.record_header.num_calibration = len(odf.polynomial_cal_headers)
+    odf.record_header.num_history = len(odf.history_headers)
+    odf.record_header.num_param = len(odf.parameter_headers)
+    odf.record_header.num_cycle = rows
+
+    # Second pass: regenerate the same records and write them after the header.
+    with open(output_file_path, "w", encoding="iso-8859-1") as file:
+        file.write(odf.print_header(file_version = version))
+        for i, df in enumerate(_chunks(columns, rows, chunk_rows, quality_flags, start, interval)):
+            if version >= 3:
+                chunk = DataRecords(data_frame=df, parameter_list=odf.data.parameter_list,
+                                    print_formats=print_formats)
+                file.write(chunk.print_object(include_column_names=(i == 0)))
+            else:
+                file.write(("\n" if i else "") + _old_style_text(df, odf.data.parameter_list, print_formats))
+    BaseHeader.reset_log_list()
+    return odf
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic ODF file for scale testing.")
+    parser.add_argument("output", help="path of the ODF file to write")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--parameters", type=int, default=8)
+    parser.add_argument("--version", type=float, default=2.0, choices=[2.0, 3.0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--null-fraction", type=float, default=0.0)
+    parser.add_argument("--quality-flags", action="store_true")
+    parser.add_argument("--history-blocks", type=int, default=1)
+    parser.add_argument("--calibration-blocks", type=int, default=0)
+    parser.add_argument("--comment-lines", type=int, default=0)
+    args = parser.parse_args()
+    generate_odf(args.output, rows=args.rows, parameters=args.parameters, version=args.version,
+                 seed=args.seed, null_fraction=args.null_fraction, quality_flags=args.quality_flags,
+                 history_blocks=args.history_blocks, calibration_blocks=args.calibration_blocks,
+                 comment_lines=args.comment_lines)
+    print(f"Synthetic ODF file written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
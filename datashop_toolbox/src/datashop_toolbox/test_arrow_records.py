@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.records import DataRecords, pa, require_pyarrow
+
+class TestArrowRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.records = DataRecords(
+            data_frame=pd.DataFrame({
+                'SYTM_01': ["'01-JAN-2020 00:00:00.00'", "'01-JAN-2020 01:00:00.00'"],
+                'TEMP_01': [3.5, -1.25],
+                'QTEMP_01': [0, 1],
+            }),
+            parameter_list=['SYTM_01', 'TEMP_01', 'QTEMP_01'],
+            print_formats={'SYTM_01': '27', 'TEMP_01': '10.4', 'QTEMP_01': '1.0'})
+
+    @unittest.skipIf(pa is not None, "pyarrow is installed")
+    def test_missing_pyarrow_raises(self):
+        with self.assertRaises(ImportError):
+            require_pyarrow()
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_arrow_storage_writes_the_same_text(self):
+        v2 = self.records.print_object_old_style()
+        v3 = self.records.print_object()
+        self.records.use_arrow()
+        self.assertTrue(self.records.is_arrow_backed())
+        self.assertEqual(self.records.print_object_old_style(), v2)
+        self.assertEqual(self.records.print_object(), v3)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_round_trip_and_zero_copy_numpy(self):
+        table = self.records.to_arrow()
+        records = DataRecords.from_arrow(table, self.records.print_formats)
+        self.assertEqual(records.parameter_list, ['SYTM_01', 'TEMP_01', 'QTEMP_01'])
+        temperature = records.to_numpy('TEMP_01')
+        np.testing.assert_array_equal(temperature, [3.5, -1.25])
+        self.assertFalse(temperature.flags.writeable)  # a view of the Arrow buffer
+        self.assertTrue(records.to_arrow().equals(table))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from datashop_toolbox.batch_report import BatchReport, FILE_FIELDS, peak_rss_bytes
+
+class TestBatchReport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_report(self):
+        report = BatchReport('MTR_BCD2014999_minilog_BIO')
+        for name, rows, error in (('a.csv', 100, None), ('b.csv', 300, None), ('c.csv', None, 'bad file')):
+            path = os.path.join(self.tmp_dir.name, name)
+            with open(path, 'w') as file:
+                file.write('x' * 10)
+            record = report.start_file(path)
+            with report.stage(record, 'read'):
+                pass
+            report.finish_file(record, rows, 3 if rows else None, error)
+        return report
+
+    def test_summary(self):
+        summary = self.make_report().summary()
+        self.assertEqual((summary['files'], summary['succeeded'], summary['failed']), (3, 2, 1))
+        self.assertEqual(summary['rows'], 400)
+        self.assertEqual(summary['input_bytes'], 30)
+        self.assertGreater(summary['files_per_second'], 0)
+        self.assertLessEqual(summary['p50_file_seconds'], summary['p95_file_seconds'])
+        self.assertEqual(len(summary['slowest_files']), 3)
+
+    def test_write(self):
+        csv_path, json_path = self.make_report().write(self.tmp_dir.name)
+        self.assertEqual(os.path.basename(csv_path), 'MTR_BCD2014999_minilog_BIO_performance.csv')
+        with open(csv_path, newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(list(rows[0]), list(FILE_FIELDS))
+        self.assertEqual([row['status'] for row in rows], ['success', 'success', 'failed'])
+        self.assertEqual(rows[2]['error'], 'bad file')
+        with open(json_path) as file:
+            report = json.load(file)
+        self.assertEqual(report['summary']['failed'], 1)
+        self.assertEqual(len(report['files']), 3)
+
+    def test_peak_rss(self):
+        peak = peak_rss_bytes()
+        self.assertTrue(peak is None or peak > 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.benchmark import compare_results, run_benchmarks
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+from odf_oracle.data_to_oracle import data_to_oracle
+from odf_oracle.memory_connection import MemoryConnection
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks([], synthetic_rows=[300], thermograph_rows=0,
+                                 cases=['read_odf', 'write_odf', 'data_to_oracle'], repeat=1)
+        self.assertEqual([(entry['case'], entry['file'], entry['rows']) for entry in results['results']],
+                         [('read_odf', 'synthetic_300.ODF', 300), ('write_odf', 'synthetic_300.ODF', 300),
+                          ('data_to_oracle', 'synthetic_300.ODF', 300)])
+        for entry in results['results']:
+            self.assertGreater(entry['seconds'], 0)
+            self.assertGreater(entry['peak_bytes'], 0)
+
+    def test_compare_results(self):
+        def run(seconds, peak_bytes, error=None):
+            entry = {'case': 'read_odf', 'file': 'a.ODF', 'rows': 10, 'seconds': seconds,
+                     'best_seconds': seconds, 'peak_bytes': peak_bytes}
+            if error:
+                entry = {'case': 'read_odf', 'file': 'a.ODF', 'error': error}
+            return {'results': [entry]}
+
+        baseline = run(1.0, 100 * 1024 ** 2)
+        self.assertEqual(compare_results(run(1.2, 110 * 1024 ** 2), baseline), [])
+        self.assertEqual(len(compare_results(run(1.5, 100 * 1024 ** 2), baseline)), 1)
+        self.assertEqual(len(compare_results(run(1.5, 200 * 1024 ** 2), baseline)), 2)
+        self.assertEqual(len(compare_results(run(0, 0, 'ValueError: bad'), baseline)), 1)
+        # Growth below the noise floor is not a regression.
+        self.assertEqual(compare_results(run(0.004, 10), run(0.001, 1)), [])
+
+    def test_memory_connection_counts_rows(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'a.ODF')
+            generate_odf(path, rows=50, parameters=['PRES_01', 'TE90_01'], quality_flags=True)
+            odf = OdfHeader().read_odf(path)
+        connection = MemoryConnection()
+        data_to_oracle(odf, connection, 'a.ODF')
+        self.assertEqual(connection.rows['ODF_DATA'], 100)
+        self.assertEqual(connection.rows['ODF_INSTRUMENT'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.concat_odf import concat_odfs
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.memory_budget import set_memory_budget
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestConcatOdfs(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.paths = [self.write_part('a.ODF', '2014-07-12 00:00', [1.0, 2.0, 3.0]),
+                      self.write_part('b.ODF', '2014-07-12 02:00', [30.0, 4.0, 5.0])]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_part(self, name, start, values):
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        odf.parameter_headers.append(ParameterHeader(type='SYTM', code='SYTM_01', print_field_width=27,
+                                                     null_string=BaseHeader.SYTM_NULL_VALUE))
+        odf.parameter_headers.append(ParameterHeader(type='DOUB', code='TEMP_01', print_field_width=10,
+                                                     print_decimal_places=3))
+        times = pd.date_range(start, periods=len(values), freq='h').strftime('%d-%b-%Y %H:%M:%S.00')
+        odf.data.data_frame = pd.DataFrame({'SYTM_01': [f"'{t.upper()}'" for t in times], 'TEMP_01': values})
+        odf.data.parameter_list = ['SYTM_01', 'TEMP_01']
+        odf.data.print_formats = {'SYTM_01': '27', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        path = os.path.join(self.tmp_dir.name, name)
+        odf.write_odf(path)
+        return path
+
+    def test_overlap_keeps_first_file(self):
+        output = os.path.join(self.tmp_dir.name, 'all.ODF')
+        result = concat_odfs(self.paths[::-1], output)
+        self.assertEqual(result.record_header.num_cycle, 5)
+        odf = OdfHeader().read_odf(output)
+        self.assertEqual(odf.data.data_frame['TEMP_01'].tolist(), [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(odf.event_header.start_date_time, '12-JUL-2014 00:00:00.00')
+        self.assertEqual(odf.event_header.end_date_time, '12-JUL-2014 04:00:00.00')
+        self.assertEqual(odf.parameter_headers[1].maximum_value, 5.0)
+
+    def test_overlap_keeps_last_file(self):
+        output = os.path.join(self.tmp_dir.name, 'all.ODF')
+        concat_odfs(self.paths, output, overlap='last')
+        odf = OdfHeader().read_odf(output)
+        self.assertEqual(odf.data.data_frame['TEMP_01'].tolist(), [1.0, 2.0, 30.0, 4.0, 5.0])
+
+    def test_overlap_with_any_earlier_file(self):
+        # c.ODF starts after b.ODF but before the long a.ODF ends.
+        paths = [self.write_part('a.ODF', '2014-07-12 00:00', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]),
+                 self.write_part('b.ODF', '2014-07-12 01:00', [20.0]),
+                 self.write_part('c.ODF', '2014-07-12 03:00', [40.0, 50.0, 60.0, 70.0])]
+        output = os.path.join(self.tmp_dir.name, 'all.ODF')
+        concat_odfs(paths, output)
+        self.assertEqual(OdfHeader().read_odf(output).data.data_frame['TEMP_01'].tolist(),
+                         [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 70.0])
+        # Only the records of a.ODF from 01:00 and from 03:00 to 06:00 are replaced; 02:00 is kept.
+        concat_odfs(paths, output, overlap='last')
+        self.assertEqual(OdfHeader().read_odf(output).data.data_frame['TEMP_01'].tolist(),
+                         [1.0, 20.0, 3.0, 40.0, 50.0, 60.0, 70.0])
+        with self.assertRaises(ValueError):
+            concat_odfs(paths[::2], output, overlap='error')
+
+    def test_overlap_inside_earlier_file(self):
+        paths = [self.write_part('a.ODF', '2014-07-12 00:00', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]),
+                 self.write_part('b.ODF', '2014-07-12 02:00', [30.0, 40.0])]
+        output = os.path.join(self.tmp_dir.name, 'all.ODF')
+        for budget in (None, '1GB', 1):
+            set_memory_budget(budget)
+            try:
+                result = concat_odfs(paths, output, overlap='last')
+            finally:
+                set_memory_budget(None)
+            self.assertEqual(result.record_header.num_cycle, 6)
+            self.assertEqual(OdfHeader().read_odf(output).data.data_frame['TEMP_01'].tolist(),
+                             [1.0, 2.0, 30.0, 40.0, 5.0, 6.0])
+
+    def test_fixed_width_rows(self):
+        paths = [self.write_part('a.ODF', '2014-07-12 00:00', [1.0, 2.0]),
+                 self.write_part('b.ODF', '2014-07-13 00:00', [-12345678.5, 3.0])]
+        output = os.path.join(self.tmp_dir.name, 'all.ODF')
+        concat_odfs(paths, output)
+        with open(output) as file:
+            rows = file.read().split('-- DATA --\n')[1].splitlines()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(len({len(row) for row in rows}), 1)
+        self.assertEqual(OdfHeader().read_odf(output).data.data_frame['TEMP_01'].tolist(),
+                         [1.0, 2.0, -12345678.5, 3.0])
+
+    def test_overlap_error(self):
+        with self.assertRaises(ValueError):
+            concat_odfs(self.paths, os.path.join(self.tmp_dir.name, 'all.ODF'), overlap='error')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.ctd_cast import find_cast, split_cast, split_cruise
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+# Deck, soak at 10 dbar, back towards the surface, down to 100 dbar, up and out of the water.
+PRESSURE = np.concatenate([[0.0, 2.0, 5.0, 10.0, 10.0, 10.0, 6.0, 3.0, 1.0, 0.8, 0.6],
+                           np.arange(1.0, 101.0), np.arange(99.0, 0.0, -1.0), [0.5, 0.0, 0.0]])
+
+class TestCtdCast(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        odf = OdfHeader()
+        odf.cruise_header.cruise_number = 'CAR2024010'
+        odf.event_header.data_type = 'CTD'
+        odf.event_header.event_number = '004'
+        odf.event_header.event_qualifier1 = '504270'
+        odf.parameter_headers.append(ParameterHeader(type='SYTM', code='SYTM_01', print_field_width=27,
+                                                     null_string=BaseHeader.SYTM_NULL_VALUE))
+        odf.parameter_headers.append(ParameterHeader(type='DOUB', code='PRES_01', print_field_width=10,
+                                                     print_decimal_places=3))
+        odf.parameter_headers.append(ParameterHeader(type='DOUB', code='TEMP_01', print_field_width=10,
+                                                     print_decimal_places=3))
+        times = pd.date_range('2024-07-15 06:00', periods=len(PRESSURE), freq='s').strftime('%d-%b-%Y %H:%M:%S.00')
+        pressure = PRESSURE + np.random.default_rng(0).normal(0.0, 0.05, len(PRESSURE))
+        pressure[50] = BaseHeader.NULL_VALUE
+        odf.data.data_frame = pd.DataFrame({'SYTM_01': [f"'{t.upper()}'" for t in times],
+                                            'PRES_01': pressure.round(3),
+                                            'TEMP_01': np.linspace(15.0, 2.0, len(PRESSURE)).round(3)})
+        odf.data.parameter_list = ['SYTM_01', 'PRES_01', 'TEMP_01']
+        odf.data.print_formats = {'SYTM_01': '27', 'PRES_01': '10.3', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.odf = odf
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_find_cast(self):
+        phases = find_cast(PRESSURE)
+        self.assertEqual((phases['soak'], phases['down'], phases['up'], phases['after']),
+                         (slice(0, 10), slice(10, 111), slice(111, 212), slice(212, 213)))
+        self.assertEqual(phases['turn'], 110)
+        # A cast that is already a down cast.
+        self.assertEqual(find_cast(np.arange(1.0, 50.0))['down'], slice(0, 49))
+
+    def test_find_cast_with_heave_loops(self):
+        # Soak, then a descent to 200 dbar with +/-3 dbar ship heave loops below 125 dbar.
+        descent = np.linspace(1.0, 200.0, 2500)
+        descent[descent > 125.0] += 3.0 * np.sin(np.arange((descent > 125.0).sum()) / 8.0)
+        pressure = np.concatenate([[0.0, 5.0, 10.0, 10.0, 10.0, 4.0, 1.5], descent, np.linspace(199.0, 0.0, 500)])
+        phases = find_cast(pressure)
+        self.assertEqual(phases['soak'], slice(0, 7))
+        self.assertEqual(phases['down'].start, 7)
+        self.assertEqual(pressure[phases['turn']], pressure[:2507].max())
+
+    def test_split_cast(self):
+        down, up, phases = split_cast(self.odf)
+        self.assertEqual(phases['down'], slice(10, 111))
+        self.assertEqual((down.event_header.event_qualifier2, up.event_header.event_qualifier2), ('DN', 'UP'))
+        self.assertEqual(self.odf.event_header.event_qualifier2, '')
+        self.assertEqual((down.record_header.num_cycle, up.record_header.num_cycle), (101, 101))
+        self.assertEqual(self.odf.record_header.num_cycle, len(PRESSURE))
+        self.assertEqual(down.file_specification, 'CTD_CAR2024010_004_504270_DN')
+        self.assertEqual(up.event_header.start_date_time, '15-JUL-2024 06:01:51.00')
+        self.assertAlmostEqual(down.event_header.max_depth, 100.0, delta=0.2)
+        self.assertAlmostEqual(down.parameter_headers[1].maximum_value, down.event_header.max_depth)
+        self.assertEqual(len(down.history_headers), len(self.odf.history_headers) + 1)
+        # The casts share the source columns until they are written to.
+        self.assertTrue(np.shares_memory(down.data.data_frame['TEMP_01'].to_numpy(),
+                                         self.odf.data.data_frame['TEMP_01'].to_numpy()))
+
+    def test_split_cruise(self):
+        paths = []
+        for event in ('004', '005'):
+            self.odf.event_header.event_number = event
+            paths.append(os.path.join(self.tmp_dir.name, f'CTD_{event}.ODF'))
+            self.odf.write_odf(paths[-1])
+        output_folder = os.path.join(self.tmp_dir.name, 'split')
+        results = split_cruise(self.tmp_dir.name, output_folder, max_workers=2)
+        self.assertEqual(list(results), paths)
+        self.assertEqual(sorted(os.listdir(output_folder)),
+                         [f'CTD_CAR2024010_{event}_504270_{qualifier}.ODF'
+                          for event in ('004', '005') for qualifier in ('DN', 'UP')])
+        up = OdfHeader().read_odf(results[paths[1]][0][1])
+        self.assertEqual(up.event_header.event_qualifier2, 'UP')
+        self.assertEqual(up.record_header.num_cycle, 101)
+        self.assertEqual(len(up.data), 101)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import pandas as pd
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.polynomialhdr import PolynomialCalHeader
+
+class TestEditParameters(unittest.TestCase):
+
+    def setUp(self):
+        self.odf = OdfHeader()
+        codes = ['PRES_01', 'TEMP_01', 'FFFF_01', 'PSAL_01']
+        for code in codes:
+            self.odf.parameter_headers.append(ParameterHeader(type='DOUB', code=code))
+        self.odf.polynomial_cal_headers.append(PolynomialCalHeader(parameter_code='TEMP_01'))
+        self.odf.data.data_frame = pd.DataFrame({code: [float(i), float(i + 1)] for i, code in enumerate(codes)})
+        self.odf.data.parameter_list = list(codes)
+        self.odf.data.print_formats = {code: '10.4' for code in codes}
+
+    def test_remove_rename_and_reorder(self):
+        self.odf.edit_parameters(remove=['FFFF_01'], rename={'TEMP_01': 'TE90_01'},
+                                 order=['TE90_01', 'PRES_01', 'PSAL_01'])
+        self.assertEqual(self.odf.get_parameter_codes(), ['TE90_01', 'PRES_01', 'PSAL_01'])
+        self.assertEqual(self.odf.data.parameter_list, ['TE90_01', 'PRES_01', 'PSAL_01'])
+        self.assertEqual(list(self.odf.data.data_frame.columns), ['TE90_01', 'PRES_01', 'PSAL_01'])
+        self.assertEqual(list(self.odf.data.print_formats), ['TE90_01', 'PRES_01', 'PSAL_01'])
+        self.assertEqual(self.odf.data.data_frame['TE90_01'].tolist(), [1.0, 2.0])
+        self.assertEqual(self.odf.polynomial_cal_headers[0].parameter_code, 'TE90_01')
+
+    def test_unknown_code_raises(self):
+        with self.assertRaises(ValueError):
+            self.odf.edit_parameters(remove=['UNKN_01'])
+
+    def test_incomplete_order_raises(self):
+        with self.assertRaises(ValueError):
+            self.odf.edit_parameters(order=['PRES_01', 'TEMP_01'])
+
+    def test_fix_parameter_codes(self):
+        self.odf.fix_parameter_codes(['PRES_01', 'TE90_01', 'FFFF_01', 'PSAL_01'])
+        self.assertEqual(self.odf.get_parameter_codes(), ['PRES_01', 'TE90_01', 'FFFF_01', 'PSAL_01'])
+        self.assertEqual(self.odf.polynomial_cal_headers[0].parameter_code, 'TE90_01')
+
+if __name__ == "__main__":
+    unittest.main()
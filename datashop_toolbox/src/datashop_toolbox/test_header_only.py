@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestHeaderOnlyRewrite(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        odf.cruise_header.cruise_number = 'BCD2024669'
+        for code in ['PRES_01', 'TEMP_01']:
+            odf.parameter_headers.append(ParameterHeader(type='DOUB', code=code, print_field_width=10,
+                                                         print_decimal_places=3))
+        odf.data.data_frame = pd.DataFrame({'PRES_01': [1.0, 2.0, 3.0], 'TEMP_01': [8.2, 5.6, 2.45]})
+        odf.data.parameter_list = ['PRES_01', 'TEMP_01']
+        odf.data.print_formats = {'PRES_01': '10.3', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp_dir.name, 'source.ODF')
+        self.target = os.path.join(self.tmp_dir.name, 'target.ODF')
+        odf.write_odf(self.source)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def data_section(path):
+        with open(path, 'rb') as file:
+            text = file.read()
+        return text[text.index(b'\n', text.index(b'-- DATA --')):]
+
+    def test_data_bytes_are_copied(self):
+        odf = OdfHeader().read_odf(self.source, header_only=True)
+        self.assertTrue(odf.data.data_frame.empty)
+        odf.cruise_header.cruise_number = 'HUD2014030'
+        odf.update_odf()
+        self.assertEqual(odf.record_header.num_cycle, 3)
+        odf.write_odf(self.target)
+        self.assertEqual(self.data_section(self.source), self.data_section(self.target))
+        result = OdfHeader().read_odf(self.target)
+        self.assertEqual(result.cruise_header.cruise_number, 'HUD2014030')
+        self.assertEqual(result.data.data_frame['TEMP_01'].tolist(), [8.2, 5.6, 2.45])
+
+    def test_write_in_place(self):
+        original = self.data_section(self.source)
+        odf = OdfHeader().read_odf(self.source, header_only=True)
+        odf.cruise_header.cruise_number = 'CAR2024010'
+        odf.write_odf(self.source)
+        self.assertEqual(self.data_section(self.source), original)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['source.ODF'])
+        # The object now reads its data from the rewritten file.
+        odf.write_odf(self.target)
+        self.assertEqual(self.data_section(self.target), original)
+        reread = OdfHeader().read_odf(self.source)
+        self.assertEqual(reread.cruise_header.cruise_number, 'CAR2024010')
+        self.assertEqual(reread.data.data_frame['TEMP_01'].tolist(), [8.2, 5.6, 2.45])
+
+    def test_version_change_raises(self):
+        odf = OdfHeader().read_odf(self.source, header_only=True)
+        with self.assertRaises(ValueError):
+            odf.write_odf(self.target, version=3.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from datashop_toolbox.header_search import compile_query, find_odf_files, header_bytes, search_file, search_headers
+from datashop_toolbox.synthetic_odf import generate_odf
+
+class TestHeaderSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.odf_file = os.path.join(self.tmp_dir.name, 'a.ODF')
+        generate_odf(self.odf_file, rows=50, parameters=['PRES_01', 'TE90_01'], history_blocks=1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_header_bytes_stop_at_data(self):
+        header = header_bytes(self.odf_file)
+        self.assertIn(b'RECORD_HEADER', header)
+        self.assertNotIn(b'-- DATA --', header)
+
+    def test_search_file(self):
+        query = compile_query({'cruise_number': 'syn*', 'CODE': 'TE90_0?'}, ['PLATFORM'])
+        self.assertEqual(search_file(self.odf_file, query),
+                         {'cruise_number': ['SYN0000000'], 'CODE': ['TE90_01'], 'PLATFORM': ['SYNTHETIC PLATFORM']})
+        self.assertIsNone(search_file(self.odf_file, compile_query({'CODE': 'DOXY_01'})))
+
+    def test_block_qualified_fields(self):
+        found = search_file(self.odf_file, compile_query({}, ['CREATION_DATE', 'HISTORY_HEADER.CREATION_DATE']))
+        self.assertEqual(len(found['CREATION_DATE']), 2)
+        self.assertEqual(found['HISTORY_HEADER.CREATION_DATE'], ['01-JAN-2020 00:00:00.00'])
+        query = compile_query({'INSTRUMENT_HEADER.SERIAL_NUMBER': '0000'})
+        self.assertIsNotNone(search_file(self.odf_file, query))
+        self.assertIsNone(search_file(self.odf_file, compile_query({'CRUISE_HEADER.SERIAL_NUMBER': '*'})))
+
+    def test_search_headers(self):
+        os.makedirs(os.path.join(self.tmp_dir.name, 'sub'))
+        other_file = os.path.join(self.tmp_dir.name, 'sub', 'b.odf')
+        generate_odf(other_file, rows=50, parameters=['PRES_01', 'DOXY_01'])
+        self.assertEqual(find_odf_files(self.tmp_dir.name), [self.odf_file, other_file])
+        results = search_headers(self.tmp_dir.name, {'CODE': 'DOXY*'}, max_workers=2, batch_size=1)
+        self.assertEqual(results, {other_file: {'CODE': ['DOXY_01']}})
+
+if __name__ == '__main__':
+    unittest.main()
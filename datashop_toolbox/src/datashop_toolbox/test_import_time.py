@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Packages that must only be imported by the features that use them.
+LAZY_PACKAGES = ('PyQt6', 'matplotlib', 'openpyxl', 'netCDF4', 'oracledb', 'dotenv', 'icecream')
+# Generous, so the test only fails when something heavy is imported again.
+IMPORT_BUDGET_SECONDS = float(os.environ.get('DATASHOP_IMPORT_BUDGET_SECONDS', 3.0))
+
+
+def import_times(statement: str) -> dict:
+    """ Return {module: cumulative microseconds} from python -X importtime for the statement. """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+                            check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def check(self, package: str) -> None:
+        times = import_times(f"import {package}")
+        loaded = sorted({name.split('.')[0] for name in times} & set(LAZY_PACKAGES))
+        self.assertEqual(loaded, [], f"import {package} loads {loaded}")
+        self.assertLess(times[package] / 1e6, IMPORT_BUDGET_SECONDS)
+
+    def test_datashop_toolbox(self):
+        self.check('datashop_toolbox')
+
+    def test_odf_oracle(self):
+        self.check('odf_oracle')
+
+    def test_headless_batch_modules(self):
+        for module in ('datashop_toolbox.process_mtr_files', 'datashop_toolbox.metadata_report',
+                       'datashop_toolbox.split_odf'):
+            times = import_times(f"import {module}")
+            loaded = sorted({name.split('.')[0] for name in times} & set(LAZY_PACKAGES))
+            self.assertEqual(loaded, [], f"import {module} loads {loaded}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.madcp import BinnedData, read_madcp
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+
+VARIABLES = ('EWCT', 'NSCT', 'VCSP', 'ERRV', 'UNKN')
+BINS = 6
+
+class TestMadcp(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.odf_file = os.path.join(self.tmp_dir.name, 'MADCP.ODF')
+        source_file = os.path.join(self.tmp_dir.name, 'source.ODF')
+        codes = [f"{variable}_{number:02d}" for variable in VARIABLES for number in range(1, BINS + 1)]
+        generate_odf(source_file, rows=120, parameters=codes, null_fraction=0.05)
+        odf = OdfHeader().read_odf(source_file, header_only=True)
+        for header in odf.parameter_headers:
+            if header.type != 'SYTM':
+                header.depth = 8.0 * int(header.code[-2:])
+        odf.write_odf(self.odf_file)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_madcp(self):
+        odf, binned = read_madcp(self.odf_file)
+        expected = OdfHeader().read_odf(self.odf_file).data.data_frame
+        pd.testing.assert_frame_equal(odf.data.data_frame, expected, check_dtype=False)
+        self.assertEqual(binned.variables, list(VARIABLES))
+        self.assertEqual(binned.bins, list(range(1, BINS + 1)))
+        np.testing.assert_array_equal(binned.depths, 8.0 * np.arange(1, BINS + 1))
+        self.assertEqual(binned.shape, (120, BINS))
+        self.assertTrue(binned['EWCT'].flags['C_CONTIGUOUS'])
+        nulls = (expected[binned.codes['EWCT']] == BaseHeader.NULL_VALUE).to_numpy()
+        np.testing.assert_array_equal(np.isnan(binned['EWCT']), nulls)
+        self.assertEqual(binned.times[0], np.datetime64('2020-01-01T00:00:00'))
+
+    def test_statistics(self):
+        _, binned = read_madcp(self.odf_file)
+        column = pd.Series(binned['NSCT'][:, 2])
+        statistics = binned.statistics('NSCT')
+        self.assertEqual(statistics['count'][2], column.count())
+        self.assertAlmostEqual(statistics['mean'][2], column.mean())
+        self.assertAlmostEqual(statistics['max'][2], column.max())
+        averages = binned.ensemble_average('NSCT', 50)
+        self.assertEqual(averages.shape, (3, BINS))
+        self.assertAlmostEqual(averages[2, 2], column[100:].mean())
+        np.testing.assert_allclose(binned.depth_average('EWCT'), np.nanmean(binned['EWCT'], axis=1))
+        np.testing.assert_allclose(binned.speed()[0, 0], np.hypot(binned['EWCT'][0, 0], binned['NSCT'][0, 0]))
+
+    def test_mask_and_write(self):
+        odf, binned = read_madcp(self.odf_file)
+        self.assertGreater(binned.mask_bins(max_depth=32.0), 0)
+        binned.mask(binned['UNKN'] < 10.0, ['EWCT', 'NSCT'])
+        binned.apply_to(odf)
+        output_file = os.path.join(self.tmp_dir.name, 'masked.ODF')
+        odf.write_odf(output_file)
+
+        df = OdfHeader().read_odf(output_file).data.data_frame
+        self.assertTrue((df[['EWCT_05', 'UNKN_06']] == BaseHeader.NULL_VALUE).all().all())
+        low_quality = (df['UNKN_01'] < 10.0) & (df['UNKN_01'] != BaseHeader.NULL_VALUE)
+        self.assertTrue((df.loc[low_quality, 'EWCT_01'] == BaseHeader.NULL_VALUE).all())
+        reread = BinnedData.from_odf(OdfHeader().read_odf(output_file))
+        np.testing.assert_array_equal(reread['EWCT'], binned['EWCT'])
+
+    def test_header_only_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BinnedData.from_odf(OdfHeader().read_odf(self.odf_file, header_only=True))
+
+if __name__ == '__main__':
+    unittest.main()
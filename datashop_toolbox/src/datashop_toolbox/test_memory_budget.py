@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox import memory_budget
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestMemoryBudget(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        memory_budget.set_memory_budget(None)
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        for code in ['PRES_01', 'TEMP_01']:
+            odf.parameter_headers.append(ParameterHeader(type='DOUB', code=code, print_field_width=10,
+                                                         print_decimal_places=3))
+        rows = 2500
+        odf.data.data_frame = pd.DataFrame({'PRES_01': [float(i) for i in range(rows)],
+                                            'TEMP_01': [(i % 700) * 1.5 - 20 for i in range(rows)]})
+        odf.data.parameter_list = ['PRES_01', 'TEMP_01']
+        odf.data.print_formats = {'PRES_01': '10.3', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.odf = odf
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'source.ODF')
+
+    def tearDown(self):
+        memory_budget.set_memory_budget(None)
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def data_section(text):
+        return text[text.index('-- DATA --'):]
+
+    def test_parse_size_and_chunk_rows(self):
+        self.assertEqual(memory_budget.parse_size('512MB'), 512 * 1024 ** 2)
+        self.assertEqual(memory_budget.parse_size('1.5 GiB'), int(1.5 * 1024 ** 3))
+        self.assertEqual(memory_budget.chunk_rows(10), memory_budget.DEFAULT_CHUNK_ROWS)
+        memory_budget.set_memory_budget('1MB')
+        self.assertEqual(memory_budget.chunk_rows(10), memory_budget.MIN_CHUNK_ROWS)
+        with self.assertRaises(ValueError):
+            memory_budget.parse_size('lots')
+
+    def test_streaming_read_and_write_match(self):
+        expected = {}
+        for version in (2.0, 3.0):
+            self.odf.write_odf(self.path, version=version)
+            with open(self.path) as file:
+                expected[version] = file.read()
+        memory_budget.set_memory_budget('100KB')
+        self.assertTrue(memory_budget.exceeds_budget(memory_budget.estimate_file_footprint(self.path)))
+        for version in (2.0, 3.0):
+            with open(self.path, 'w') as file:
+                file.write(expected[version])
+            BaseHeader.shared_log_list.clear()
+            odf = OdfHeader().read_odf(self.path)
+            pd.testing.assert_frame_equal(odf.data.data_frame, self.odf.data.data_frame)
+            odf.write_odf(self.path, version=version)
+            with open(self.path) as file:
+                self.assertEqual(self.data_section(file.read()), self.data_section(expected[version]))
+
+    def test_stage_report(self):
+        memory_budget.start_memory_report()
+        try:
+            self.odf.write_odf(self.path)
+        finally:
+            report = memory_budget.stop_memory_report()
+        self.assertGreater(report['write_odf'], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.metadata_patch import patch_file, validate_patch
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestMetadataPatch(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        for code in ['PRES_01', 'TEMP_01']:
+            odf.parameter_headers.append(ParameterHeader(type='DOUB', code=code, print_field_width=10,
+                                                         print_decimal_places=3))
+        odf.data.data_frame = pd.DataFrame({'PRES_01': [1.0, 2.0], 'TEMP_01': [8.2, 5.6]})
+        odf.data.parameter_list = ['PRES_01', 'TEMP_01']
+        odf.data.print_formats = {'PRES_01': '10.3', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_folder = os.path.join(self.tmp_dir.name, 'in')
+        self.output_folder = os.path.join(self.tmp_dir.name, 'out')
+        os.makedirs(self.input_folder)
+        os.makedirs(self.output_folder)
+        self.path = os.path.join(self.input_folder, 'CTD_TEST.ODF')
+        odf.write_odf(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_patch_file(self):
+        patch = {'user': 'Test User', 'rules': [
+            {'files': 'CTD_*', 'set': {'cruise_header.platform': 'HUDSON', 'parameter[TEMP_01].units': 'DEGC'},
+             'rename': {'TEMP_01': 'TE90_01'}, 'history': ['Sensor swapped.']},
+            {'files': 'MTR_*', 'set': {'cruise_header.platform': 'WRONG'}},
+        ]}
+        validate_patch(patch)
+        output = patch_file(patch, self.path, self.output_folder)
+        odf = OdfHeader().read_odf(output)
+        self.assertEqual(odf.cruise_header.platform, 'HUDSON')
+        self.assertEqual(odf.get_parameter_codes(), ['PRES_01', 'TE90_01'])
+        self.assertEqual(odf.parameter_headers[1].units, 'DEGC')
+        self.assertEqual(odf.data.data_frame['TE90_01'].tolist(), [8.2, 5.6])
+        processes = odf.history_headers[-1].processes
+        self.assertEqual(processes[0], 'Test User made the following modifications to this file:')
+        self.assertIn('Sensor swapped.', processes)
+
+    def test_invalid_target_raises(self):
+        with self.assertRaises(ValueError):
+            validate_patch({'rules': [{'files': '*', 'set': {'odf_header.version': 3}}]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from datashop_toolbox import metrics
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.enabled = metrics.is_enabled()
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.enable() if self.enabled else metrics.disable()
+        metrics.reset()
+
+    def test_nothing_recorded_when_disabled(self):
+        metrics.disable()
+        with metrics.timed('stage'):
+            metrics.count('counter')
+        self.assertEqual(metrics.snapshot(), {'timings': {}, 'counters': {}})
+
+    def test_timed_and_count(self):
+        metrics.enable()
+
+        @metrics.timed('function')
+        def function(x):
+            metrics.count('items', x)
+            return x
+
+        self.assertEqual(function(3), 3)
+        self.assertEqual(function(4), 4)
+        with metrics.timed('block'):
+            pass
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['timings']['function']['calls'], 2)
+        self.assertEqual(snapshot['timings']['block']['calls'], 1)
+        self.assertEqual(snapshot['counters'], {'items': 7})
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {'timings': {}, 'counters': {}})
+
+    def test_read_and_write_stages(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'a.ODF')
+            generate_odf(path, rows=200, parameters=['PRES_01', 'TE90_01'])
+            metrics.enable()
+            odf = OdfHeader().read_odf(path)
+            odf.write_odf(os.path.join(folder, 'b.ODF'))
+        snapshot = metrics.snapshot()
+        for stage in ('read_odf', 'read_odf.read_lines', 'read_odf.headers', 'data.tokenize',
+                      'data.convert', 'data.sytm', 'write_odf', 'render.headers', 'render.data_v2',
+                      'write_odf.disk'):
+            self.assertIn(stage, snapshot['timings'])
+        self.assertEqual(snapshot['counters']['data.records'], 200)
+        self.assertEqual(snapshot['counters']['data.values'], 600)
+
+if __name__ == '__main__':
+    unittest.main()
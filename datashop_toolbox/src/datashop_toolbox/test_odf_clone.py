@@ -0,0 +1,45 @@
+import unittest
+import pandas as pd
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestOdfClone(unittest.TestCase):
+
+    def setUp(self):
+        self.odf = OdfHeader()
+        self.odf.cruise_header.cruise_number = 'BCD2024669'
+        self.odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        self.odf.parameter_headers.append(ParameterHeader(type='DOUB', code='TEMP_01'))
+        self.odf.data.data_frame = pd.DataFrame({'TEMP_01': [1.0, 2.0, 3.0]})
+        self.odf.data.parameter_list = ['TEMP_01']
+        self.odf.data.print_formats = {'TEMP_01': '10.4'}
+
+    def test_header_edits_do_not_leak(self):
+        clone = self.odf.clone()
+        clone.cruise_header.cruise_number = 'HUD2014030'
+        clone.history_headers[0].add_process('Clone process')
+        clone.parameter_headers[0].code = 'TE90_01'
+        self.assertEqual(self.odf.cruise_header.cruise_number, 'BCD2024669')
+        self.assertEqual(self.odf.history_headers[0].processes, ['Original process'])
+        self.assertEqual(self.odf.parameter_headers[0].code, 'TEMP_01')
+
+    def test_data_edits_do_not_leak(self):
+        clone = self.odf.clone()
+        clone.data.data_frame.loc[0, 'TEMP_01'] = 99.0
+        clone.data.print_formats['TEMP_01'] = '12.6'
+        self.assertEqual(self.odf.data.data_frame.loc[0, 'TEMP_01'], 1.0)
+        self.assertEqual(self.odf.data.print_formats['TEMP_01'], '10.4')
+
+    def test_list_of_headers_is_independent(self):
+        clone = self.odf.clone()
+        clone.history_headers.append(HistoryHeader())
+        self.assertEqual(len(self.odf.history_headers), 1)
+    def test_data_source_is_independent(self):
+        self.odf.set_data_source('source.ODF', 100, 2.0, rows=3)
+        clone = self.odf.clone()
+        clone._data_source['rows'] = 5
+        self.assertEqual(self.odf.data_row_count(), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.odf_diff import changed_ranges, diff_data, odf_diff
+from datashop_toolbox.odfhdr import OdfHeader
+
+class TestOdfDiff(unittest.TestCase):
+
+    def test_changed_ranges(self):
+        mask = np.array([False, True, True, False, True])
+        self.assertEqual(changed_ranges(mask), [(1, 3), (4, 5)])
+
+    def test_diff_data_uses_tolerance(self):
+        df_a = pd.DataFrame({'TEMP_01': [1.0, 2.0, np.nan, 4.0], 'SYTM_01': ["'a'", "'b'", "'c'", "'d'"]})
+        df_b = pd.DataFrame({'TEMP_01': [1.0, 2.0000001, np.nan, 5.0], 'SYTM_01': ["'a'", "'b'", "'x'", "'d'"]})
+        result = diff_data(df_a, df_b, atol=1e-6)
+        self.assertEqual(result['columns']['TEMP_01']['ranges'], [(3, 4)])
+        self.assertEqual(result['columns']['TEMP_01']['max_difference'], 1.0)
+        self.assertEqual(result['columns']['SYTM_01']['ranges'], [(2, 3)])
+
+    def test_header_fields(self):
+        a = OdfHeader()
+        b = a.clone()
+        b.cruise_header.cruise_number = 'HUD2014030'
+        diff = odf_diff(a, b, compare_data=False)
+        self.assertEqual(diff['headers'], {'cruise_header': {'cruise_number': ('', 'HUD2014030')}})
+        self.assertFalse(diff['summary']['identical'])
+
+if __name__ == "__main__":
+    unittest.main()
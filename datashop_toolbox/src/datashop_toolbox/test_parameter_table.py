@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameter_table import ParameterTable, column_extremes
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestParameterTable(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = [
+            ParameterHeader(type='SYTM', code='SYTM_01', units='GMT', print_field_width=27,
+                            null_string=BaseHeader.SYTM_NULL_VALUE),
+            ParameterHeader(type='DOUB', code='TEMP_01', units='degC', print_field_width=10,
+                            print_decimal_places=4),
+            ParameterHeader(type='INTE', code='CNTR_01', print_field_width=6, print_decimal_places=0),
+        ]
+
+    def test_round_trip(self):
+        table = ParameterTable.from_headers(self.headers)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.codes, ['SYTM_01', 'TEMP_01', 'CNTR_01'])
+        copies = table.to_headers()
+        self.assertEqual([h.model_dump() for h in copies], [h.model_dump() for h in self.headers])
+
+    def test_print_formats(self):
+        table = ParameterTable.from_headers(self.headers)
+        self.assertEqual(table.print_formats(), {'SYTM_01': '27', 'TEMP_01': '10.4', 'CNTR_01': '6.0'})
+        self.assertEqual(OdfHeader().parameter_table().print_formats(), {})
+
+    def test_update_odf_statistics(self):
+        odf = OdfHeader()
+        odf.parameter_headers = self.headers
+        odf.data.data_frame = pd.DataFrame({
+            'SYTM_01': ['01-JAN-2020 00:00:00.00', '01-JAN-2020 01:00:00.00'],
+            'TEMP_01': [3.5, -1.25],
+            'CNTR_01': [2, 7],
+        })
+        odf.update_odf()
+        self.assertEqual(self.headers[0].minimum_value, '01-JAN-2020 00:00:00.00')
+        self.assertEqual(self.headers[0].maximum_value, '01-JAN-2020 01:00:00.00')
+        self.assertEqual((self.headers[1].minimum_value, self.headers[1].maximum_value), (-1.25, 3.5))
+        self.assertEqual((self.headers[2].minimum_value, self.headers[2].maximum_value), (2, 7))
+        # A second pass finds nothing to change.
+        table = odf.parameter_table()
+        table.update_statistics(odf.data.data_frame)
+        self.assertEqual(table.apply_to(self.headers, ('minimum_value', 'maximum_value')), 0)
+
+    def test_column_extremes_match_builtin(self):
+        df = pd.DataFrame({'A': [2.0, np.nan, -1.0], 'B': [np.nan, 2.0, -1.0], 'C': [4.0, 1.5, 3.0],
+                           'D': [3, 1, 2]})
+        minimums, maximums = column_extremes(df, list(df.columns))
+        for code in df.columns:
+            self.assertEqual(repr(float(minimums[code])), repr(float(min(df[code]))))
+            self.assertEqual(repr(float(maximums[code])), repr(float(max(df[code]))))
+
+    def test_update_odf_without_records(self):
+        self.headers[1].minimum_value = 1.5
+        odf = OdfHeader()
+        odf.parameter_headers = self.headers
+        odf.data.data_frame = pd.DataFrame(columns=['SYTM_01', 'TEMP_01', 'CNTR_01'])
+        odf.update_odf()
+        self.assertEqual(self.headers[1].minimum_value, 1.5)
+
+    def test_read_repeated_codes(self):
+        odf = OdfHeader()
+        odf.parameter_headers = self.headers
+        odf.data.data_frame = pd.DataFrame({'SYTM_01': ["'01-JAN-2020 00:00:00.00'"], 'TEMP_01': [3.5],
+                                            'CNTR_01': [2]})
+        odf.data.parameter_list = ['SYTM_01', 'TEMP_01', 'CNTR_01']
+        odf.data.print_formats = {'SYTM_01': '27', 'TEMP_01': '10.4', 'CNTR_01': '6.0'}
+        odf.update_odf()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'repeated.ODF')
+            odf.write_odf(path)
+            with open(path) as file:
+                text = file.read().replace("CNTR_01", "TEMP_01")
+            with open(path, 'w') as file:
+                file.write(text)
+            copy = OdfHeader().read_odf(path, header_only=True)
+        self.assertEqual(copy.data.parameter_list, ['SYTM_01', 'TEMP_01', 'TEMP_01'])
+
+if __name__ == "__main__":
+    unittest.main()
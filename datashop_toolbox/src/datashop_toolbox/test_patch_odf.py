@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from datashop_toolbox.records import fixed_width_slots, patch_fixed_width_columns
+
+class TestPatchFixedWidthColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.data = (b"'12-JUL-2014 05:45:00.00'  6.20 0\n"
+                     b"'12-JUL-2014 05:50:00.00'  6.71 0\n"
+                     b"'12-JUL-2014 05:55:00.00'  7.14 0")
+
+    def test_slots(self):
+        row = self.data.split(b"\n")[0]
+        self.assertEqual(fixed_width_slots(row), [(0, 25), (25, 31), (31, 33)])
+
+    def test_patch_flag_column(self):
+        patched = patch_fixed_width_columns(self.data, {2: (31, 33)}, {2: np.array([1, 4, 1])}, {2: '.0f'})
+        self.assertEqual(patched, (b"'12-JUL-2014 05:45:00.00'  6.20 1\n"
+                                   b"'12-JUL-2014 05:50:00.00'  6.71 4\n"
+                                   b"'12-JUL-2014 05:55:00.00'  7.14 1"))
+
+    def test_value_too_wide_raises(self):
+        with self.assertRaises(ValueError):
+            patch_fixed_width_columns(self.data, {2: (31, 33)}, {2: np.array([1, 100, 1])}, {2: '.0f'})
+
+    def test_value_filling_slot_raises(self):
+        # A two digit flag would overwrite the blank between the previous field and this one.
+        with self.assertRaises(ValueError):
+            patch_fixed_width_columns(self.data, {2: (31, 33)}, {2: np.array([1, 10, 1])}, {2: '.0f'})
+        patched = patch_fixed_width_columns(self.data, {1: (25, 31)}, {1: np.array([1.5, 10.25, -7.5])},
+                                            {1: '.2f'})
+        self.assertEqual(patched.split(b"\n")[1], b"'12-JUL-2014 05:50:00.00' 10.25 0")
+
+    def test_ragged_rows_raise(self):
+        with self.assertRaises(ValueError):
+            patch_fixed_width_columns(self.data + b"\n1 2", {2: (31, 33)}, {2: np.array([1, 1, 1, 1])}, {2: '.0f'})
+
+if __name__ == "__main__":
+    unittest.main()
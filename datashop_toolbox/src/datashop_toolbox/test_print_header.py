@@ -0,0 +1,21 @@
+import unittest
+from datashop_toolbox.meteohdr import MeteoHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.qualityhdr import QualityHeader
+
+class TestPrintHeader(unittest.TestCase):
+
+    def test_v3_optional_blocks(self):
+        odf = OdfHeader()
+        odf.meteo_header = MeteoHeader()
+        odf.quality_header = QualityHeader()
+        odf.quality_header.add_quality_codes()
+        lines = odf.print_header(3.0).splitlines()
+        for block in ('METEO_HEADER', 'QUALITY_HEADER', 'INSTRUMENT_HEADER'):
+            self.assertIn(block, lines)
+        self.assertEqual(lines[lines.index('QUALITY_HEADER') - 1], "  METEO_COMMENTS = ''")
+        self.assertEqual(lines[lines.index('INSTRUMENT_HEADER') - 1],
+                         "  QUALITY_COMMENTS = '  9: Value is missing'")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from datashop_toolbox.cruisehdr import CruiseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+
+class TestRenderCache(unittest.TestCase):
+
+    def test_unchanged_header_reuses_text(self):
+        cruise = CruiseHeader(cruise_number='BCD2024669')
+        first = cruise.render_cached()
+        self.assertIs(cruise.render_cached(), first)
+
+    def test_assignment_invalidates(self):
+        cruise = CruiseHeader(cruise_number='BCD2024669')
+        cruise.render_cached()
+        cruise.platform = 'HUDSON'
+        self.assertIn("PLATFORM = 'HUDSON'", cruise.render_cached())
+
+    def test_same_value_assignment_keeps_cache(self):
+        param = ParameterHeader(type='DOUB', code='PRES_01', print_decimal_places=3,
+                                minimum_value=1.0, maximum_value=2.0)
+        first = param.render_cached()
+        param.minimum_value = 1.0
+        self.assertIs(param.render_cached(), first)
+        param.maximum_value = 5.0
+        self.assertIn("MAXIMUM_VALUE = 5.000", param.render_cached())
+
+    def test_in_place_list_change_invalidates(self):
+        history = HistoryHeader()
+        history.render_cached()
+        history.processes.append('Edited in place')
+        self.assertIn("PROCESS = 'Edited in place'", history.render_cached())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.row_index import INDEX_SUFFIX, load_row_index, read_rows
+
+class TestRowIndex(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        for code in ['PRES_01', 'TEMP_01']:
+            odf.parameter_headers.append(ParameterHeader(type='DOUB', code=code, print_field_width=10,
+                                                         print_decimal_places=3))
+        odf.data.data_frame = pd.DataFrame({'PRES_01': [float(i) for i in range(25)],
+                                            'TEMP_01': [i / 10 for i in range(25)]})
+        odf.data.parameter_list = ['PRES_01', 'TEMP_01']
+        odf.data.print_formats = {'PRES_01': '10.3', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'rows.ODF')
+        odf.write_odf(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_rows_matches_full_read(self):
+        full = OdfHeader().read_odf(self.path).data.data_frame
+        index = load_row_index(self.path, stride=4)
+        self.assertEqual(index['rows'], 25)
+        self.assertEqual(len(index['offsets']), 7)
+        for start, stop in [(0, 3), (5, 13), (22, 40)]:
+            self.assertTrue(read_rows(self.path, start, stop, index=index).equals(full.iloc[start:stop]))
+
+    def test_persisted_index_is_reused(self):
+        load_row_index(self.path, stride=4, persist=True)
+        self.assertTrue(os.path.isfile(self.path + INDEX_SUFFIX))
+        self.assertEqual(load_row_index(self.path, stride=4, persist=True)['rows'], 25)
+
+if __name__ == "__main__":
+    unittest.main()
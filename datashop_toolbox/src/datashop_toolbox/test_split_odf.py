@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.historyhdr import HistoryHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.split_odf import split_odf
+
+class TestSplitOdf(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        odf = OdfHeader()
+        odf.history_headers.append(HistoryHeader(processes=['Original process']))
+        odf.parameter_headers.append(ParameterHeader(type='SYTM', code='SYTM_01', print_field_width=27,
+                                                     null_string=BaseHeader.SYTM_NULL_VALUE))
+        odf.parameter_headers.append(ParameterHeader(type='DOUB', code='TEMP_01', print_field_width=10,
+                                                     print_decimal_places=3))
+        times = pd.date_range('2014-07-30', periods=5, freq='D').strftime('%d-%b-%Y %H:%M:%S.00')
+        odf.data.data_frame = pd.DataFrame({'SYTM_01': [f"'{t.upper()}'" for t in times],
+                                            'TEMP_01': [1.0, 2.0, 3.0, 4.0, 5.0]})
+        odf.data.parameter_list = ['SYTM_01', 'TEMP_01']
+        odf.data.print_formats = {'SYTM_01': '27', 'TEMP_01': '10.3'}
+        odf.update_odf()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'MTR.ODF')
+        odf.write_odf(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_split_by_month(self):
+        outputs = split_odf(self.path, by='month', chunk_rows=2)
+        self.assertEqual([os.path.basename(p) for p in outputs], ['MTR_2014-07.ODF', 'MTR_2014-08.ODF'])
+        august = OdfHeader().read_odf(outputs[1])
+        self.assertEqual(august.data.data_frame['TEMP_01'].tolist(), [3.0, 4.0, 5.0])
+        self.assertEqual(august.record_header.num_cycle, 3)
+        self.assertEqual(august.event_header.start_date_time, '01-AUG-2014 00:00:00.00')
+        self.assertEqual(august.parameter_headers[1].minimum_value, 3.0)
+
+    def test_split_by_rows(self):
+        outputs = split_odf(self.path, rows=2, output_folder=os.path.join(self.tmp_dir.name, 'parts'))
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(OdfHeader().read_odf(outputs[2]).record_header.num_cycle, 1)
+    def test_text_values(self):
+        odf = OdfHeader()
+        odf.parameter_headers.append(ParameterHeader(type='SYTM', code='SYTM_01', print_field_width=27,
+                                                     null_string=BaseHeader.SYTM_NULL_VALUE))
+        odf.parameter_headers.append(ParameterHeader(type='CHAR', code='FLAG_01', print_field_width=6,
+                                                     print_decimal_places=0))
+        odf.parameter_headers.append(ParameterHeader(type='INTE', code='CNTR_01', print_field_width=6,
+                                                     print_decimal_places=0))
+        times = pd.date_range('2014-07-30', periods=4, freq='D').strftime('%d-%b-%Y %H:%M:%S.00')
+        odf.data.data_frame = pd.DataFrame({'SYTM_01': [f"'{t.upper()}'" for t in times],
+                                            'FLAG_01': [1, 2, 3, 4], 'CNTR_01': [1, 2, 3, 4]})
+        odf.data.parameter_list = ['SYTM_01', 'FLAG_01', 'CNTR_01']
+        odf.data.print_formats = {'SYTM_01': '27', 'FLAG_01': '6.0', 'CNTR_01': '6.0'}
+        odf.update_odf()
+        odf.write_odf(self.path)
+        # The writer only formats numbers, so put the text values in by hand.
+        with open(self.path) as file:
+            text = file.read()
+        text = text.replace("     1      1\n", "    AB      1\n").replace("     3      3\n", "     C      x\n")
+        with open(self.path, 'w') as file:
+            file.write(text)
+        outputs = split_odf(self.path, by='month')
+        july, august = (OdfHeader().read_odf(path) for path in outputs)
+        self.assertEqual(july.data.data_frame['FLAG_01'].tolist()[0], 'AB')
+        self.assertEqual(july.parameter_headers[1].minimum_value, BaseHeader.NULL_VALUE)
+        counts = [(odf.parameter_headers[2].minimum_value, odf.parameter_headers[2].maximum_value)
+                  for odf in (july, august)]
+        self.assertEqual(counts, [(1, 2), (4, 4)])
+
+if __name__ == "__main__":
+    unittest.main()
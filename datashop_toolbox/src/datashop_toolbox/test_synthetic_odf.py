@@ -0,0 +1,61 @@
+import filecmp
+import os
+import tempfile
+import unittest
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.records import DataRecords
+from datashop_toolbox.row_index import read_rows
+from datashop_toolbox.synthetic_odf import generate_odf
+
+class TestSyntheticOdf(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.options = dict(rows=2500, parameters=['CNTR_01', 'PRES_01', 'TE90_01'], seed=7,
+                            null_fraction=0.1, quality_flags=True, history_blocks=2,
+                            calibration_blocks=1, comment_lines=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_same_file_for_any_chunk_size(self):
+        for version in (2.0, 3.0):
+            generate_odf(self.path('a.ODF'), version=version, chunk_rows=300, **self.options)
+            generate_odf(self.path('b.ODF'), version=version, chunk_rows=1000, **self.options)
+            self.assertTrue(filecmp.cmp(self.path('a.ODF'), self.path('b.ODF'), shallow=False))
+
+    def test_header_describes_the_data(self):
+        for version in (2.0, 3.0):
+            generate_odf(self.path('a.ODF'), version=version, **self.options)
+            odf = OdfHeader().read_odf(self.path('a.ODF'), header_only=True)
+            df = read_rows(self.path('a.ODF'), 0, 10000)
+            self.assertEqual(len(df), 2500)
+            self.assertEqual(odf.data_row_count(), 2500)
+            self.assertEqual(odf.get_parameter_codes(),
+                             ['SYTM_01', 'CNTR_01', 'PRES_01', 'QPRES_01', 'TE90_01', 'QTE90_01'])
+            self.assertEqual(len(odf.history_headers), 2)
+            self.assertEqual(len(odf.polynomial_cal_headers), 1)
+            pres = odf.parameter_headers[2]
+            valid = df['PRES_01'][df['PRES_01'] != BaseHeader.NULL_VALUE]
+            self.assertEqual(pres.number_null, 2500 - len(valid))
+            self.assertAlmostEqual(pres.minimum_value, valid.min())
+            self.assertAlmostEqual(pres.maximum_value, valid.max())
+            self.assertEqual(df['SYTM_01'].iloc[-1].strip("'"), odf.event_header.end_date_time)
+            BaseHeader.shared_log_list.clear()
+
+    def test_version_2_data_matches_the_toolbox_writer(self):
+        generate_odf(self.path('a.ODF'), version=2.0, **self.options)
+        odf = OdfHeader().read_odf(self.path('a.ODF'))
+        with open(self.path('a.ODF')) as file:
+            text = file.read()
+        records = DataRecords(data_frame=odf.data.data_frame, parameter_list=odf.data.parameter_list,
+                              print_formats=odf.data.print_formats)
+        self.assertEqual(text[text.index('-- DATA --\n') + 11:], records.print_object_old_style())
+
+if __name__ == "__main__":
+    unittest.main()
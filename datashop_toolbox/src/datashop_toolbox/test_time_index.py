@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.parameterhdr import ParameterHeader
+from datashop_toolbox.records import analyze_time_axis, parse_sytm, sampling_interval
+
+class TestTimeIndex(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.odf = OdfHeader()
+        for code, type in [('SYTM_01', 'SYTM'), ('TEMP_01', 'DOUB')]:
+            self.odf.parameter_headers.append(ParameterHeader(type=type, code=code))
+        times = pd.date_range('2014-07-12 05:45', periods=10, freq='h').strftime('%d-%b-%Y %H:%M:%S.00')
+        self.odf.data.data_frame = pd.DataFrame({'SYTM_01': [f"'{t.upper()}'" for t in times],
+                                                 'TEMP_01': [float(i) for i in range(10)]})
+        self.odf.data.parameter_list = ['SYTM_01', 'TEMP_01']
+
+    def test_between_is_inclusive(self):
+        window = self.odf.data.between('12-JUL-2014 07:45:00', '12-JUL-2014 09:45:00')
+        self.assertEqual(window['TEMP_01'].tolist(), [2.0, 3.0, 4.0])
+
+    def test_trim_updates_event_and_counts(self):
+        self.odf.trim(start='12-JUL-2014 08:00:00')
+        self.assertEqual(len(self.odf.data), 7)
+        self.assertEqual(self.odf.record_header.num_cycle, 7)
+        self.assertEqual(self.odf.event_header.start_date_time, '12-JUL-2014 08:45:00.00')
+        self.assertEqual(self.odf.event_header.end_date_time, '12-JUL-2014 14:45:00.00')
+
+    def test_unsorted_times_raise(self):
+        self.odf.data.data_frame = self.odf.data.data_frame.iloc[::-1]
+        with self.assertRaises(ValueError):
+            self.odf.data.between('12-JUL-2014 07:45:00', None)
+
+    def test_parse_sytm_matches_pandas(self):
+        values = ["'12-JUL-2014 05:45:00.00'", '29-feb-2024 23:59:59.5', '17-NOV-1858 00:00:00.000000',
+                  ' 01-Jan-2000 00:00:01.123456 ']
+        expected = pd.to_datetime(pd.Series(values).str.strip("' "), format=BaseHeader.SYTM_FORMAT).to_numpy()
+        np.testing.assert_array_equal(parse_sytm(values), expected)
+        with self.assertRaises(ValueError):
+            parse_sytm(['31-APR-2014 00:00:00.00'])
+
+    def test_sampling_interval_is_robust(self):
+        times = np.datetime64('2014-07-12T00:00') + np.array([0, 300, 300, 600, 450, 900, 1200, 1500, 5100], dtype='timedelta64[s]')
+        self.assertEqual(sampling_interval(times), 300.0)
+        report = analyze_time_axis(times, gap_factor=3.0)
+        self.assertFalse(report['sorted'])
+        self.assertEqual((report['backward_steps'], report['first_backward']), (1, 4))
+        self.assertEqual(report['duplicates'], 1)
+        self.assertEqual(report['gaps'], 1)
+        self.assertEqual(report['gap_seconds'].tolist(), [3600.0])
+        self.assertEqual(report['gap_starts'][0], np.datetime64('2014-07-12T00:25'))
+
+    def test_repair_time_axis(self):
+        df = self.odf.data.data_frame
+        self.odf.data.data_frame = pd.concat([df.iloc[[0, 2, 1]], df.iloc[[2]], df.iloc[3:]], ignore_index=True)
+        report = self.odf.repair_time_axis(deduplicate=True)
+        self.assertEqual((report['records'], report['duplicates'], report['moved'], report['removed']), (11, 1, 2, 1))
+        self.assertEqual(self.odf.data.data_frame['TEMP_01'].tolist(), [float(i) for i in range(10)])
+        self.assertTrue(self.odf.data.is_time_sorted())
+        self.assertEqual(self.odf.record_header.num_cycle, 10)
+        self.assertEqual(self.odf.event_header.sampling_interval, 3600.0)
+        self.assertEqual(self.odf.event_header.end_date_time, '12-JUL-2014 14:45:00.00')
+
+    def test_repair_updates_mtr_qualifier(self):
+        self.odf.event_header.data_type = 'MTR'
+        self.odf.event_header.event_qualifier2 = '1800'
+        self.odf.file_specification = self.odf.generate_file_spec()
+        self.odf.repair_time_axis()
+        self.assertEqual(self.odf.event_header.event_qualifier2, '3600')
+        self.assertTrue(self.odf.file_specification.endswith('_3600'))
+
+if __name__ == "__main__":
+    unittest.main()
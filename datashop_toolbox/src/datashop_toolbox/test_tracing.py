@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datashop_toolbox import tracing
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.odf_file = os.path.join(self.tmp_dir.name, 'a.ODF')
+        generate_odf(self.odf_file, rows=100, parameters=['PRES_01', 'TE90_01'])
+
+    def tearDown(self):
+        tracing.stop_trace()
+        self.tmp_dir.cleanup()
+
+    def test_nothing_recorded_when_not_tracing(self):
+        tracing.start_trace()
+        tracing.stop_trace()
+        with tracing.span('a.ODF', 'file'):
+            OdfHeader().read_odf(self.odf_file)
+        self.assertEqual(tracing.events(), [])
+
+    def test_nested_spans_per_thread(self):
+        @tracing.span('batch', 'batch')
+        def batch():
+            with tracing.span('a.ODF', 'file', number=1):
+                OdfHeader().read_odf(self.odf_file)
+
+        tracing.start_trace()
+        worker = threading.Thread(target=batch, name='worker-1')
+        worker.start()
+        worker.join()
+        trace_file = os.path.join(self.tmp_dir.name, 'trace.json')
+        tracing.stop_trace(trace_file)
+        with open(trace_file) as file:
+            trace_events = json.load(file)['traceEvents']
+
+        spans = {event['name']: event for event in trace_events if event['ph'] == 'X'}
+        self.assertEqual(spans['batch']['cat'], 'batch')
+        self.assertEqual(spans['a.ODF']['args'], {'number': 1})
+        self.assertEqual(spans['read_odf']['cat'], 'stage')
+        self.assertIn('data.tokenize', spans)
+        # The file span lies within the batch span and the stages within the file span.
+        for outer, inner in (('batch', 'a.ODF'), ('a.ODF', 'read_odf')):
+            self.assertLessEqual(spans[outer]['ts'], spans[inner]['ts'])
+            self.assertGreaterEqual(spans[outer]['ts'] + spans[outer]['dur'],
+                                    spans[inner]['ts'] + spans[inner]['dur'])
+        self.assertEqual({event['tid'] for event in spans.values()}, {worker.native_id})
+        self.assertIn({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': worker.native_id,
+                       'args': {'name': 'worker-1'}}, trace_events)
+
+    def test_add_events(self):
+        tracing.start_trace()
+        tracing.add_events([{'name': 'b.ODF', 'cat': 'file', 'ph': 'X', 'ts': 0, 'dur': 5,
+                             'pid': 1, 'tid': 2},
+                            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2,
+                             'args': {'name': 'MainThread'}}])
+        trace_events = tracing.stop_trace()
+        self.assertEqual(len(trace_events), 2)
+        self.assertEqual(trace_events[0]['name'], 'b.ODF')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import csv
+import os
+import re
+import tempfile
+import unittest
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.synthetic_odf import generate_odf
+from datashop_toolbox.validate_odf import validate_odf, validate_tree, write_report
+
+class TestValidateOdf(unittest.TestCase):
+
+    def setUp(self):
+        BaseHeader.shared_log_list.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_file(self, name, version=2.0):
+        path = os.path.join(self.tmp_dir.name, name)
+        generate_odf(path, rows=200, parameters=['PRES_01', 'TE90_01'], version=version, null_fraction=0.1)
+        return path
+
+    def corrupt(self, path):
+        with open(path) as file:
+            text = file.read()
+        text = re.sub(r"START_DATE = '[^']*'", "START_DATE = '2020-01-01'", text, count=1)
+        text = re.sub(r"NUM_CYCLE = \d+", "NUM_CYCLE = 150", text)
+        header, data = text.split('-- DATA --\n')
+        lines = data.splitlines()
+        lines[4] = lines[4].rsplit(maxsplit=1)[0]
+        lines[9] = re.sub(r'\d+\.\d+$', 'abc', lines[9])
+        with open(path, 'w') as file:
+            file.write(header + '-- DATA --\n' + '\n'.join(lines) + '\n')
+
+    def test_valid_files(self):
+        for version in (2.0, 3.0):
+            self.assertEqual(validate_odf(self.make_file(f'v{version}.ODF', version)), [])
+
+    def test_reports_every_problem(self):
+        path = self.make_file('bad.ODF')
+        self.corrupt(path)
+        problems = validate_odf(path)
+        checks = [item['check'] for item in problems]
+        for check in ('date_format', 'record_header', 'data_columns', 'data_type', 'read'):
+            self.assertIn(check, checks)
+        messages = '\n'.join(item['message'] for item in problems)
+        self.assertIn("CRUISE_HEADER.START_DATE '2020-01-01'", messages)
+        self.assertIn("NUM_CYCLE is 150 but the file has 200 data rows", messages)
+        self.assertIn("first data row 5 has 2", messages)
+        self.assertIn("TE90_01: 1 values are not", messages)
+
+    def test_validate_tree(self):
+        self.make_file('good.ODF')
+        self.corrupt(self.make_file('bad.odf'))
+        os.makedirs(os.path.join(self.tmp_dir.name, 'sub'))
+        self.make_file(os.path.join('sub', 'deep.ODF'))
+        results = validate_tree(self.tmp_dir.name, max_workers=2)
+        self.assertEqual(sorted(os.path.basename(path) for path in results), ['bad.odf', 'deep.ODF', 'good.ODF'])
+        invalid = [os.path.basename(path) for path, problems in results.items() if problems]
+        self.assertEqual(invalid, ['bad.odf'])
+
+        report_path = os.path.join(self.tmp_dir.name, 'problems.csv')
+        write_report(results, report_path)
+        with open(report_path, newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual({os.path.basename(row['file']) for row in rows}, {'bad.odf'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,6 @@ import glob
 import math
 import os
 import posixpath
-import pytz
 import re
 import sys
 import pandas as pd
@@ -12,18 +11,15 @@ from pathlib import Path
 from typing import ClassVar
 from difflib import SequenceMatcher
 
-from PyQt6.QtWidgets import (
-    QApplication
-)
-
 from datashop_toolbox.basehdr import BaseHeader
 from datashop_toolbox.validated_base import check_datetime, get_current_date_time
 from datashop_toolbox.odfhdr import OdfHeader
 from datashop_toolbox.parameterhdr import ParameterHeader
 from datashop_toolbox.historyhdr import HistoryHeader
 from datashop_toolbox.lookup_parameter import lookup_parameter
+from datashop_toolbox.metrics import timed
 from datashop_toolbox.qualityhdr import QualityHeader
-from datashop_toolbox import select_metadata_file_and_data_folder
+from datashop_toolbox.records import sampling_interval
 
 
 class ThermographHeader(OdfHeader):
@@ -79,22 +75,18 @@ class ThermographHeader(OdfHeader):
 
 
     def get_sampling_interval(self, df: pd.Series) -> float:
-        """ Compute the time interval between the first two date-time values. """
+        """
+        Compute the sampling interval in seconds: the median step between consecutive date-time
+        values over the whole series, so duplicated, out of order or missing samples do not change it.
+        Returns 0.0 when there is no positive step (a single sample or identical times).
+        """
         if 'date_time' in df.columns:
-            datetime1 = df['date_time'][0]
-            datetime2 = df['date_time'][1]
-            time_interval = datetime2 - datetime1
-            time_interval = float(time_interval.seconds)
+            times = pd.to_datetime(df['date_time']).to_numpy()
         else:
-            date1 = datetime.strptime(df['date'].iloc[0], ThermographHeader.date_format)
-            time1 = datetime.strptime(df['time'].iloc[0], ThermographHeader.time_format).time()
-            datetime1 = datetime.combine(date1, time1)
-            date2 = datetime.strptime(df['date'].iloc[1], ThermographHeader.date_format)
-            time2 = datetime.strptime(df['time'].iloc[1], ThermographHeader.time_format).time()
-            datetime2 = datetime.combine(date2, time2)
-            time_interval = datetime2 - datetime1
-            time_interval = float(time_interval.seconds)
-        return time_interval
+            times = pd.to_datetime(df['date'] + ' ' + df['time'],
+                                   format=f"{ThermographHeader.date_format} {ThermographHeader.time_format}").to_numpy()
+        interval = sampling_interval(times)
+        return 0.0 if math.isnan(interval) else interval
 
 
     def create_sytm(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -110,7 +102,7 @@ class ThermographHeader(OdfHeader):
             df['times'] = df['time'].map(lambda x: datetime.strptime(x, ThermographHeader.time_format).time())
             df['times'] = df['times'].astype("string")
             df['datetimes'] = df['dates'] + ' ' + df['times']
-            df = df.drop(columns=['date', 'time', 'dates', 'times'], axis=1)
+            df = df.drop(columns=['date', 'time', 'dates', 'times'])
             df['datetimes'] = pd.to_datetime(df['datetimes'])
             df['sytm'] = df['datetimes'].map(lambda x: datetime.strftime(x, BaseHeader.SYTM_FORMAT)).str.upper()
             df = df.drop('datetimes', axis=1)
@@ -521,6 +513,7 @@ class ThermographHeader(OdfHeader):
         return dfmeta
 
 
+    @timed("process_thermograph")
     def process_thermograph(self, institution_name: str, instrument_type: str, metadata_file_path: str, data_file_path: str, user_input_metadata: dict) -> None:
 
         if institution_name == 'FSRS':
@@ -732,6 +725,8 @@ def main():
     use_gui = False
 
     if use_gui:
+        from PyQt6.QtWidgets import QApplication
+        from datashop_toolbox import select_metadata_file_and_data_folder
 
         # Create the GUI to select the metadata file and data folder
         app = QApplication(sys.argv)
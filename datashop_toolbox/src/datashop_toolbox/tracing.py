@@ -0,0 +1,143 @@
+"""
+Timeline tracing of batch runs in the Chrome trace-event format.
+
+While a trace is running (start_trace(), or the DATASHOP_TRACE environment variable set to the
+output path) every pipeline stage timed by metrics.py is recorded as a span, together with the
+batch and file spans opened with span(). Each span keeps its process and thread id, so the spans
+of parallel workers appear as separate rows. write_trace() saves the spans as trace-event JSON
+that can be opened offline in ui.perfetto.dev or chrome://tracing.
+
+Worker processes record their own spans; return events() from the worker and pass the lists to
+add_events() in the parent to merge them into one trace.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from datashop_toolbox import metrics
+
+_tracing = False
+_lock = threading.Lock()
+_events: list = []
+_thread_names: dict = {}
+# Span start times are perf_counter() values; the anchors convert them to wall clock time,
+# which is comparable between processes.
+_perf_anchor = 0.0
+_wall_anchor = 0.0
+
+
+def start_trace() -> None:
+    """ Discard any earlier spans and start recording. """
+    global _tracing, _perf_anchor, _wall_anchor
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+        _perf_anchor = time.perf_counter()
+        _wall_anchor = time.time()
+    _tracing = True
+    metrics.set_span_hook(_stage_span)
+
+
+def stop_trace(trace_file_path: str | None = None) -> list:
+    """ Stop recording and return the spans, writing them to trace_file_path if given. """
+    global _tracing
+    _tracing = False
+    metrics.set_span_hook(None)
+    if trace_file_path:
+        write_trace(trace_file_path)
+    return events()
+
+
+def is_tracing() -> bool:
+    return _tracing
+
+
+def events() -> list:
+    """ Return the trace events recorded so far (including the thread name events). """
+    with _lock:
+        return list(_events) + [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+            for (pid, tid), name in _thread_names.items()]
+
+
+def add_events(trace_events: list) -> None:
+    """ Merge trace events recorded elsewhere, such as in a worker process. """
+    with _lock:
+        for event in trace_events:
+            if event.get('ph') == 'M':
+                _thread_names[(event['pid'], event['tid'])] = event['args']['name']
+            else:
+                _events.append(event)
+
+
+def write_trace(trace_file_path: str) -> None:
+    """ Write the trace events recorded so far as a trace-event JSON file. """
+    with open(trace_file_path, "w") as file:
+        json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms'}, file)
+
+
+def _record(name: str, category: str, start: float, seconds: float, args: dict | None) -> None:
+    thread = threading.current_thread()
+    pid = os.getpid()
+    tid = threading.get_native_id()
+    event = {
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': round((_wall_anchor + start - _perf_anchor) * 1e6, 1),
+        'dur': round(seconds * 1e6, 1),
+        'pid': pid,
+        'tid': tid,
+    }
+    if args:
+        event['args'] = args
+    with _lock:
+        _events.append(event)
+        _thread_names.setdefault((pid, tid), thread.name)
+
+
+def _stage_span(name: str, start: float, seconds: float) -> None:
+    if _tracing:
+        _record(name, 'stage', start, seconds, None)
+
+
+class span:
+    """
+    Record a span of a batch (category 'batch') or a file (category 'file') while tracing,
+    either as a context manager (with span(file_name, 'file'): ...) or as a function decorator.
+    Keyword arguments are shown with the span in the trace viewer.
+    """
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name: str, category: str = 'stage', **args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        if _tracing:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        if self.start is not None:
+            _record(self.name, self.category, self.start, time.perf_counter() - self.start, self.args)
+            self.start = None
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _tracing:
+                return function(*args, **kwargs)
+            with span(self.name, self.category, **self.args):
+                return function(*args, **kwargs)
+        return wrapper
+
+
+if os.environ.get('DATASHOP_TRACE'):
+    start_trace()
+    atexit.register(write_trace, os.environ['DATASHOP_TRACE'])
@@ -0,0 +1,390 @@
+"""
+Conformance validation of ODF files before they are loaded into ODF_ARCHIVE.
+
+validate_odf() checks one file and returns every problem found instead of stopping at the first:
+
+- required header blocks (ODF_HEADER, CRUISE_HEADER, EVENT_HEADER, RECORD_HEADER and at least
+  one PARAMETER_HEADER), repeated single blocks and the '-- DATA --' line;
+- date fields (*DATE*, and the values of SYTM parameters) against BaseHeader.SYTM_FORMAT;
+- parameter codes, types and null values;
+- the RECORD_HEADER counts (NUM_PARAM, NUM_CYCLE, NUM_HISTORY, NUM_CALIBRATION, NUM_SWING)
+  against the header blocks and the data rows;
+- the data rows: number of columns, values of the parameter type, and the null values found
+  against NUMBER_NULL and NUMBER_VALID;
+- whether read_odf(header_only=True) accepts the header.
+
+The header blocks are parsed as plain key/value lines and the data section is streamed in
+chunks, so files of any size are checked without building an OdfHeader with its data.
+validate_tree() checks a whole folder tree in parallel.
+
+Usage:
+    python -m datashop_toolbox.validate_odf archive_folder [--pattern *.ODF] [--workers N]
+                                            [--output problems.csv]
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from datashop_toolbox.basehdr import BaseHeader
+from datashop_toolbox.header_search import find_odf_files
+from datashop_toolbox.memory_budget import chunk_rows
+from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.validated_base import check_string, matches_datetime_format, read_header_lines
+
+DATA_MARKER = '-- DATA --'
+REQUIRED_HEADERS = ('ODF_HEADER', 'CRUISE_HEADER', 'EVENT_HEADER', 'RECORD_HEADER', 'PARAMETER_HEADER')
+SINGLE_HEADERS = ('ODF_HEADER', 'CRUISE_HEADER', 'EVENT_HEADER', 'INSTRUMENT_HEADER', 'METEO_HEADER',
+                  'QUALITY_HEADER', 'RECORD_HEADER')
+KNOWN_HEADERS = SINGLE_HEADERS + ('PARAMETER_HEADER', 'HISTORY_HEADER', 'GENERAL_CAL_HEADER',
+                                  'POLYNOMIAL_CAL_HEADER', 'COMPASS_CAL_HEADER')
+NUMERIC_TYPES = ('SING', 'DOUB', 'INTE')
+PARAMETER_TYPES = NUMERIC_TYPES + ('SYTM', 'CHAR')
+# RECORD_HEADER count fields and the header blocks they count.
+RECORD_COUNTS = {
+    'NUM_PARAM': ('PARAMETER_HEADER',),
+    'NUM_HISTORY': ('HISTORY_HEADER',),
+    'NUM_CALIBRATION': ('POLYNOMIAL_CAL_HEADER', 'GENERAL_CAL_HEADER'),
+    'NUM_SWING': ('COMPASS_CAL_HEADER',),
+}
+# Version 2 data values are separated by blanks; SYTM values are quoted and contain a blank.
+V2_TOKEN = re.compile(r"'[^']*'|\S+")
+
+
+def problem(check: str, message: str) -> dict:
+    return {'check': check, 'message': message}
+
+
+def parse_header_blocks(lines: list[str]) -> list[tuple[str, list[tuple[str, str]]]]:
+    """ Split header lines into [(block name, [(KEY, value), ...]), ...] without validating the values. """
+    blocks = []
+    for line in lines:
+        text = line.strip(" ,")
+        if text == DATA_MARKER:
+            break
+        if text.endswith('_HEADER') and '=' not in text:
+            blocks.append((text, []))
+        elif blocks and '=' in text:
+            key, value = text.split('=', maxsplit=1)
+            blocks[-1][1].append((key.strip().upper(), value.strip(" '")))
+    return blocks
+
+
+def _to_int(value: str) -> int | None:
+    try:
+        return int(float(check_string(value)))
+    except ValueError:
+        return None
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(check_string(value))
+    except ValueError:
+        return None
+
+
+def check_headers(blocks: list, has_marker: bool) -> tuple[list, list]:
+    """
+    Check the header blocks. Returns the problems and the parameters found as
+    [{'code', 'type', 'null', 'number_valid', 'number_null'}, ...] in column order.
+    """
+    problems = []
+    counts = {}
+    for name, _ in blocks:
+        counts[name] = counts.get(name, 0) + 1
+    for name in REQUIRED_HEADERS:
+        if name not in counts:
+            problems.append(problem('required_header', f"{name} is missing"))
+    for name in SINGLE_HEADERS:
+        if counts.get(name, 0) > 1:
+            problems.append(problem('required_header', f"{name} appears {counts[name]} times"))
+    for name in sorted(counts.keys() - set(KNOWN_HEADERS)):
+        problems.append(problem('required_header', f"unknown header block {name}"))
+    if not has_marker:
+        problems.append(problem('required_header', f"the '{DATA_MARKER}' line is missing"))
+
+    parameters = []
+    for name, fields in blocks:
+        values = dict(fields)
+        label = name
+        if name == 'ODF_HEADER' and 'FILE_SPECIFICATION' not in values:
+            problems.append(problem('required_header', "ODF_HEADER has no FILE_SPECIFICATION"))
+        if name == 'PARAMETER_HEADER':
+            code = values.get('CODE') or values.get('WMO_CODE', '')
+            label = f"PARAMETER_HEADER {code or len(parameters) + 1}"
+            parameter = {'code': code, 'type': values.get('TYPE', '').upper(), 'null': None,
+                         'number_valid': _to_int(values['NUMBER_VALID']) if 'NUMBER_VALID' in values else None,
+                         'number_null': _to_int(values['NUMBER_NULL']) if 'NUMBER_NULL' in values else None}
+            parameters.append(parameter)
+            if not code:
+                problems.append(problem('parameter', f"{label} has no CODE"))
+            if parameter['type'] not in PARAMETER_TYPES:
+                problems.append(problem('parameter', f"{label} has unknown TYPE '{values.get('TYPE', '')}'"))
+            null_value = values.get('NULL_VALUE', '')
+            if parameter['type'] == 'SYTM':
+                parameter['null'] = null_value or None
+                date_fields = [key for key in ('NULL_VALUE', 'MINIMUM_VALUE', 'MAXIMUM_VALUE') if values.get(key)]
+            else:
+                date_fields = []
+                if parameter['type'] in NUMERIC_TYPES and null_value:
+                    parameter['null'] = _to_float(null_value)
+                    if parameter['null'] is None:
+                        problems.append(problem('parameter', f"{label}.NULL_VALUE '{null_value}' is not a number"))
+        else:
+            date_fields = []
+        date_fields += [key for key, _ in fields if 'DATE' in key and key not in date_fields]
+        for key in date_fields:
+            if not matches_datetime_format(values[key], BaseHeader.SYTM_FORMAT):
+                problems.append(problem('date_format', f"{label}.{key} '{values[key]}' is not in SYTM format "
+                                                       f"(DD-MON-YYYY HH:MM:SS.FF)"))
+
+    codes = [parameter['code'] for parameter in parameters if parameter['code']]
+    for code in sorted({code for code in codes if codes.count(code) > 1}):
+        problems.append(problem('parameter', f"parameter code {code} is used {codes.count(code)} times"))
+
+    record = next((dict(fields) for name, fields in blocks if name == 'RECORD_HEADER'), None)
+    if record is not None:
+        for key, headers in RECORD_COUNTS.items():
+            if key not in record:
+                if key == 'NUM_PARAM':
+                    problems.append(problem('record_header', f"RECORD_HEADER has no {key}"))
+                continue
+            expected = sum(counts.get(name, 0) for name in headers)
+            value = _to_int(record[key])
+            if value != expected:
+                problems.append(problem('record_header', f"RECORD_HEADER.{key} is {record[key]} but the file has "
+                                                         f"{expected} {' + '.join(headers)} blocks"))
+    return problems, parameters
+
+
+class _ColumnCheck:
+    """ Running counts of the bad and null values of one data column. """
+
+    def __init__(self, parameter: dict):
+        self.code = parameter['code']
+        self.type = parameter['type']
+        self.null = parameter['null']
+        if self.type == 'SYTM' and self.null is not None:
+            self.null = pd.to_datetime(self.null, format=BaseHeader.SYTM_FORMAT, errors='coerce')
+        self.bad = 0
+        self.first_bad = None
+        self.nulls = 0
+
+    def update(self, values: list, first_row: int) -> None:
+        text = pd.Series([value.strip("' ") for value in values], dtype=object)
+        if self.type == 'SYTM':
+            times = pd.to_datetime(text, format=BaseHeader.SYTM_FORMAT, errors='coerce')
+            bad = times.isna().to_numpy()
+            if self.null is not None and not pd.isna(self.null):
+                self.nulls += int((times == self.null).sum())
+        elif self.type in NUMERIC_TYPES:
+            numbers = pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+            nan_text = text.str.lower().eq('nan').to_numpy()
+            bad = np.isnan(numbers) & ~nan_text
+            if self.type == 'INTE':
+                bad |= ~np.isnan(numbers) & (np.mod(numbers, 1) != 0)
+            nulls = nan_text
+            if self.null is not None:
+                nulls = nulls | np.isclose(numbers, self.null)
+            self.nulls += int(nulls.sum())
+        else:
+            return
+        if bad.any():
+            if self.first_bad is None:
+                index = int(np.argmax(bad))
+                self.first_bad = (first_row + index, values[index])
+            self.bad += int(bad.sum())
+
+
+def _tokenize(lines: list[bytes], version: float) -> list[list[str]]:
+    text = [line.decode("iso-8859-1").strip() for line in lines]
+    if version >= 3:
+        return list(csv.reader(text, quotechar="'"))
+    return [V2_TOKEN.findall(line) for line in text]
+
+
+def check_data(odf_file_path: str, offset: int, version: float, parameters: list) -> tuple[list, int]:
+    """ Stream the data section and check it against the parameters. Returns the problems and the row count. """
+    problems = []
+    codes = [parameter['code'] for parameter in parameters]
+    columns = [_ColumnCheck(parameter) for parameter in parameters]
+    rows = 0
+    wrong_width = 0
+    first_wrong = None
+    rows_per_chunk = chunk_rows(len(parameters))
+
+    def check_chunk(lines: list) -> None:
+        nonlocal rows, wrong_width, first_wrong
+        good = []
+        for i, tokens in enumerate(_tokenize(lines, version)):
+            if len(tokens) == len(codes):
+                good.append(tokens)
+            else:
+                wrong_width += 1
+                if first_wrong is None:
+                    first_wrong = (rows + i + 1, len(tokens))
+        if good:
+            for column, values in zip(columns, zip(*good)):
+                column.update(list(values), rows + 1)
+        rows += len(lines)
+
+    with open(odf_file_path, "rb") as file:
+        file.seek(offset)
+        column_names = version >= 3
+        lines = []
+        for line in file:
+            if not line.strip():
+                continue
+            if column_names:
+                column_names = False
+                names = [name.strip(" '") for name in line.decode("iso-8859-1").strip().split(',')]
+                if names != codes:
+                    problems.append(problem('data_columns', f"the data column names {names} do not match "
+                                                            f"the parameter codes {codes}"))
+                continue
+            lines.append(line)
+            if len(lines) == rows_per_chunk:
+                check_chunk(lines)
+                lines = []
+        if lines:
+            check_chunk(lines)
+
+    if wrong_width:
+        problems.append(problem('data_columns', f"{wrong_width} data rows do not have {len(codes)} values, "
+                                                f"first data row {first_wrong[0]} has {first_wrong[1]}"))
+    for column, parameter in zip(columns, parameters):
+        if column.bad:
+            row, value = column.first_bad
+            problems.append(problem('data_type', f"{column.code}: {column.bad} values are not {column.type}, "
+                                                 f"first in data row {row}: {value!r}"))
+        if column.type not in NUMERIC_TYPES + ('SYTM',):
+            continue
+        checked = rows - wrong_width
+        if parameter['number_null'] is not None and parameter['number_null'] != column.nulls:
+            problems.append(problem('null_values', f"{column.code}: NUMBER_NULL is {parameter['number_null']} "
+                                                   f"but the data has {column.nulls} null values"))
+        if parameter['number_valid'] is not None and parameter['number_valid'] != checked - column.nulls:
+            problems.append(problem('null_values', f"{column.code}: NUMBER_VALID is {parameter['number_valid']} "
+                                                   f"but the data has {checked - column.nulls} valid values"))
+    return problems, rows
+
+
+def validate_odf(odf_file_path: str, check_read: bool = True) -> list[dict]:
+    """
+    Check one ODF file against the ODF specification.
+
+    Parameters
+    ----------
+    odf_file_path: str
+        The ODF file to check.
+    check_read: bool
+        Also check that read_odf(header_only=True) accepts the header.
+
+    Returns
+    -------
+    list
+        One {'check': name, 'message': text} dictionary per problem; empty if the file is valid.
+    """
+    assert isinstance(odf_file_path, str), "Input argument 'odf_file_path' must be a string."
+    lines, offset = read_header_lines(odf_file_path)
+    if not lines:
+        return [problem('required_header', "the file is empty")]
+    has_marker = lines[-1].strip(" ,") == DATA_MARKER
+    blocks = parse_header_blocks(lines)
+    problems, parameters = check_headers(blocks, has_marker)
+
+    if has_marker and parameters and all(parameter['code'] for parameter in parameters):
+        version = 2.0 if lines[0].endswith(',') else 3.0
+        data_problems, rows = check_data(odf_file_path, offset, version, parameters)
+        problems += data_problems
+        record = next((dict(fields) for name, fields in blocks if name == 'RECORD_HEADER'), {})
+        if 'NUM_CYCLE' in record and _to_int(record['NUM_CYCLE']) != rows:
+            problems.append(problem('record_header', f"RECORD_HEADER.NUM_CYCLE is {record['NUM_CYCLE']} "
+                                                     f"but the file has {rows} data rows"))
+
+    if check_read:
+        try:
+            with warnings.catch_warnings():
+                # The header classes warn about the ambiguous dates already reported above.
+                warnings.simplefilter('ignore')
+                OdfHeader().read_odf(odf_file_path, header_only=True)
+        except Exception as e:
+            message = str(e).strip().splitlines()[0] if str(e).strip() else ''
+            problems.append(problem('read', f"read_odf fails: {type(e).__name__}: {message}"))
+        finally:
+            BaseHeader.reset_log_list()
+    return problems
+
+
+def _validate_job(job: tuple) -> tuple:
+    odf_file_path, check_read = job
+    try:
+        return odf_file_path, validate_odf(odf_file_path, check_read)
+    except Exception as e:
+        return odf_file_path, [problem('read', f"{type(e).__name__}: {e}")]
+
+
+def validate_tree(folder: str, pattern: str = "*.ODF", recursive: bool = True, check_read: bool = True,
+                  max_workers: int | None = None) -> dict:
+    """
+    Validate every ODF file below folder in parallel.
+    Returns {file path: list of problems}, with an empty list for valid files.
+    """
+    files = find_odf_files(folder, pattern, recursive)
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        jobs = [(path, check_read) for path in files]
+        for odf_file_path, problems in executor.map(_validate_job, jobs, chunksize=8):
+            results[odf_file_path] = problems
+    return results
+
+
+def write_report(results: dict, report_file_path: str) -> None:
+    """ Write the problems as CSV (file, check, message), or as JSON if the path ends with .json. """
+    if report_file_path.lower().endswith('.json'):
+        with open(report_file_path, 'w') as file:
+            json.dump(results, file, indent=2)
+        return
+    with open(report_file_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['file', 'check', 'message'])
+        for odf_file_path, problems in results.items():
+            for item in problems:
+                writer.writerow([odf_file_path, item['check'], item['message']])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a folder tree of ODF files against the ODF specification.")
+    parser.add_argument("folder", help="folder containing the ODF files (searched recursively)")
+    parser.add_argument("--pattern", default="*.ODF", help="file name pattern, ignoring case (default *.ODF)")
+    parser.add_argument("--no-recursive", action="store_true", help="only check the files directly in folder")
+    parser.add_argument("--no-read-check", action="store_true", help="do not try read_odf on each header")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--output", help="write the problems to this CSV (or .json) file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = validate_tree(args.folder, args.pattern, not args.no_recursive, not args.no_read_check,
+                            args.workers)
+    elapsed = time.perf_counter() - start
+    invalid = 0
+    for odf_file_path, problems in results.items():
+        if problems:
+            invalid += 1
+            print(odf_file_path)
+            for item in problems:
+                print(f"  [{item['check']}] {item['message']}")
+    if args.output:
+        write_report(results, args.output)
+    print(f"{invalid} of {len(results)} files have problems ({elapsed:.1f} s)")
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
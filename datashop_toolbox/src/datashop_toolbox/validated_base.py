@@ -3,12 +3,14 @@ from __future__ import annotations
 import re
 import shlex
 from datetime import datetime
-from typing import Any, get_type_hints
+from typing import Any, Self, get_type_hints
 
 import pandas as pd
-from pydantic import BaseModel, field_validator, ValidationInfo
+from pydantic import BaseModel, PrivateAttr, field_validator, ValidationInfo
 from datashop_toolbox.basehdr import BaseHeader
 
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
 
 class ValidatedBase(BaseModel):
     """Base model providing validation/normalization similar to old check_* functions."""
@@ -17,6 +19,64 @@ class ValidatedBase(BaseModel):
         "extra": "allow"
     }
 
+    # Rendered header text keyed by print_object() arguments; see render_cached().
+    _render_cache: dict = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Assign a field and drop the cached header text if the value actually changed."""
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        old_value = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        new_value = self.__dict__.get(name)
+        if new_value is old_value:
+            return
+        # Only plain values are compared; frames, lists and nested headers could be costly to compare.
+        if isinstance(old_value, _SCALAR_TYPES) and isinstance(new_value, _SCALAR_TYPES) \
+                and old_value == new_value:
+            return
+        self.invalidate_render_cache()
+
+    def invalidate_render_cache(self) -> None:
+        """Forget any cached print_object() text for this header."""
+        if self.__pydantic_private__ is not None:
+            self._render_cache.clear()
+
+    def _mutable_snapshot(self) -> tuple:
+        """Snapshot list fields, which can change in place without an assignment."""
+        return tuple(
+            tuple(value) for name in type(self).model_fields
+            if isinstance(value := self.__dict__.get(name), list)
+        )
+
+    def render_cached(self, *args) -> str:
+        """
+        Return print_object(*args), reusing the previous text when no field has changed.
+        Scalar fields invalidate the cache on assignment; list fields (comments, processes,
+        coefficients, ...) are compared against a snapshot since they are often appended to in place.
+        """
+        snapshot = self._mutable_snapshot()
+        cached = self._render_cache.get(args)
+        if cached is not None and cached[0] == snapshot:
+            return cached[1]
+        text = self.print_object(*args)
+        self._render_cache[args] = (snapshot, text)
+        return text
+
+    def clone(self) -> Self:
+        """
+        Return a cheap copy of this model. Immutable field values and cached header text are
+        shared; list fields are copied so in-place edits on the clone do not leak back.
+        """
+        new = self.model_copy()
+        for name in type(self).model_fields:
+            value = new.__dict__.get(name)
+            if isinstance(value, list):
+                new.__dict__[name] = list(value)
+        new._render_cache = dict(self._render_cache)
+        return new
+
     # --- Validators ---
     @field_validator("*", mode="before")
     @classmethod
@@ -188,6 +248,32 @@ def read_file_lines(file_with_path: str) -> list[str]:
         return []
 
 
+def read_header_lines(file_with_path: str, data_marker: str = '-- DATA --') -> tuple[list[str], int]:
+    """
+    Read only the header section of an ODF file, stopping at the data marker line.
+    Returns the stripped non-empty lines (including the marker line) and the byte offset at
+    which the data section starts. If there is no marker the offset is the file size.
+    """
+    if not isinstance(file_with_path, str):
+        raise TypeError(f"'file_with_path' must be str, got {type(file_with_path).__name__}")
+    lines = []
+    marker = data_marker.encode("iso-8859-1")
+    with open(file_with_path, "rb") as file:
+        while line := file.readline():
+            if line.strip():
+                lines.append(line.decode("iso-8859-1").strip())
+            if marker in line:
+                break
+        return lines, file.tell()
+
+
+def count_data_lines(file_with_path: str, offset: int = 0) -> int:
+    """Count the non-empty lines of a file starting at a byte offset, without decoding them."""
+    with open(file_with_path, "rb") as file:
+        file.seek(offset)
+        return sum(1 for line in file if line.strip())
+
+
 def find_lines_with_text(odf_file_lines: list[str], substrings: list[str]) -> list[tuple[int, str]]:
     """
     Find all lines containing any of the given substrings.
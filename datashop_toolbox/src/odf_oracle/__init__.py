@@ -9,9 +9,10 @@ from odf_oracle.general_cal_equation_to_oracle import general_cal_equation_to_or
 from odf_oracle.general_cal_to_oracle import general_cal_to_oracle
 from odf_oracle.history_to_oracle import history_to_oracle
 from odf_oracle.instrument_to_oracle import instrument_to_oracle
+from odf_oracle.memory_connection import MemoryConnection
 from odf_oracle.meteo_comments_to_oracle import meteo_comments_to_oracle
 from odf_oracle.meteo_to_oracle import meteo_to_oracle
-from odf_oracle.odf_to_oracle import odf_to_oracle
+from odf_oracle.odf_to_oracle import load_odf, odf_to_oracle
 from odf_oracle.polynomial_cal_to_oracle import polynomial_cal_to_oracle
 from odf_oracle.quality_to_oracle import quality_to_oracle
 from odf_oracle.quality_comments_to_oracle import quality_comments_to_oracle
@@ -22,9 +23,8 @@ __all__ = ['compass_cal_to_oracle', 'cruise_event_to_oracle', 'data_to_oracle',
            'event_comments_to_oracle', 'fix_null', 
            'general_cal_comments_to_oracle', 'general_cal_equation_to_oracle',
            'general_cal_to_oracle', 'history_to_oracle', 
-           'instrument_to_oracle', 'meteo_comments_to_oracle', 
+           'instrument_to_oracle', 'load_odf', 'MemoryConnection',
+           'meteo_comments_to_oracle', 
            'meteo_to_oracle', 'odf_to_oracle', 'polynomial_cal_to_oracle', 
            'quality_to_oracle', 'quality_comments_to_oracle', 
            'quality_tests_to_oracle', 'sytm_to_timestamp']
-
-print("odf_oracle package imported successfully!")
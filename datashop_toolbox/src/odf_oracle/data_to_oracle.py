@@ -1,7 +1,12 @@
+from itertools import islice, repeat
+import pandas as pd
+from datashop_toolbox.memory_budget import chunk_rows, track_stage
+from datashop_toolbox.metrics import count, timed
 from datashop_toolbox.odfhdr import OdfHeader
 from datashop_toolbox.remove_parameter import remove_parameter
 from odf_oracle.sytm_to_timestamp import sytm_to_timestamp
 
+@track_stage("data_to_oracle")
 def data_to_oracle(odfobj: OdfHeader, connection, infile: str):
     """
     Load the data records from an OdfHeader object into Oracle.
@@ -33,52 +38,55 @@ def data_to_oracle(odfobj: OdfHeader, connection, infile: str):
         # Remove the FFFF parameter if it is present since it contains no added value.
         odfobj = remove_parameter(odfobj, 'FFFF_01')
 
-        # Retrieve the Parameter Headers from the input ODF structure.
-        parameter_headers = odfobj.parameter_headers
-        parameter_codes = odfobj.get_parameter_codes()
+        # Work on the parameter headers as columns rather than one object at a time.
+        parameter_table = odfobj.parameter_table()
+        parameter_codes = parameter_table.codes
 
         print(parameter_codes)
 
-        # Check if there is SYTM column.
-        if 'SYTM_01' in parameter_codes or 'SYTM' in parameter_codes:
-            sytm_present = 1
-            sytm_index = [i for i,pcode in enumerate(parameter_codes) if pcode[0:4] == 'SYTM']
-            sytm_index = sytm_index[0]
-        else:
-            sytm_present = 0
-
         # Retrieve the data from the input ODF structure.
         data = odfobj.data.data_frame
 
         # Get the number of data rows and columns.
         nrows, ncols = data.shape
 
+        # If there is a SYTM parameter column then convert each record's date/time to a
+        # TIMESTAMP once for all parameters; otherwise the sample time is None.
+        sytm_codes = [pcode for pcode in parameter_codes if pcode[0:4] == 'SYTM']
+        if sytm_codes:
+            # The SYTM strings may be enclosed in single quotes; these must be removed prior
+            # to converting the date/time to a Python timestamp.
+            with timed("oracle.sample_times"):
+                sample_times = [sytm_to_timestamp(str(sytm).strip("\'"), 'datetime')
+                                for sytm in data[sytm_codes[0]].tolist()]
+        else:
+            sample_times = [None] * nrows
+        row_numbers = range(1, nrows + 1)
+
+        # Insert at most this many rows per executemany() call to stay within the memory budget.
+        rows_per_batch = chunk_rows(8, default=max(nrows, 1))
+
         null_params = list()
 
-        # Cycle through all the parameter headers.
-        # Check to see if the ODF file contains a SYTM channel.
-        # Check to see if the ODF file contains at least one QF channel.
-        for j, parameter_header in enumerate(parameter_headers):
+        cursor.prepare(
+        "INSERT INTO ODF_DATA (PARAMETER_CODE, SENSOR_NUMBER, ROW_NUMBER, "
+        "PARAMETER_VALUE, QUALITY_FLAG, SAMPLE_TIME, "
+        "INST_ID, ODF_FILENAME) VALUES (:1, :2, :3, :4, :5, :6, :7, :8)")
 
-            parameter_code = parameter_header.code
-            parameter_code_short, sensor_number = parameter_code.split("_")
-            if sensor_number == '':
-                sensor_number = 1
-            else:
-                sensor_number = float(sensor_number)
-
-            # If the current column is a QF column then skip this column as 
-            # the associate value from a QF column is assigned in the data row.
-            if parameter_code[0] == 'Q' and parameter_code != 'QCFF_01':
-                continue
-            elif parameter_code == 'SYTM_01' or parameter_code == 'SYTM':
-                continue
-            # else:
-            #     # Capture the parameter names in the array "param".
-            #     param.append(parameter_code)
+        # Skip the QF columns, whose values are loaded with their parameter's rows, and the
+        # SYTM columns; take the sensor numbers from the code suffixes (1 when there is none).
+        codes = parameter_table.frame['code']
+        skipped = (codes.str.startswith('Q') & (codes != 'QCFF_01')) | codes.isin(['SYTM_01', 'SYTM'])
+        sensor_numbers = pd.to_numeric(codes.str.partition('_')[2], errors='coerce').fillna(1.0)
+
+        # Cycle through the parameter columns to load.
+        for j, parameter_code, sensor_number in zip(codes.index[~skipped], codes[~skipped],
+                                                    sensor_numbers[~skipped]):
+
+            column = data[parameter_code]
 
             # Notify user when a data column only contains null values.
-            if data.loc[:, parameter_code].isnull().all():
+            if column.isnull().all():
 
                 # Remember parameters to be removed.
                 null_params.append(j)
@@ -88,58 +96,26 @@ def data_to_oracle(odfobj: OdfHeader, connection, infile: str):
                 print(f'Should the data for {parameter_code} be deleted from '
                       'the ODF structure since it only contains NULL values?')
 
-            qf = 0
-            dobj = []
-            
-            # Loop through the data records. 
-            for r in range(0, nrows):
-
-                # If there is a SYTM parameter column then add the appropriate 
-                # TIMESTAMP to each data record; otherwise assign it as None.
-                if sytm_present:
-                    # NUMPY arrays containing the SYTM character arrays enclose 
-                    # them with single quotes; therefore the single quotes 
-                    # must be removed prior to converting the date/time to a 
-                    # Python timestamp.
-                    sample_time = sytm_to_timestamp(
-                        data.loc[r].iloc[sytm_index].strip("\'"), 'datetime')
-                else:
-                    sample_time = None
-
-                # Check for a quality field associated with the current 
-                # parameter. If there is one then load it into Oracle; 
-                # otherwise assign a quality flag as 0.
-                if f"Q{parameter_code}" in parameter_codes:
-                    qf_index = [i for i,pcode in enumerate(parameter_codes) 
-                                if pcode == f"Q{parameter_code}"]
-                    qf_index = qf_index[0]
-                    qf = int(data.loc[r].iloc[qf_index])
-                else:
-                    qf = 0
-
-                # Handle Null values "-99" in the original data that were 
-                # converted to 'None' strings. Replace the 'None' string with 
-                # the Python None value which gets handled correctly by 
-                # oracledb where the None string does not.
-                # if data[r, c] == 'None':
-                #     dobj.append((paramcode, sn, r + 1, None, qf, st, inst_id, infile))
-                # else:
-                    # If the column after the current column is a QQQQ field then asytm_indexign
-                    # load the value from the QQQQ column as the current data value's
-                    # quality flag.
-                dobj.append((parameter_code, sensor_number, r + 1,
-                             float(data.loc[r].iloc[j]), qf, sample_time, 
-                             inst_id, infile))
+            # Check for a quality field associated with the current parameter. If there is
+            # one then load its flags into Oracle; otherwise assign a quality flag of 0.
+            if f"Q{parameter_code}" in parameter_codes:
+                quality_flags = [int(qf) for qf in data[f"Q{parameter_code}"].tolist()]
+            else:
+                quality_flags = repeat(0, nrows)
+
+            values = (float(value) for value in column.tolist())
+            records = zip(repeat(parameter_code, nrows), repeat(sensor_number, nrows),
+                          row_numbers, values, quality_flags, sample_times,
+                          repeat(inst_id, nrows), repeat(infile, nrows))
 
             # Execute the Insert SQL statement.
-            cursor.prepare(
-            "INSERT INTO ODF_DATA (PARAMETER_CODE, SENSOR_NUMBER, ROW_NUMBER, "
-            "PARAMETER_VALUE, QUALITY_FLAG, SAMPLE_TIME, "
-            "INST_ID, ODF_FILENAME) VALUES (:1, :2, :3, :4, :5, :6, :7, :8)")
-            cursor.executemany(None, dobj)
+            while dobj := list(islice(records, rows_per_batch)):
+                with timed("oracle.execute"):
+                    cursor.executemany(None, dobj)
+                count("oracle.rows", len(dobj))
 
             # Commit the changes to the database.
             connection.commit()
 
-        print(f"The # of data rows for '{infile}' loaded = {len(dobj)}")
+        print(f"The # of data rows for '{infile}' loaded = {nrows}")
         print('Data successfully loaded into Oracle.')
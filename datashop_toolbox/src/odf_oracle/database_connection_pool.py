@@ -1,6 +1,4 @@
-import oracledb
 import os
-from dotenv import load_dotenv
 
 def init_session(connection, requested_tag):
     """Modify some settings of the Oracle connection."""
@@ -14,6 +12,10 @@ def init_session(connection, requested_tag):
 
 def get_database_pool():
 
+    # oracledb is only imported when a connection is needed.
+    import oracledb
+    from dotenv import load_dotenv
+
     load_dotenv(r'C:\Users\JacksonJ\OneDrive - DFO-MPO\Documents\.env')
     username = os.environ.get("ODF_ARCHIVE_USERNAME")
     userpwd = os.environ.get("ODF_ARCHIVE_PASSWORD")
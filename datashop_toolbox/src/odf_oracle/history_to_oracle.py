@@ -1,4 +1,3 @@
-from icecream import ic
 
 from datashop_toolbox.odfhdr import OdfHeader
 from odf_oracle.sytm_to_timestamp import sytm_to_timestamp
@@ -0,0 +1,65 @@
+import re
+
+
+class MemoryCursor:
+    """ Cursor of a MemoryConnection; records statements and bound rows instead of sending them. """
+
+    def __init__(self, connection: "MemoryConnection"):
+        self.connection = connection
+        self.statement = None
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self.statement = None
+
+    def prepare(self, statement: str) -> None:
+        self.statement = statement
+
+    def execute(self, statement: str | None = None, parameters=None) -> None:
+        statement = statement or self.statement
+        self.connection.record(statement, 1 if parameters is not None else 0)
+        # Lookups such as the instrument id get a single placeholder row.
+        self.results = [(1,)] if statement.lstrip().upper().startswith('SELECT') else []
+
+    def executemany(self, statement: str | None, parameters: list) -> None:
+        statement = statement or self.statement
+        parameters = list(parameters)
+        self.connection.record(statement, len(parameters))
+
+    def fetchall(self) -> list:
+        return list(self.results)
+
+
+class MemoryConnection:
+    """
+    Stand-in for an oracledb connection, used to run the odf_oracle loaders without a database.
+
+    Nothing is stored apart from the number of statements and bound rows per table, which are
+    available in the statements and rows dictionaries.
+    """
+
+    def __init__(self):
+        self.statements = {}
+        self.rows = {}
+        self.commits = 0
+
+    def cursor(self) -> MemoryCursor:
+        return MemoryCursor(self)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def close(self) -> None:
+        pass
+
+    def record(self, statement: str, rows: int) -> None:
+        match = re.search(r"\b(?:INTO|FROM|UPDATE)\s+(\w+)", statement, flags=re.IGNORECASE)
+        table = match.group(1).upper() if match else ''
+        self.statements[table] = self.statements.get(table, 0) + 1
+        self.rows[table] = self.rows.get(table, 0) + rows
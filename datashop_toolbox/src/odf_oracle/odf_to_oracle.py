@@ -1,8 +1,9 @@
 import os
 import glob
-from dotenv import load_dotenv
 
+from datashop_toolbox.metrics import count, timed
 from datashop_toolbox.odfhdr import OdfHeader
+from datashop_toolbox.tracing import span
 from odf_oracle.database_connection_pool import get_database_pool
 from odf_oracle.cruise_event_to_oracle import cruise_event_to_oracle
 from odf_oracle.event_comments_to_oracle import event_comments_to_oracle
@@ -19,6 +20,49 @@ from odf_oracle.general_cal_to_oracle import general_cal_to_oracle
 from odf_oracle.data_to_oracle import data_to_oracle
 
 
+# The loaders run by load_odf() after cruise_event_to_oracle(), in order.
+ODF_LOADERS = (event_comments_to_oracle, meteo_to_oracle, meteo_comments_to_oracle,
+               quality_to_oracle, quality_tests_to_oracle, quality_comments_to_oracle,
+               instrument_to_oracle, general_cal_to_oracle, polynomial_cal_to_oracle,
+               compass_cal_to_oracle, history_to_oracle, data_to_oracle)
+
+
+def load_odf(odf: OdfHeader, connection, filename: str) -> str:
+    """
+    Load one OdfHeader object into the ODF_ARCHIVE Oracle database.
+
+    Parameters
+    ----------
+    odf: OdfHeader
+      The ODF object to be loaded; its null data values are changed to empty strings.
+    connection: oracledb connection
+      Oracle database connection object.
+    filename: str
+      Name of the ODF file the object was read from.
+
+    Returns
+    -------
+    str
+      The ODF file name the records were loaded under.
+    """
+
+    # Change all null values to empty strings.
+    odf.data.data_frame = odf.null2empty(odf.data.data_frame)
+
+    # Load the Cruise_Header and Event_Header information first; it gives the file name
+    # the other headers and the data are loaded under.
+    with timed("oracle.cruise_event_to_oracle"):
+      odf_file = cruise_event_to_oracle(odf, connection, filename)
+
+    for loader in ODF_LOADERS:
+      with timed(f"oracle.{loader.__name__}"):
+        loader(odf, connection, odf_file)
+
+    count("oracle.files")
+    return odf_file
+
+
+@span('odf_to_oracle', 'batch')
 def odf_to_oracle(wildcard: str, user: str, password: str, oracle_host: str,
                   oracle_service_name: str, mypath: str) -> None:
     """
@@ -66,53 +110,13 @@ def odf_to_oracle(wildcard: str, user: str, password: str, oracle_host: str,
     
       print(f'\nWorking on loading ODF file << {filename} >>:')
 
-      odf = OdfHeader()
-
-      # Read the ODF file
-      odf.read_odf(filename)
-
-      # Change all null values to empty strings.
-      df = odf.null2empty(odf.data.data_frame)
-      odf.data.data_frame = df
-      
-      # # Load the Cruise_Header and Event_Header information into Oracle.
-      odf_file = cruise_event_to_oracle(odf, connection, filename)
-
-      # # Load the Event_Header.Event_Comments into Oracle.
-      event_comments_to_oracle(odf, connection, odf_file)
-
-      # # Load the Meteo_Header information into Oracle.
-      meteo_to_oracle(odf, connection, odf_file)
-
-      # # Load the Meteo_Header.Meteo_Comments into Oracle.
-      meteo_comments_to_oracle(odf, connection, odf_file)
-
-      # # Load the Quality_Header information into Oracle.
-      quality_to_oracle(odf, connection, odf_file)
-
-      # # Load the Quality_Header.Quality_Tests into Oracle.
-      quality_tests_to_oracle(odf, connection, odf_file)
-
-      # # Load the Quality_Header.Quality_Comments into Oracle.
-      quality_comments_to_oracle(odf, connection, odf_file)
-
-      # # Load the Instrument_Header information into Oracle.
-      instrument_to_oracle(odf, connection, odf_file)
-
-      # # Load the General_Cal_Header information into Oracle.
-      general_cal_to_oracle(odf, connection, odf_file)
-
-      # # Load the Polynomial_Cal_Header information into Oracle.
-      polynomial_cal_to_oracle(odf, connection, odf_file)
-
-      # # Load the Compass_Cal_Header information into Oracle.
-      compass_cal_to_oracle(odf, connection, odf_file)
+      with span(filename, 'file'):
+        odf = OdfHeader()
 
-      # # Load the History_Header information into Oracle.
-      history_to_oracle(odf, connection, odf_file)
+        # Read the ODF file
+        odf.read_odf(filename)
 
-      # # Load the Data into Oracle.
-      data_to_oracle(odf, connection, odf_file)
+        load_odf(odf, connection, filename)
 
       print(f'\n<< {filename} >> was successfully loaded into Oracle.\n')
 
@@ -122,6 +126,7 @@ def odf_to_oracle(wildcard: str, user: str, password: str, oracle_host: str,
 
 def main():
 
+  from dotenv import load_dotenv
   load_dotenv(r'C:\Users\JacksonJ\OneDrive - DFO-MPO\Documents\.env')
   username = str(os.environ.get("ODF_ARCHIVE_USERNAME"))
   userpwd = str(os.environ.get("ODF_ARCHIVE_PASSWORD"))
@@ -1,6 +1,5 @@
 from datetime import datetime
 import numpy as np
-from icecream import ic
 
 def sytm_to_timestamp(sytm: str, strid: str) -> datetime:
     """
@@ -47,6 +46,7 @@ def sytm_to_timestamp(sytm: str, strid: str) -> datetime:
 
 
 def main():
+    from icecream import ic
 
     sytm = "01-JUL-2017 10:45:19.00"
     ic(sytm)